@@ -0,0 +1,108 @@
+import numpy as np
+
+
+class AkumulatorRegresi:
+    """Akumulator regresi linier sederhana Y = a + bX yang dapat diisi per potongan data.
+
+    Menyimpan rata-rata dan co-moment (gaya Welford) sehingga stabil secara numerik,
+    tidak perlu menyimpan seluruh data, dan dapat digabung dengan akumulator lain.
+    """
+
+    __slots__ = ("n", "mean_x", "mean_y", "m2_x", "m2_y", "c_xy")
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0   # Σ(x - x̄)²
+        self.m2_y = 0.0   # Σ(y - ȳ)²
+        self.c_xy = 0.0   # Σ(x - x̄)(y - ȳ)
+
+    @classmethod
+    def dari_data(cls, x, y):
+        """Membuat akumulator langsung dari satu potongan data"""
+        akumulator = cls()
+        akumulator.update(x, y)
+        return akumulator
+
+    def update(self, x, y):
+        """Menambahkan satu potongan data (skalar, list, Series, atau array)"""
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if x.shape != y.shape:
+            raise ValueError(f"Panjang X ({x.size}) dan Y ({y.size}) tidak sama")
+        if x.size == 0:
+            return self
+
+        # Statistik potongan dihitung terpusat pada rata-rata potongan itu sendiri
+        mean_x = x.mean()
+        mean_y = y.mean()
+        dx = x - mean_x
+        dy = y - mean_y
+        potongan = AkumulatorRegresi()
+        potongan.n = x.size
+        potongan.mean_x = float(mean_x)
+        potongan.mean_y = float(mean_y)
+        potongan.m2_x = float(dx @ dx)
+        potongan.m2_y = float(dy @ dy)
+        potongan.c_xy = float(dx @ dy)
+        return self.merge(potongan)
+
+    def merge(self, other):
+        """Menggabungkan akumulator lain ke akumulator ini (rumus gabungan Chan dkk.)"""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            for slot in self.__slots__:
+                setattr(self, slot, getattr(other, slot))
+            return self
+
+        n = self.n + other.n
+        delta_x = other.mean_x - self.mean_x
+        delta_y = other.mean_y - self.mean_y
+        faktor = self.n * other.n / n
+
+        self.mean_x += delta_x * other.n / n
+        self.mean_y += delta_y * other.n / n
+        self.m2_x += other.m2_x + delta_x * delta_x * faktor
+        self.m2_y += other.m2_y + delta_y * delta_y * faktor
+        self.c_xy += other.c_xy + delta_x * delta_y * faktor
+        self.n = n
+        return self
+
+    def __add__(self, other):
+        hasil = AkumulatorRegresi().merge(self)
+        return hasil.merge(other)
+
+    @property
+    def b(self):
+        """Koefisien b (slope)"""
+        return self.c_xy / self.m2_x
+
+    @property
+    def a(self):
+        """Koefisien a (intercept)"""
+        return self.mean_y - self.b * self.mean_x
+
+    @property
+    def r(self):
+        """Koefisien korelasi (r)"""
+        return self.c_xy / (self.m2_x * self.m2_y) ** 0.5
+
+    @property
+    def r_squared(self):
+        """Koefisien determinasi (r²)"""
+        return self.r ** 2
+
+    def prediksi(self, x):
+        """Menghitung Y = a + bX untuk nilai X yang diberikan"""
+        return self.a + self.b * np.asarray(x, dtype=np.float64)
+
+    def hasil(self):
+        """Ringkasan koefisien dalam bentuk dict"""
+        return {"n": self.n, "a": self.a, "b": self.b, "r": self.r, "r_squared": self.r_squared}
+
+    def __repr__(self):
+        if self.n < 2:
+            return f"AkumulatorRegresi(n={self.n})"
+        return f"AkumulatorRegresi(n={self.n}, a={self.a:,.2f}, b={self.b:.6f}, r={self.r:.4f})"
@@ -0,0 +1,52 @@
+import os
+
+from data_cleansing_update import (data_cleansing_panel, simpan_data_cleansing, FILE_PENDUDUK, FILE_BPS, KOLOM_CLEANSING,
+                                   sheets_to_read)
+from persamaan_regresi_update import siapkan_data, tabel_persamaan, simpan_tabel_persamaan
+from model_regresi import ModelRegresi, simpan_model, path_model, DIREKTORI_MODEL
+from regresi_linier_update import hitung_regresi_panel, lengkapi_hasil, buat_laporan
+
+# Nama berkas hasil di direktori_output (artefak model dinamai menurut kota, lihat path_output)
+BERKAS_OUTPUT = {
+    "cleansing": "Data Cleansing.xlsx",
+    "persamaan": "Tabel_Persamaan_Regresi_dari_Data_Cleansing.xlsx",
+    "excel": "Regresi_Output_Data_dan_Grafik.xlsx",
+    "pdf": "Analisis_Regresi_Linier.pdf",
+    "grafik": "grafik_regresi.png",
+    "model": DIREKTORI_MODEL,
+}
+
+
+def path_output(direktori_output, kota):
+    """Path lengkap setiap berkas hasil satu kota; model di <direktori_output>/model/<kota>.json"""
+    path = {kunci: os.path.join(direktori_output, nama) for kunci, nama in BERKAS_OUTPUT.items()}
+    path["model"] = path_model(kota, path["model"])
+    return path
+
+
+def jalankan_analisis(file_penduduk=FILE_PENDUDUK, file_bps=FILE_BPS, kota="Tangerang", direktori_output=None,
+                      sheets_list=sheets_to_read, pakai_dummy=True, lengkap=False):
+    """Cleansing -> regresi dalam memori, tanpa menulis dan membaca ulang file Excel perantara.
+
+    Dengan lengkap=True hasil dilengkapi analisis yang sama dengan regresi_linier_update.main
+    (bootstrap, uji permutasi, validasi silang, robust, proyeksi). Jika direktori_output diberikan, semua
+    hasil (Data Cleansing, tabel persamaan, grafik, Excel, PDF, dan artefak model) diekspor
+    ke direktori tersebut. Mengembalikan (df_cleansing, hasil).
+    Dengan pakai_dummy=False file sumber yang gagal dibaca melempar ValueError.
+    """
+    panel = data_cleansing_panel(file_penduduk, file_bps, sheets_list, kota=kota, pakai_dummy=pakai_dummy)
+    df_cleansing = panel.ke_dataframe(kota, KOLOM_CLEANSING)
+    hasil = hitung_regresi_panel(panel, kota=kota)
+    if lengkap:
+        lengkapi_hasil(hasil)
+
+    if direktori_output is not None:
+        os.makedirs(direktori_output, exist_ok=True)
+        path = path_output(direktori_output, kota)
+
+        simpan_data_cleansing(df_cleansing, path["cleansing"])
+        simpan_tabel_persamaan(tabel_persamaan(siapkan_data(df_cleansing)), hasil.a, hasil.b, path["persamaan"])
+        simpan_model(ModelRegresi.dari_hasil(hasil), path["model"])
+        buat_laporan(hasil, path["excel"], path["pdf"], path["grafik"])
+
+    return df_cleansing, hasil
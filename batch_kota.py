@@ -0,0 +1,249 @@
+import argparse
+import fnmatch
+import glob
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from analisis import path_output
+from data_cleansing_update import FILE_BPS, sheets_to_read
+from instrumentasi import atur_verbosity, inisialisasi, log, DIAM
+from model_regresi import nama_berkas_aman
+from pembacaan_sheet import POLA_PENDUDUK_KOTA
+from pipeline import hash_konten
+
+# Direktori hasil batch (satu subdirektori per kota)
+DIREKTORI_BATCH = "hasil_batch"
+
+# Status setiap tugas (dapat dilanjutkan) dan ringkasan semua kota di direktori batch
+NAMA_STATUS = "status_batch.json"
+NAMA_RINGKASAN = "Ringkasan_Batch.xlsx"
+
+SELESAI, GAGAL, ANTRI = "selesai", "gagal", "antri"
+
+
+def _ada_wildcard(pola):
+    return glob.has_magic(pola)
+
+
+def temukan_kota(pola_kota, pola_penduduk=POLA_PENDUDUK_KOTA):
+    """Daftar kota dari pola (mis. "*" atau "Kab*") dengan mencocokkan nama file penduduk"""
+    if "{kota}" not in pola_penduduk:
+        raise ValueError("Pola kota dengan wildcard membutuhkan pola file penduduk yang memuat {kota}")
+    awal, akhir = pola_penduduk.split("{kota}", 1)
+    pola_nama = re.compile(re.escape(awal) + "(.+)" + re.escape(akhir) + r"\Z")
+    kota = set()
+    for path in glob.glob(pola_penduduk.replace("{kota}", "*")):
+        cocok = pola_nama.match(path)
+        if cocok and fnmatch.fnmatch(cocok.group(1), pola_kota):
+            kota.add(cocok.group(1))
+    return sorted(kota)
+
+
+def cari_sumber(pola, kota):
+    """Path file sumber untuk satu kota dari path, pola {kota}, atau glob.
+
+    Glob yang cocok dengan beberapa file memilih file yang namanya memuat nama kota;
+    glob yang hanya cocok dengan satu file dipakai bersama oleh semua kota.
+    """
+    path = pola.replace("{kota}", kota)
+    if not _ada_wildcard(path):
+        return path
+    kandidat = sorted(glob.glob(path))
+    if len(kandidat) == 1:
+        return kandidat[0]
+    for berkas in kandidat:
+        if kota.lower() in os.path.basename(berkas).lower():
+            return berkas
+    raise FileNotFoundError(f"Tidak ada file sumber untuk Kota {kota} yang cocok dengan '{pola}'")
+
+
+class Tugas:
+    """Satu tugas batch: cleansing -> regresi -> laporan untuk satu kota di direktorinya sendiri"""
+
+    def __init__(self, kota, file_penduduk, file_bps, direktori):
+        self.kota = kota
+        self.file_penduduk = file_penduduk
+        self.file_bps = file_bps
+        self.direktori = direktori
+
+    @property
+    def keluaran(self):
+        return list(path_output(self.direktori, self.kota).values())
+
+
+def _inisialisasi_worker(verbosity):
+    # Log setiap kota dibungkam agar keluaran batch tetap terbaca; status dicatat di berkas status
+    atur_verbosity(verbosity)
+    inisialisasi()
+
+
+def jalankan_tugas(tugas, sheets_list=sheets_to_read, lengkap=False):
+    """Menjalankan satu tugas di worker; mengembalikan ringkasan regresi kota tersebut"""
+    from analisis import jalankan_analisis
+
+    mulai = time.perf_counter()
+    for path in tugas.keluaran:
+        # Hasil lama dihapus agar kegagalan menulis tidak tertutupi berkas dari run sebelumnya
+        if os.path.exists(path):
+            os.remove(path)
+    _, hasil = jalankan_analisis(tugas.file_penduduk, tugas.file_bps, kota=tugas.kota,
+                                 direktori_output=tugas.direktori, sheets_list=sheets_list, pakai_dummy=False,
+                                 lengkap=lengkap)
+    hilang = [os.path.basename(path) for path in tugas.keluaran if not os.path.exists(path)]
+    if hilang:
+        raise RuntimeError(f"Gagal menulis: {', '.join(hilang)}")
+    return {
+        "n": int(hasil.n),
+        "a": float(hasil.a),
+        "b": float(hasil.b),
+        "r": float(hasil.r),
+        "r_squared": float(hasil.r_squared),
+        "durasi": round(time.perf_counter() - mulai, 3),
+    }
+
+
+class BatchKota:
+    """Menjalankan analisis lengkap untuk banyak kota di process pool dengan status yang dapat dilanjutkan.
+
+    Status setiap kota (beserta hash file sumbernya) disimpan di direktori batch setelah
+    setiap tugas selesai. Run berikutnya melewati kota yang sudah selesai dengan sumber
+    yang sama dan hasil yang masih lengkap, sehingga batch yang terhenti dapat dilanjutkan.
+    Dengan lengkap=True setiap kota juga mendapat analisis tambahan (bootstrap, dll.).
+    """
+
+    def __init__(self, daftar_kota, pola_penduduk=POLA_PENDUDUK_KOTA, pola_bps=FILE_BPS, direktori=DIREKTORI_BATCH,
+                 sheets_list=sheets_to_read, lengkap=False):
+        self.direktori = direktori
+        self.sheets_list = list(sheets_list)
+        self.lengkap = lengkap
+        self.path_status = os.path.join(direktori, NAMA_STATUS)
+        self.tugas = []
+        self.gagal_siap = {}
+        for kota in dict.fromkeys(daftar_kota):
+            try:
+                self.tugas.append(Tugas(kota, cari_sumber(pola_penduduk, kota), cari_sumber(pola_bps, kota),
+                                        os.path.join(direktori, nama_berkas_aman(kota))))
+            except FileNotFoundError as e:
+                self.gagal_siap[kota] = str(e)
+        self._hash = {}
+
+    def _hash_sumber(self, tugas):
+        # File BPS biasanya dipakai bersama semua kota: hash dihitung sekali per path
+        for path in (tugas.file_penduduk, tugas.file_bps):
+            if path not in self._hash:
+                self._hash[path] = hash_konten(path)
+        return {path: self._hash[path] for path in (tugas.file_penduduk, tugas.file_bps)}
+
+    def muat_status(self):
+        try:
+            with open(self.path_status, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _simpan_status(self, status):
+        os.makedirs(self.direktori, exist_ok=True)
+        sementara = f"{self.path_status}.{os.getpid()}.tmp"
+        with open(sementara, "w", encoding="utf-8") as f:
+            json.dump(status, f, indent=2, ensure_ascii=False)
+        os.replace(sementara, self.path_status)
+
+    def mutakhir(self, tugas, status):
+        """True jika kota sudah selesai dengan sumber dan mode analisis yang sama dan semua hasilnya masih ada"""
+        catatan = status.get(tugas.kota)
+        return (catatan is not None and catatan["status"] == SELESAI
+                and catatan.get("sumber") == self._hash_sumber(tugas)
+                and catatan.get("lengkap", False) == self.lengkap
+                and all(os.path.exists(path) for path in tugas.keluaran))
+
+    def jalankan(self, max_workers=None, paksa=False, verbosity=DIAM):
+        """Menjalankan tugas yang belum mutakhir; mengembalikan dict status semua kota"""
+        status = self.muat_status()
+        for kota, error in self.gagal_siap.items():
+            status[kota] = {"status": GAGAL, "error": error}
+
+        antrian = [t for t in self.tugas if paksa or not self.mutakhir(t, status)]
+        log(f"{len(self.tugas) - len(antrian)} kota mutakhir dilewati, {len(antrian)} kota dijalankan")
+        for t in antrian:
+            status[t.kota] = {"status": ANTRI, "direktori": t.direktori, "sumber": self._hash_sumber(t),
+                              "lengkap": self.lengkap}
+        self._simpan_status(status)
+
+        if antrian:
+            # Jumlah proses dibatasi max_workers; status disimpan setiap kali satu kota selesai
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_inisialisasi_worker,
+                                     initargs=(verbosity,)) as executor:
+                futures = {executor.submit(jalankan_tugas, t, self.sheets_list, self.lengkap): t for t in antrian}
+                for i, future in enumerate(as_completed(futures), 1):
+                    t = futures[future]
+                    try:
+                        status[t.kota].update(status=SELESAI, error=None, **future.result())
+                        pesan = f"r² = {status[t.kota]['r_squared']:.4f}"
+                    except Exception as e:
+                        status[t.kota].update(status=GAGAL, error=f"{type(e).__name__}: {e}")
+                        pesan = f"GAGAL: {e}"
+                    self._simpan_status(status)
+                    log(f"[{i}/{len(antrian)}] {t.kota}: {pesan}")
+
+        self.simpan_ringkasan(status)
+        return status
+
+    def simpan_ringkasan(self, status):
+        """Ringkasan semua kota (status, koefisien, durasi, error) ke Excel di direktori batch"""
+        baris = [{"Kota": kota, "Status": catatan["status"], "n": catatan.get("n"), "Intercept (a)": catatan.get("a"),
+                  "Slope (b)": catatan.get("b"), "r": catatan.get("r"), "r²": catatan.get("r_squared"),
+                  "Durasi (detik)": catatan.get("durasi"), "Direktori": catatan.get("direktori"),
+                  "Error": catatan.get("error")}
+                 for kota, catatan in sorted(status.items())]
+        path = os.path.join(self.direktori, NAMA_RINGKASAN)
+        pd.DataFrame(baris).to_excel(path, index=False, sheet_name="Ringkasan")
+        return path
+
+
+def baca_daftar_kota(path):
+    """Daftar kota dari berkas teks (satu kota per baris, baris kosong dan # diabaikan)"""
+    with open(path, encoding="utf-8") as f:
+        return [baris.strip() for baris in f if baris.strip() and not baris.lstrip().startswith("#")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Menjalankan cleansing -> regresi -> laporan untuk banyak kota")
+    parser.add_argument("--kota", nargs="*", default=[],
+                        help="nama kota atau pola wildcard (mis. '*') yang dicocokkan dengan file penduduk")
+    parser.add_argument("--daftar-kota", help="berkas teks berisi satu nama kota per baris")
+    parser.add_argument("--penduduk", default=POLA_PENDUDUK_KOTA, help="path/pola file penduduk; {kota} diganti nama kota")
+    parser.add_argument("--bps", default=FILE_BPS, help="path/pola file BPS (bawaan: satu file untuk semua kota)")
+    parser.add_argument("--tahun", nargs="+", default=sheets_to_read, help="nama sheet tahun yang dibaca")
+    parser.add_argument("--output", default=DIREKTORI_BATCH, help="direktori hasil (satu subdirektori per kota)")
+    parser.add_argument("--workers", type=int, default=None, help="jumlah proses paralel maksimum")
+    parser.add_argument("--paksa", action="store_true", help="jalankan ulang semua kota meski sudah selesai")
+    parser.add_argument("--lengkap", action="store_true",
+                        help="tambahkan bootstrap, uji permutasi, validasi silang, regresi robust, dan proyeksi")
+    parser.add_argument("--status", action="store_true", help="hanya tampilkan status batch sebelumnya")
+    args = parser.parse_args()
+    inisialisasi()
+
+    daftar_kota = []
+    for kota in args.kota:
+        daftar_kota.extend(temukan_kota(kota, args.penduduk) if _ada_wildcard(kota) else [kota])
+    if args.daftar_kota:
+        daftar_kota.extend(baca_daftar_kota(args.daftar_kota))
+
+    batch = BatchKota(daftar_kota, args.penduduk, args.bps, args.output, args.tahun, lengkap=args.lengkap)
+    if args.status:
+        status = batch.muat_status()
+    else:
+        if not daftar_kota:
+            parser.error("tidak ada kota: gunakan --kota atau --daftar-kota")
+        status = batch.jalankan(max_workers=args.workers, paksa=args.paksa)
+
+    jumlah = pd.Series([catatan["status"] for catatan in status.values()], dtype=object).value_counts()
+    log("\n" + ", ".join(f"{n} {s}" for s, n in jumlah.items()) if len(jumlah) else "\nBelum ada status batch")
+    for kota, catatan in sorted(status.items()):
+        if catatan["status"] != SELESAI:
+            log(f"  {kota}: {catatan['status']}" + (f" ({catatan['error']})" if catatan.get("error") else ""))
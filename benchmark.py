@@ -0,0 +1,279 @@
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Ukuran data bawaan (jumlah baris) dan jumlah wilayah untuk mode batch
+UKURAN_BAWAAN = [10**3, 10**4, 10**5, 10**6]
+JUMLAH_WILAYAH = 1000
+
+# Potongan untuk membangkitkan/menghitung data besar tanpa memuat semuanya sekaligus
+UKURAN_POTONGAN = 10**6
+
+
+# === Generator data sintetis ===
+
+def potongan_sintetis(n_baris, seed=0, ukuran_potongan=UKURAN_POTONGAN):
+    """Membangkitkan (X, Y) sintetis per potongan; cukup untuk 10⁸ baris tanpa memori besar"""
+    rng = np.random.default_rng(seed)
+    for awal in range(0, n_baris, ukuran_potongan):
+        n = min(ukuran_potongan, n_baris - awal)
+        X = rng.normal(1.8e6, 1e5, n)
+        Y = 5e6 + 0.3 * X + rng.normal(0, 1e5, n)
+        yield X, Y
+
+
+def data_sintetis(n_baris, seed=0):
+    """(X, Y) sintetis sebagai array utuh"""
+    X, Y = zip(*potongan_sintetis(n_baris, seed))
+    return np.concatenate(X), np.concatenate(Y)
+
+
+def matriks_sintetis(n_baris, n_wilayah=JUMLAH_WILAYAH, seed=0):
+    """Matriks wilayah × periode sintetis berukuran total ±n_baris untuk regresi batch"""
+    periode = max(2, n_baris // n_wilayah)
+    rng = np.random.default_rng(seed)
+    X = rng.normal(1.8e6, 1e5, (n_wilayah, periode))
+    b = rng.uniform(0.1, 0.5, (n_wilayah, 1))
+    Y = 5e6 + b * X + rng.normal(0, 1e5, X.shape)
+    return X, Y
+
+
+def workbook_sintetis(direktori, n_kecamatan, tahun=(2020, 2021, 2022, 2023, 2024), seed=0):
+    """Menulis workbook penduduk dan BPS sintetis dengan format yang dikenali pembaca sheet"""
+    rng = np.random.default_rng(seed)
+    path_penduduk = os.path.join(direktori, "Data Penduduk - Sintetis.xlsx")
+    path_bps = os.path.join(direktori, "Data BPS - Angkatan Kerja Sintetis.xlsx")
+    nama = [f"Kecamatan {i}" for i in range(n_kecamatan)]
+    with pd.ExcelWriter(path_penduduk) as writer:
+        for t in tahun:
+            pd.DataFrame({"Kecamatan": nama, "Jumlah Penduduk": rng.integers(10_000, 200_000, n_kecamatan)}) \
+                .to_excel(writer, sheet_name=str(t), index=False)
+    with pd.ExcelWriter(path_bps) as writer:
+        for t in tahun:
+            pd.DataFrame({"Kabupaten/Kota": ["Kota Tangerang"] + nama[1:],
+                          "Jumlah": rng.integers(10_000, 500_000, n_kecamatan)}) \
+                .to_excel(writer, sheet_name=str(t), index=False)
+    return path_penduduk, path_bps
+
+
+# === Tahap yang diukur: setiap fungsi menerima n, menyiapkan data, dan mengembalikan
+# fungsi tanpa argumen yang akan diukur (persiapan data tidak ikut terukur) ===
+
+def tahap_read_penduduk_data(n, direktori):
+    from data_cleansing_update import read_penduduk_data
+    from cache_excel import CacheExcel
+    import cache_excel
+    path_penduduk, _ = workbook_sintetis(direktori, n)
+    # Cache dimatikan dengan direktori sementara baru setiap kali agar yang terukur adalah parsing
+    def jalankan():
+        cache_excel._cache_bawaan = CacheExcel(tempfile.mkdtemp(dir=direktori))
+        read_penduduk_data(path_penduduk, ["2020", "2021", "2022", "2023", "2024"])
+    return jalankan
+
+
+def tahap_merge_dropna(n, direktori):
+    from data_cleansing_update import gabungkan_data
+    tahun = np.arange(n)
+    X, Y = data_sintetis(n)
+    df_penduduk = pd.DataFrame({"Tahun": tahun, "Jumlah Penduduk": X})
+    df_bps = pd.DataFrame({"Tahun": tahun, "Jumlah Angkatan Kerja": Y})
+    return lambda: gabungkan_data(df_penduduk, df_bps, expected_years=[])
+
+
+def tahap_fit(n, direktori):
+    from akumulator_regresi import AkumulatorRegresi
+    def jalankan():
+        akumulator = AkumulatorRegresi()
+        for X, Y in potongan_sintetis(n):
+            akumulator.update(X, Y)
+        return akumulator.hasil()
+    return jalankan
+
+
+def tahap_fit_memmap(n, direktori):
+    from kolom_memmap import tulis_kolom, regresi_memmap, residual_memmap
+    data = tulis_kolom((pd.DataFrame({"Tahun": np.arange(len(X)), "Jumlah Penduduk (X)": X,
+                                      "Jumlah Angkatan Kerja (Y)": Y})
+                        for X, Y in potongan_sintetis(n)),
+                       tempfile.mkdtemp(dir=direktori))
+    def jalankan():
+        akumulator = regresi_memmap(data)
+        return residual_memmap(data, akumulator.a, akumulator.b)
+    return jalankan
+
+
+def tahap_fit_batch(n, direktori):
+    from regresi_batch import regresi_batch
+    X, Y = matriks_sintetis(n)
+    return lambda: regresi_batch(X, Y)
+
+
+def tahap_simpan_persamaan(n, direktori):
+    from persamaan_regresi_update import simpan_tabel_persamaan, tabel_persamaan
+    X, Y = data_sintetis(n)
+    df_final = tabel_persamaan(pd.DataFrame({"Tahun": np.arange(n), "Jumlah Penduduk": np.round(X),
+                                             "Angkatan Kerja": np.round(Y)}))
+    return lambda: simpan_tabel_persamaan(df_final, 5e6, 0.3, os.path.join(direktori, "persamaan.xlsx"))
+
+
+def _hasil_sintetis(n):
+    from regresi_linier_update import HasilRegresi
+    X, Y = data_sintetis(n)
+    return HasilRegresi(np.arange(2000, 2000 + n), np.round(X).astype(np.int64), np.round(Y).astype(np.int64))
+
+
+def tahap_render_grafik(n, direktori):
+    from regresi_linier_update import render_grafik
+    hasil = _hasil_sintetis(n)
+    return lambda: render_grafik(hasil)
+
+
+def tahap_render_wilayah(n, direktori):
+    from grafik_wilayah import render_matriks
+    # n baris = n/5 wilayah × 5 tahun, satu grafik per wilayah
+    X, Y = matriks_sintetis(n, n_wilayah=max(1, n // 5))
+    wilayah = [f"Wilayah {i}" for i in range(len(X))]
+    tahun = np.arange(2020, 2020 + X.shape[1])
+    return lambda: render_matriks(wilayah, tahun, X, Y, os.path.join(direktori, "grafik_wilayah"))
+
+
+def tahap_proyeksi(n, direktori):
+    from proyeksi import proyeksi
+    # n baris = n/10 wilayah × 10 tahun, diproyeksikan 30 tahun untuk semua skenario
+    X, Y = matriks_sintetis(n, n_wilayah=max(1, n // 10))
+    tahun = np.arange(2015, 2015 + X.shape[1])
+    return lambda: proyeksi(tahun, X, Y)
+
+
+def tahap_uji_permutasi(n, direktori):
+    from uji_permutasi import uji_permutasi_batch
+    # n baris = n/8 wilayah × 8 tahun, semua 8! permutasi per wilayah
+    X, Y = matriks_sintetis(n, n_wilayah=max(1, n // 8))
+    return lambda: uji_permutasi_batch(X, Y)
+
+
+def tahap_pdf(n, direktori):
+    from regresi_linier_update import buat_pdf, render_grafik
+    hasil = _hasil_sintetis(n)
+    grafik = render_grafik(_hasil_sintetis(5))
+    return lambda: buat_pdf(hasil, os.path.join(direktori, "benchmark.pdf"), grafik=grafik)
+
+
+# Tahap render jauh lebih mahal per baris: satu grafik dengan 100 titik, dan 50/100 wilayah
+# (n/5) untuk grafik per wilayah, sudah cukup untuk mendeteksi regresi dalam hitungan detik
+UKURAN_RENDER_GRAFIK = [50, 100]
+UKURAN_RENDER_WILAYAH = [250, 500]
+
+# Nama tahap -> (fungsi persiapan, ukuran maksimum yang masuk akal, ukuran bawaan jika bukan UKURAN_BAWAAN)
+TAHAP = {
+    "read_penduduk_data": (tahap_read_penduduk_data, 10**5, None),
+    "merge_dropna": (tahap_merge_dropna, 10**7, None),
+    "fit": (tahap_fit, 10**8, None),
+    "fit_memmap": (tahap_fit_memmap, 10**8, None),
+    "fit_batch": (tahap_fit_batch, 10**8, None),
+    "simpan_persamaan": (tahap_simpan_persamaan, 10**6, None),
+    "render_grafik": (tahap_render_grafik, 10**3, UKURAN_RENDER_GRAFIK),
+    "render_wilayah": (tahap_render_wilayah, 10**4, UKURAN_RENDER_WILAYAH),
+    "proyeksi": (tahap_proyeksi, 10**6, None),
+    "uji_permutasi": (tahap_uji_permutasi, 10**5, None),
+    "pdf": (tahap_pdf, 10**4, None),
+}
+
+
+def ukur(fungsi, ulang=3):
+    """Mengukur waktu terbaik dari beberapa ulangan dan memori puncak (tracemalloc)"""
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        waktu.append(time.perf_counter() - mulai)
+
+    tracemalloc.start()
+    try:
+        fungsi()
+        _, puncak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(waktu), puncak
+
+
+def jalankan_benchmark(daftar_tahap=None, ukuran=None, ulang=3):
+    """Menjalankan benchmark setiap tahap untuk setiap ukuran; mengembalikan dict hasil.
+
+    Tanpa ukuran, setiap tahap memakai ukuran bawaannya sendiri (UKURAN_BAWAAN untuk tahap numerik).
+    """
+    daftar_tahap = daftar_tahap or list(TAHAP)
+    hasil = []
+    with tempfile.TemporaryDirectory() as direktori:
+        for nama in daftar_tahap:
+            persiapan, ukuran_maks, ukuran_tahap = TAHAP[nama]
+            for n in ukuran or ukuran_tahap or UKURAN_BAWAAN:
+                if n > ukuran_maks:
+                    print(f"[{nama}] n={n:,} dilewati (maks {ukuran_maks:,})")
+                    continue
+                detik, memori = ukur(persiapan(n, direktori), ulang)
+                print(f"[{nama}] n={n:,}: {detik*1000:,.2f} ms, memori puncak {memori/2**20:,.1f} MB")
+                hasil.append({"tahap": nama, "n": n, "detik": detik, "memori_puncak": memori})
+
+    return {
+        "meta": {
+            "waktu": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpu": os.cpu_count(),
+        },
+        "hasil": hasil,
+    }
+
+
+def bandingkan(hasil, baseline, toleransi=0.2):
+    """Daftar regresi performa: tahap/ukuran yang lebih lambat atau lebih boros memori
+    dari baseline melebihi toleransi"""
+    acuan = {(item["tahap"], item["n"]): item for item in baseline["hasil"]}
+    regresi = []
+    for item in hasil["hasil"]:
+        lama = acuan.get((item["tahap"], item["n"]))
+        if lama is None:
+            continue
+        for metrik in ("detik", "memori_puncak"):
+            if lama[metrik] > 0 and item[metrik] > lama[metrik] * (1 + toleransi):
+                regresi.append({"tahap": item["tahap"], "n": item["n"], "metrik": metrik,
+                                "baseline": lama[metrik], "sekarang": item[metrik],
+                                "rasio": item[metrik] / lama[metrik]})
+    return regresi
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark setiap tahap pipeline dengan data sintetis")
+    parser.add_argument("--tahap", nargs="+", choices=list(TAHAP), help="tahap yang diukur (bawaan: semua)")
+    parser.add_argument("--ukuran", nargs="+", type=lambda s: int(float(s)),
+                        help="jumlah baris, misalnya 1e3 1e5 1e8 (bawaan: ukuran bawaan per tahap)")
+    parser.add_argument("--ulang", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_hasil.json")
+    parser.add_argument("--baseline", help="berkas hasil sebelumnya untuk deteksi regresi")
+    parser.add_argument("--toleransi", type=float, default=0.2, help="batas kenaikan relatif (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    hasil = jalankan_benchmark(args.tahap, args.ukuran, args.ulang)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(hasil, f, indent=2)
+    print(f"\nHasil disimpan ke '{args.output}'")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regresi = bandingkan(hasil, json.load(f), args.toleransi)
+        for item in regresi:
+            print(f"REGRESI: [{item['tahap']}] n={item['n']:,} {item['metrik']} "
+                  f"{item['rasio']:.2f}x baseline")
+        if regresi:
+            raise SystemExit(1)
+        print("Tidak ada regresi terhadap baseline")
@@ -0,0 +1,116 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from regresi_batch import regresi_batch
+
+# Batas elemen matriks indeks per blok (≈16 MB per array float64) agar memori tetap terbatas
+MAX_ELEMEN_BLOK = 2_000_000
+
+# Di atas jumlah elemen total ini blok-blok dibagi ke process pool
+AMBANG_PARALEL = 20_000_000
+
+
+_data_worker = {}
+
+
+def _inisialisasi_worker(x, y):
+    # Data dikirim sekali per proses, bukan sekali per blok
+    _data_worker["x"] = x
+    _data_worker["y"] = y
+
+
+def _blok_worker(jumlah, seed):
+    return _blok_bootstrap(_data_worker["x"], _data_worker["y"], jumlah, seed)
+
+
+def _blok_bootstrap(x, y, jumlah, seed):
+    """Menghitung a dan b untuk sekumpulan resample sekaligus dari satu matriks indeks"""
+    rng = np.random.default_rng(seed)
+    indeks = rng.integers(0, x.size, size=(jumlah, x.size))
+    hasil = regresi_batch(x[indeks], y[indeks])
+    return hasil["a"], hasil["b"]
+
+
+class HasilBootstrap:
+    """Distribusi bootstrap koefisien a dan b beserta interval kepercayaan persentil"""
+
+    def __init__(self, sampel_a, sampel_b, tingkat):
+        # Resample dengan X konstan (slope tidak terdefinisi) dibuang
+        valid = ~(np.isnan(sampel_a) | np.isnan(sampel_b))
+        self.sampel_a = sampel_a[valid]
+        self.sampel_b = sampel_b[valid]
+        self.tingkat = tingkat
+
+    @property
+    def n_resample(self):
+        return self.sampel_b.size
+
+    def _interval(self, sampel):
+        alpha = (1.0 - self.tingkat) / 2.0
+        return tuple(np.quantile(sampel, [alpha, 1.0 - alpha]))
+
+    @property
+    def ci_a(self):
+        return self._interval(self.sampel_a)
+
+    @property
+    def ci_b(self):
+        return self._interval(self.sampel_b)
+
+    @property
+    def se_a(self):
+        return float(self.sampel_a.std(ddof=1))
+
+    @property
+    def se_b(self):
+        return float(self.sampel_b.std(ddof=1))
+
+    @property
+    def p_value_b(self):
+        """p-value dua sisi untuk H0: b = 0 dari proporsi resample di sisi lain nol"""
+        B = self.n_resample
+        bawah = (np.count_nonzero(self.sampel_b <= 0) + 1) / (B + 1)
+        atas = (np.count_nonzero(self.sampel_b >= 0) + 1) / (B + 1)
+        return min(1.0, 2.0 * min(bawah, atas))
+
+    def baris_info(self):
+        """Baris (Parameter, Nilai) untuk sheet Info Regresi dan PDF"""
+        persen = f"{self.tingkat*100:.0f}%"
+        ci_a, ci_b = self.ci_a, self.ci_b
+        return [
+            (f"CI {persen} Intercept (a) - bootstrap", f"[{ci_a[0]:,.2f} ; {ci_a[1]:,.2f}]"),
+            (f"CI {persen} Slope (b) - bootstrap", f"[{ci_b[0]:.6f} ; {ci_b[1]:.6f}]"),
+            ("p-value Slope (b) - bootstrap", f"{self.p_value_b:.4f} ({self.n_resample} resample)"),
+        ]
+
+
+def bootstrap_regresi(x, y, n_resample=2000, tingkat=0.95, seed=None, max_workers=None,
+                      max_elemen_blok=MAX_ELEMEN_BLOK):
+    """Bootstrap pasangan (x, y) untuk interval kepercayaan a dan b.
+
+    Setiap blok resample dihitung sebagai satu matriks indeks (blok × n) dan diregresikan
+    sekaligus secara vektor. Ukuran blok dibatasi max_elemen_blok sehingga memori tetap
+    terbatas; untuk n besar blok-blok dibagi ke process pool.
+    """
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    if x.size < 3:
+        raise ValueError("Bootstrap membutuhkan minimal 3 pasang data")
+
+    per_blok = max(1, min(n_resample, max_elemen_blok // x.size))
+    ukuran = [min(per_blok, n_resample - i) for i in range(0, n_resample, per_blok)]
+    seeds = np.random.SeedSequence(seed).spawn(len(ukuran))
+
+    paralel = len(ukuran) > 1 and x.size * n_resample >= AMBANG_PARALEL and (os.cpu_count() or 1) > 1
+    if paralel:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_inisialisasi_worker,
+                                 initargs=(x, y)) as executor:
+            hasil = list(executor.map(_blok_worker, ukuran, seeds))
+    else:
+        hasil = [_blok_bootstrap(x, y, jumlah, s) for jumlah, s in zip(ukuran, seeds)]
+
+    sampel_a = np.concatenate([a for a, _ in hasil])
+    sampel_b = np.concatenate([b for _, b in hasil])
+    return HasilBootstrap(sampel_a, sampel_b, tingkat)
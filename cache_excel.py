@@ -0,0 +1,293 @@
+import hashlib
+import json
+import os
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from instrumentasi import tahap, tambah
+
+# Lokasi dan batas ukuran cache sheet Excel hasil parsing
+DIREKTORI_CACHE = ".cache_excel"
+UKURAN_MAKS_CACHE = 512 * 1024 * 1024  # 512 MB
+
+# Berkas sementara lebih tua dari ini dianggap sisa proses yang terhenti dan dihapus
+UMUR_SEMENTARA_MAKS = 3600  # detik
+
+NS_SHEET = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def hash_berkas(file_path, ukuran_blok=1 << 20):
+    """Menghitung SHA-256 isi berkas secara bertahap"""
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for blok in iter(lambda: f.read(ukuran_blok), b""):
+            h.update(blok)
+    return h.hexdigest()
+
+
+def sidik_sheet_xlsx(file_path):
+    """Sidik isi setiap sheet pada berkas .xlsx tanpa mem-parsing datanya.
+
+    Berkas .xlsx adalah arsip zip dengan satu anggota XML per sheet, sehingga CRC anggota
+    sheet (ditambah shared strings dan styles yang dipakai bersama) cukup untuk mengetahui
+    sheet mana yang berubah. Untuk format lain (misalnya .xls lama) mengembalikan dict kosong:
+    BIFF tidak menyimpan sheet sebagai anggota terpisah, dan sidik dari isi hasil parsing
+    akan sama mahalnya dengan parsing yang ingin dihindari cache.
+    """
+    if not zipfile.is_zipfile(file_path):
+        return {}
+
+    try:
+        with zipfile.ZipFile(file_path) as arsip:
+            crc = {info.filename: info.CRC for info in arsip.infolist()}
+            workbook = ET.fromstring(arsip.read("xl/workbook.xml"))
+            rels = ET.fromstring(arsip.read("xl/_rels/workbook.xml.rels"))
+    except (KeyError, zipfile.BadZipFile, ET.ParseError):
+        return {}
+
+    target = {}
+    for rel in rels.iter(f"{NS_PKG_REL}Relationship"):
+        path = rel.get("Target", "").lstrip("/")
+        target[rel.get("Id")] = path if path.startswith("xl/") else f"xl/{path}"
+
+    bersama = f"{crc.get('xl/sharedStrings.xml', 0)}:{crc.get('xl/styles.xml', 0)}"
+    sidik = {}
+    for sheet in workbook.iter(f"{NS_SHEET}sheet"):
+        anggota = target.get(sheet.get(f"{NS_REL}id"))
+        if anggota in crc:
+            sidik[sheet.get("name")] = f"{crc[anggota]}:{bersama}"
+    return sidik
+
+
+class CacheExcel:
+    """Cache sheet Excel hasil parsing dalam format kolom biner (Parquet).
+
+    Setiap sheet disimpan terpisah dengan kunci hash isi berkas dan nama sheet. Jika
+    berkas .xlsx berubah, sheet yang isinya tetap masih dikenali lewat sidik sheet
+    sehingga hanya sheet yang berubah yang di-parsing ulang. Berkas .xls lama tidak punya sidik
+    sheet: kuncinya hanya hash seluruh berkas, sehingga perubahan apa pun pada workbook .xls
+    membuat semua sheet-nya di-parsing ulang. Ukuran total cache dibatasi;
+    entri yang paling lama tidak diakses dihapus lebih dulu.
+
+    Cache dapat dipakai bersama beberapa proses (worker ingest/batch): setiap baca-ubah-tulis
+    indeks dilakukan di bawah kunci berkas, sedangkan parsing berjalan di luar kunci.
+    """
+
+    def __init__(self, direktori=DIREKTORI_CACHE, ukuran_maks=UKURAN_MAKS_CACHE):
+        self.direktori = direktori
+        self.ukuran_maks = ukuran_maks
+        self.path_indeks = os.path.join(direktori, "indeks.json")
+        self.path_kunci = os.path.join(direktori, "indeks.lock")
+        self.statistik = {"hit": 0, "miss": 0}
+
+    @contextmanager
+    def _kunci(self):
+        """Kunci eksklusif antarproses untuk baca-ubah-tulis indeks"""
+        os.makedirs(self.direktori, exist_ok=True)
+        with open(self.path_kunci, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _muat_indeks(self):
+        try:
+            with open(self.path_indeks, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _simpan_indeks(self, indeks):
+        os.makedirs(self.direktori, exist_ok=True)
+        sementara = f"{self.path_indeks}.{os.getpid()}.tmp"
+        with open(sementara, "w", encoding="utf-8") as f:
+            json.dump(indeks, f)
+        os.replace(sementara, self.path_indeks)
+
+    def _cari(self, indeks, sumber, sheet, file_hash, sidik):
+        """Mencari entri cache untuk satu sheet, mengembalikan kunci atau None"""
+        kunci = f"{file_hash}:{sheet}"
+        if kunci in indeks:
+            return kunci
+
+        # Berkas berubah, tetapi isi sheet ini mungkin tetap sama
+        if sidik is not None:
+            for kunci_lama, entri in indeks.items():
+                if entri["sumber"] == sumber and entri["sheet"] == sheet and entri["sidik"] == sidik:
+                    indeks[kunci] = indeks.pop(kunci_lama)
+                    return kunci
+        return None
+
+    def _muat_sheet(self, entri):
+        df = pd.read_parquet(os.path.join(self.direktori, entri["berkas"]))
+        if entri.get("kolom") is not None:
+            df.columns = entri["kolom"]
+        return df
+
+    def _tulis_sheet(self, df, sumber, sheet, file_hash, sidik):
+        """Menyimpan satu sheet ke cache; mengembalikan entri indeks atau None jika gagal"""
+        kolom = None
+        if not all(isinstance(col, str) for col in df.columns):
+            kolom = [col if isinstance(col, (str, int, float)) else None for col in df.columns]
+            if None in kolom:
+                return None
+
+        nama_berkas = hashlib.sha256(f"{file_hash}:{sheet}".encode("utf-8")).hexdigest()[:32] + ".parquet"
+        # Ditulis ke nama sementara; baru diganti ke nama akhir saat entri masuk indeks (di bawah kunci)
+        sementara = os.path.join(self.direktori, f"{nama_berkas}.{os.getpid()}.tmp")
+        try:
+            os.makedirs(self.direktori, exist_ok=True)
+            df.set_axis([str(col) for col in df.columns], axis=1).to_parquet(sementara, index=False)
+        except (ImportError, ValueError, TypeError, OSError):
+            # Tanpa pyarrow/fastparquet atau kolom bertipe campuran: lewati cache
+            return None
+
+        return {
+            "sumber": sumber,
+            "sheet": sheet,
+            "sidik": sidik,
+            "berkas": nama_berkas,
+            "sementara": sementara,
+            "kolom": kolom,
+            "ukuran": os.path.getsize(sementara),
+            "akses": time.time(),
+        }
+
+    def _hapus_entri(self, indeks, kunci):
+        entri = indeks.pop(kunci)
+        try:
+            os.remove(os.path.join(self.direktori, entri["berkas"]))
+        except OSError:
+            pass
+        return entri
+
+    def _hapus_versi_lama(self, indeks, sumber, sheet):
+        """Menghapus entri versi lama dari sheet yang sama pada berkas yang sama"""
+        for kunci in [k for k, e in indeks.items() if e["sumber"] == sumber and e["sheet"] == sheet]:
+            self._hapus_entri(indeks, kunci)
+
+    def _bersihkan_yatim(self, indeks):
+        """Menghapus berkas Parquet yang tidak tercatat di indeks (dan berkas sementara yang basi)
+        agar tidak memakan ruang di luar batas ukuran; dipanggil di bawah kunci"""
+        tercatat = {entri["berkas"] for entri in indeks.values()}
+        sekarang = time.time()
+        for nama in os.listdir(self.direktori):
+            path = os.path.join(self.direktori, nama)
+            try:
+                if nama.endswith(".parquet") and nama not in tercatat:
+                    os.remove(path)
+                elif nama.endswith(".tmp") and sekarang - os.path.getmtime(path) > UMUR_SEMENTARA_MAKS:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _batasi_ukuran(self, indeks):
+        """Menghapus entri yang paling lama tidak diakses sampai ukuran total di bawah batas"""
+        total = sum(entri["ukuran"] for entri in indeks.values())
+        for kunci in sorted(indeks, key=lambda k: indeks[k]["akses"]):
+            if total <= self.ukuran_maks:
+                break
+            total -= self._hapus_entri(indeks, kunci)["ukuran"]
+
+    def baca(self, file_path, sheets_list, file_hash=None):
+        """Pengganti pd.read_excel(file_path, sheet_name=sheets_list) dengan cache per sheet.
+
+        file_hash dapat diberikan jika sudah dihitung (mis. sekali per workbook oleh proses
+        induk ingest) agar berkas tidak di-hash ulang untuk setiap tugas sheet.
+        """
+        sumber = os.path.abspath(file_path)
+        if file_hash is None:
+            file_hash = hash_berkas(file_path)
+        # Kosong untuk .xls: setiap sheet hanya dikenali lewat file_hash (seluruh berkas)
+        sidik = sidik_sheet_xlsx(file_path)
+
+        # Tahap 1 (di bawah kunci): cari entri setiap sheet dan muat Parquet-nya
+        hasil = {}
+        kurang = []
+        dipakai = []
+        try:
+            with self._kunci():
+                indeks = self._muat_indeks()
+                for sheet in sheets_list:
+                    kunci = self._cari(indeks, sumber, sheet, file_hash, sidik.get(sheet))
+                    if kunci is not None:
+                        try:
+                            hasil[sheet] = self._muat_sheet(indeks[kunci])
+                            indeks[kunci]["akses"] = time.time()
+                            dipakai.append(kunci)
+                            continue
+                        except (ImportError, OSError, ValueError):
+                            indeks.pop(kunci)
+                    kurang.append(sheet)
+                if dipakai:
+                    self._simpan_indeks(indeks)
+        except OSError:
+            # Direktori cache tidak dapat ditulis: baca langsung tanpa cache
+            kurang = [sheet for sheet in sheets_list if sheet not in hasil]
+        self.statistik["hit"] += len(sheets_list) - len(kurang)
+
+        if kurang:
+            # Tahap 2 (tanpa kunci): hanya sheet yang belum ada di cache yang di-parsing ulang
+            self.statistik["miss"] += len(kurang)
+            with tahap("parse_excel", file=os.path.basename(file_path)) as span:
+                excel_data = pd.read_excel(file_path, sheet_name=kurang)
+                span.baris = sum(len(df) for df in excel_data.values())
+            baru = {}
+            for sheet, df in excel_data.items():
+                hasil[sheet] = df
+                entri = self._tulis_sheet(df, sumber, sheet, file_hash, sidik.get(sheet))
+                if entri is not None:
+                    baru[sheet] = entri
+
+            # Tahap 3 (di bawah kunci): gabungkan entri baru ke indeks terkini, bukan salinan lama
+            if baru:
+                try:
+                    with self._kunci():
+                        indeks = self._muat_indeks()
+                        for sheet, entri in baru.items():
+                            self._hapus_versi_lama(indeks, sumber, sheet)
+                            os.replace(entri.pop("sementara"), os.path.join(self.direktori, entri["berkas"]))
+                            indeks[f"{file_hash}:{sheet}"] = entri
+                        self._batasi_ukuran(indeks)
+                        self._bersihkan_yatim(indeks)
+                        self._simpan_indeks(indeks)
+                except OSError:
+                    pass
+
+        tambah("cache_hit", len(sheets_list) - len(kurang))
+        tambah("cache_miss", len(kurang))
+
+        # Urutan sama seperti daftar sheet yang diminta
+        return {sheet: hasil[sheet] for sheet in sheets_list}
+
+
+_cache_bawaan = None
+
+
+def baca_excel(file_path, sheets_list, file_hash=None):
+    """Membaca sheet Excel lewat cache bawaan"""
+    global _cache_bawaan
+    if _cache_bawaan is None:
+        _cache_bawaan = CacheExcel()
+    return _cache_bawaan.baca(file_path, sheets_list, file_hash)
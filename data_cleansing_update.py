@@ -1,146 +1,133 @@
 import pandas as pd
-import numpy as np
+
+from cache_excel import baca_excel
+from instrumentasi import inisialisasi, log, tampilkan, tahap, diukur, DIAM, DETAIL
+from panel_wilayah import PanelWilayahTahun
+from pembacaan_sheet import cari_kolom_penduduk, cari_kolom_angkatan_kerja, cari_baris_wilayah, nama_wilayah_baku
 
 # Define the sheet names to read
 sheets_to_read = ["2020", "2021", "2022", "2023", "2024"]
 
-print("MEMULAI PROSES DATA CLEANSING...")
-print("="*50)
+# Lokasi file sumber dan hasil
+FILE_PENDUDUK = "/datasheet/Data Penduduk - Kota Tangerang.xls"
+FILE_BPS = "/datasheet/Data BPS - Jumlah Angkatan Kerja.xls"
+OUTPUT_PATH = "Data Cleansing.xlsx"
+
+# Variabel panel -> nama kolom tabel hasil cleansing
+KOLOM_CLEANSING = {
+    "Jumlah Penduduk": "Jumlah Penduduk (X)",
+    "Jumlah Angkatan Kerja": "Jumlah Angkatan Kerja (Y)",
+}
 
+@diukur("baca_penduduk")
 def read_penduduk_data(file_path, sheets_list):
     """Membaca data penduduk per kecamatan dan menjumlahkan total per tahun"""
-    print(f"\nMembaca file penduduk: {file_path}")
-    all_data = []
+    log(f"\nMembaca file penduduk: {file_path}", level=DETAIL)
+    daftar_tahun, daftar_nilai = [], []
     
     try:
-        # Baca semua sheet sekaligus
-        excel_data = pd.read_excel(file_path, sheet_name=sheets_list)
+        # Baca semua sheet sekaligus (lewat cache, hanya sheet yang berubah yang di-parsing ulang)
+        excel_data = baca_excel(file_path, sheets_list)
         
         for year, df in excel_data.items():
-            print(f"  Sheet {year}: {df.shape}")
+            log(f"  Sheet {year}: {df.shape}", level=DETAIL)
             
             # Bersihkan nama kolom
             df.columns = df.columns.str.strip()
-            print(f"  Kolom: {list(df.columns)}")
+            log(f"  Kolom: {list(df.columns)}", level=DETAIL)
             
             # Cari kolom jumlah penduduk
-            penduduk_col = None
-            for col in df.columns:
-                if 'penduduk' in col.lower() or 'jumlah' in col.lower():
-                    penduduk_col = col
-                    break
-            
-            if penduduk_col is None:
-                # Ambil kolom numerik kedua (setelah kolom pertama yang biasanya nama kecamatan)
-                numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-                if numeric_cols:
-                    penduduk_col = numeric_cols[0]
+            penduduk_col = cari_kolom_penduduk(df)
             
             if penduduk_col:
                 # Jumlahkan semua penduduk per kecamatan untuk mendapat total kota
                 total_penduduk = df[penduduk_col].sum()
                 
-                # Buat dataframe untuk tahun ini
-                year_data = pd.DataFrame({
-                    'Tahun': [int(year)],
-                    'Jumlah Penduduk': [total_penduduk]
-                })
-                
-                all_data.append(year_data)
-                print(f"  Total penduduk {year}: {total_penduduk:,}")
+                daftar_tahun.append(int(year))
+                daftar_nilai.append(total_penduduk)
+                log(f"  Total penduduk {year}: {total_penduduk:,}", level=DETAIL)
             else:
-                print(f"  PERINGATAN: Tidak menemukan kolom penduduk di sheet {year}")
+                log(f"  PERINGATAN: Tidak menemukan kolom penduduk di sheet {year}")
         
-        # Gabungkan semua data
-        if all_data:
-            combined_df = pd.concat(all_data, ignore_index=True)
-            print(f"\nTotal data penduduk: {combined_df.shape}")
-            print(f"Tahun tersedia: {sorted(combined_df['Tahun'].unique())}")
+        # Satu DataFrame untuk semua tahun (bukan satu DataFrame kecil per tahun lalu concat)
+        if daftar_tahun:
+            combined_df = pd.DataFrame({'Tahun': daftar_tahun, 'Jumlah Penduduk': daftar_nilai})
+            log(f"\nTotal data penduduk: {combined_df.shape}", level=DETAIL)
+            log(f"Tahun tersedia: {sorted(combined_df['Tahun'].unique())}", level=DETAIL)
             return combined_df
         else:
-            print("TIDAK ADA DATA PENDUDUK YANG BERHASIL DIBACA!")
+            log("TIDAK ADA DATA PENDUDUK YANG BERHASIL DIBACA!")
             return None
             
     except Exception as e:
-        print(f"Error membaca {file_path}: {str(e)}")
+        log(f"Error membaca {file_path}: {str(e)}", level=DIAM)
         return None
 
-def read_bps_data(file_path, sheets_list):
-    """Membaca data BPS dan ambil data untuk Kota Tangerang"""
-    print(f"\nMembaca file BPS: {file_path}")
-    all_data = []
+@diukur("baca_bps")
+def read_bps_data(file_path, sheets_list, kota="Tangerang"):
+    """Membaca data BPS dan ambil data untuk kota yang diminta (bawaan: Kota Tangerang).
+
+    Baris dicocokkan persis dengan nama wilayah baku ("Tangerang" -> "Kota Tangerang",
+    "Kab. Tangerang" untuk kabupaten), bukan substring. ValueError jika beberapa baris
+    cocok atau wilayah tidak ada di sheet mana pun; None jika file gagal dibaca.
+    """
+    log(f"\nMembaca file BPS: {file_path}", level=DETAIL)
+    daftar_tahun, daftar_nilai = [], []
     
     try:
-        # Baca semua sheet sekaligus
-        excel_data = pd.read_excel(file_path, sheet_name=sheets_list)
+        # Baca semua sheet sekaligus (lewat cache, hanya sheet yang berubah yang di-parsing ulang)
+        excel_data = baca_excel(file_path, sheets_list)
+    except Exception as e:
+        log(f"Error membaca {file_path}: {str(e)}", level=DIAM)
+        return None
+    
+    ditemukan = False
+    for year, df in excel_data.items():
+        log(f"  Sheet {year}: {df.shape}", level=DETAIL)
         
-        for year, df in excel_data.items():
-            print(f"  Sheet {year}: {df.shape}")
-            
-            # Bersihkan nama kolom
-            df.columns = df.columns.str.strip()
-            print(f"  Kolom: {list(df.columns)}")
-            
-            # Cari baris Kota Tangerang
-            kota_col = df.columns[0]  # Kolom pertama biasanya nama kab/kota
+        # Bersihkan nama kolom
+        df.columns = df.columns.astype(str).str.strip()
+        log(f"  Kolom: {list(df.columns)}", level=DETAIL)
+        
+        # Cari baris kota yang diminta (kolom pertama biasanya nama kab/kota)
+        try:
+            indeks = cari_baris_wilayah(df, kota)
+        except ValueError as e:
+            raise ValueError(f"{e} (sheet {year} di {file_path})") from None
+        
+        if indeks is not None:
+            ditemukan = True
+            row = df.loc[indeks]
             
-            # Filter untuk Kota Tangerang
-            tangerang_data = df[df[kota_col].str.contains('Tangerang', case=False, na=False)]
+            # Cari kolom angkatan kerja (biasanya kolom 'Jumlah' atau yang terakhir)
+            angkatan_kerja = None
+            angkatan_kerja_col = cari_kolom_angkatan_kerja(df)
+            if angkatan_kerja_col is not None:
+                angkatan_kerja = row[angkatan_kerja_col]
             
-            if not tangerang_data.empty:
-                # Ambil baris pertama jika ada beberapa
-                row = tangerang_data.iloc[0]
-                
-                # Cari kolom angkatan kerja (biasanya kolom 'Jumlah' atau yang terakhir)
-                angkatan_kerja = None
-                for col in df.columns:
-                    if 'jumlah' in col.lower():
-                        angkatan_kerja = row[col]
-                        break
-                
-                # Jika tidak ada kolom 'Jumlah', ambil kolom numerik terakhir
-                if angkatan_kerja is None:
-                    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-                    if numeric_cols:
-                        angkatan_kerja = row[numeric_cols[-1]]  # Kolom terakhir
-                
-                if angkatan_kerja is not None:
-                    # Buat dataframe untuk tahun ini
-                    year_data = pd.DataFrame({
-                        'Tahun': [int(year)],
-                        'Jumlah Angkatan Kerja': [angkatan_kerja]
-                    })
-                    
-                    all_data.append(year_data)
-                    print(f"  Angkatan kerja {year}: {angkatan_kerja:,}")
-                else:
-                    print(f"  PERINGATAN: Tidak menemukan data angkatan kerja di sheet {year}")
+            if angkatan_kerja is not None:
+                daftar_tahun.append(int(year))
+                daftar_nilai.append(angkatan_kerja)
+                log(f"  Angkatan kerja {year}: {angkatan_kerja:,}", level=DETAIL)
             else:
-                print(f"  PERINGATAN: Tidak menemukan data Kota Tangerang di sheet {year}")
-        
-        # Gabungkan semua data
-        if all_data:
-            combined_df = pd.concat(all_data, ignore_index=True)
-            print(f"\nTotal data BPS: {combined_df.shape}")
-            print(f"Tahun tersedia: {sorted(combined_df['Tahun'].unique())}")
-            return combined_df
+                log(f"  PERINGATAN: Tidak menemukan data angkatan kerja di sheet {year}")
         else:
-            print("TIDAK ADA DATA BPS YANG BERHASIL DIBACA!")
-            return None
-            
-    except Exception as e:
-        print(f"Error membaca {file_path}: {str(e)}")
+            log(f"  PERINGATAN: Tidak menemukan data Kota {kota} di sheet {year}")
+    
+    if not ditemukan:
+        raise ValueError(f"Wilayah '{nama_wilayah_baku(kota)}' tidak ditemukan di {file_path}")
+    
+    if daftar_tahun:
+        combined_df = pd.DataFrame({'Tahun': daftar_tahun, 'Jumlah Angkatan Kerja': daftar_nilai})
+        log(f"\nTotal data BPS: {combined_df.shape}", level=DETAIL)
+        log(f"Tahun tersedia: {sorted(combined_df['Tahun'].unique())}", level=DETAIL)
+        return combined_df
+    else:
+        log("TIDAK ADA DATA BPS YANG BERHASIL DIBACA!")
         return None
 
-# Baca kedua file
-df_penduduk = read_penduduk_data("/datasheet/Data Penduduk - Kota Tangerang.xls", sheets_to_read)
-df_bps = read_bps_data("/datasheet/Data BPS - Jumlah Angkatan Kerja.xls", sheets_to_read)
-
-if df_penduduk is None or df_bps is None:
-    print("ERROR: Gagal membaca salah satu atau kedua file Excel!")
-    
-    # Coba buat data dummy untuk testing jika file tidak terbaca
-    print("Membuat data dummy untuk testing...")
+def data_dummy():
+    """Data dummy untuk testing jika file sumber tidak terbaca"""
     df_penduduk = pd.DataFrame({
         'Tahun': [2020, 2021, 2022, 2023, 2024],
         'Jumlah Penduduk': [1742604, 1771092, 1834962, 1912679, 1927815]
@@ -149,73 +136,134 @@ if df_penduduk is None or df_bps is None:
         'Tahun': [2020, 2021, 2022, 2023, 2024],
         'Jumlah Angkatan Kerja': [5552172, 5698344, 5940618, 5516656, 5797923]
     })
+    return df_penduduk, df_bps
+
+def bentuk_panel(df_penduduk, df_bps, kota="Tangerang", expected_years=None, imputasi=None):
+    """Menyusun data penduduk dan BPS per tahun ke panel wilayah × tahun.
+
+    Tahun yang diharapkan (bawaan 2020-2024) tetapi datanya tidak lengkap dilaporkan;
+    imputasi ("linier"/"ffill") mengisi celah di antara tahun berdata. Diukur sebagai
+    tahap gabung_data (satu kali, baik lewat gabungkan_data maupun data_cleansing_panel).
+    """
+    with tahap("gabung_data") as span:
+        panel = PanelWilayahTahun(list(KOLOM_CLEANSING))
+        panel.isi("Jumlah Penduduk", kota, df_penduduk['Tahun'].to_numpy(), df_penduduk['Jumlah Penduduk'].to_numpy())
+        panel.isi("Jumlah Angkatan Kerja", kota, df_bps['Tahun'].to_numpy(), df_bps['Jumlah Angkatan Kerja'].to_numpy())
+    
+        # Pastikan semua tahun ada (bawaan 2020-2024)
+        if expected_years is None:
+            expected_years = [int(year) for year in sheets_to_read]
+        missing_years = panel.tahun_hilang(kota, expected_years)
+    
+        if len(missing_years):
+            log(f"PERINGATAN: Tahun yang hilang: {missing_years.tolist()}")
+    
+        if imputasi is not None:
+            diisi = panel.imputasi(metode=imputasi)
+            if diisi.any():
+                log(f"Imputasi {imputasi}: {int(diisi.sum())} sel diisi")
+        span.baris = panel.n_tahun
+    return panel
+
+def gabungkan_data(df_penduduk, df_bps, expected_years=None, kota="Tangerang", imputasi=None):
+    """Menggabungkan data penduduk dan BPS per tahun menjadi tabel X/Y siap regresi.
+
+    Hanya tahun yang kedua nilainya ada yang diambil, terurut menurut tahun.
+    """
+    panel = bentuk_panel(df_penduduk, df_bps, kota, expected_years, imputasi)
+    return panel.ke_dataframe(kota, KOLOM_CLEANSING)
+
+def data_cleansing_panel(file_penduduk=FILE_PENDUDUK, file_bps=FILE_BPS, sheets_list=sheets_to_read, kota="Tangerang",
+                         imputasi=None, pakai_dummy=True):
+    """Membaca kedua file sumber ke panel wilayah × tahun (untuk langsung diteruskan ke regresi).
+
+    Jika salah satu file gagal dibaca, data dummy dipakai; dengan pakai_dummy=False
+    (mis. untuk batch banyak kota) ValueError dilempar sebagai gantinya.
+    """
+    df_penduduk = read_penduduk_data(file_penduduk, sheets_list)
+    try:
+        df_bps = read_bps_data(file_bps, sheets_list, kota=kota)
+    except ValueError as e:
+        # Wilayah tidak ada atau ambigu: untuk batch harus gagal, bukan memakai data kota lain/dummy
+        if not pakai_dummy:
+            raise
+        log(f"ERROR: {e}", level=DIAM)
+        df_bps = None
+    
+    if df_penduduk is None or df_bps is None:
+        log("ERROR: Gagal membaca salah satu atau kedua file Excel!", level=DIAM)
+        if not pakai_dummy:
+            sumber = file_penduduk if df_penduduk is None else file_bps
+            raise ValueError(f"Data Kota {kota} tidak dapat dibaca dari '{sumber}'")
+        
+        # Coba buat data dummy untuk testing jika file tidak terbaca
+        log("Membuat data dummy untuk testing...")
+        df_penduduk, df_bps = data_dummy()
+    
+    return bentuk_panel(df_penduduk, df_bps, kota, [int(year) for year in sheets_list], imputasi)
+
+def data_cleansing(file_penduduk=FILE_PENDUDUK, file_bps=FILE_BPS, sheets_list=sheets_to_read, kota="Tangerang"):
+    """Membaca kedua file sumber dan mengembalikan DataFrame hasil cleansing (tanpa menulis file)"""
+    panel = data_cleansing_panel(file_penduduk, file_bps, sheets_list, kota)
+    return panel.ke_dataframe(kota, KOLOM_CLEANSING)
+
+@diukur("simpan_data_cleansing")
+def simpan_data_cleansing(df_grouped, output_path=OUTPUT_PATH):
+    """Ekspor opsional hasil cleansing ke Excel (sheet Summary)"""
+    try:
+        df_grouped.to_excel(output_path, index=False, sheet_name="Summary")
+        log(f"\nFile '{output_path}' berhasil disimpan!")
+    except Exception as e:
+        log(f"Error menyimpan file: {str(e)}", level=DIAM)
+
+def tampilkan_hasil(df_grouped, kota="Tangerang"):
+    """Menampilkan tabel hasil cleansing dan statistik ringkas"""
+    log("\n" + "="*60)
+    log(f"HASIL DATA CLEANSING - KOTA {kota.upper()}")
+    log("="*60)
+    
+    # Format header dengan spacing yang tepat
+    log(f"{'Tahun':<6} {'Jumlah Penduduk (X)':<20} {'Jumlah Angkatan Kerja (Y)'}")
+    
+    # Format data rows (sekali join per kolom, bukan iterrows)
+    if len(df_grouped) > 0:
+        tahun = df_grouped['Tahun'].astype(int).astype(str).str.ljust(6)
+        penduduk = df_grouped['Jumlah Penduduk (X)'].fillna(0).astype('int64').astype(str).str.ljust(20)
+        angkatan_kerja = df_grouped['Jumlah Angkatan Kerja (Y)'].fillna(0).astype('int64').astype(str)
+        log("\n".join(tahun + " " + penduduk + " " + angkatan_kerja))
+    
+    log("="*60)
+    
+    # Tampilkan statistik
+    log(f"\nSTATISTIK:")
+    log(f"Total tahun data: {len(df_grouped)}")
+    if len(df_grouped) > 0:
+        log(f"Rentang tahun: {int(df_grouped['Tahun'].min())} - {int(df_grouped['Tahun'].max())}")
+        if df_grouped['Jumlah Penduduk (X)'].sum() > 0:
+            log(f"Rata-rata jumlah penduduk: {df_grouped['Jumlah Penduduk (X)'].mean():,.0f}")
+        if df_grouped['Jumlah Angkatan Kerja (Y)'].sum() > 0:
+            log(f"Rata-rata angkatan kerja: {df_grouped['Jumlah Angkatan Kerja (Y)'].mean():,.0f}")
+
+def main(output_path=OUTPUT_PATH):
+    with tahap("data_cleansing") as span:
+        log("MEMULAI PROSES DATA CLEANSING...")
+        log("="*50)
+        
+        df_grouped = data_cleansing()
+        span.baris = len(df_grouped)
+        
+        log("\n" + "="*50)
+        tampilkan(df_grouped, "\nData final:")
+        
+        # Simpan ke file Excel
+        simpan_data_cleansing(df_grouped, output_path)
+        
+        # Tampilkan hasil dalam format yang diminta
+        tampilkan_hasil(df_grouped)
+        
+        log("\nPROSES SELESAI!")
+    return df_grouped
 
-print("\n" + "="*50)
-print("MEMPROSES DATA...")
-
-print(f"\nData penduduk:")
-print(df_penduduk)
-print(f"\nData BPS:")
-print(df_bps)
-
-# Gabungkan data berdasarkan tahun
-df_combined = pd.merge(df_penduduk, df_bps, on="Tahun", how="outer")
-print(f"\nData setelah merge:")
-print(df_combined)
-
-# Handle missing values
-df_combined = df_combined.dropna()
-
-# Pastikan semua tahun ada (2020-2024)
-expected_years = list(range(2020, 2025))
-existing_years = set(df_combined['Tahun'].astype(int))
-missing_years = set(expected_years) - existing_years
-
-if missing_years:
-    print(f"PERINGATAN: Tahun yang hilang: {sorted(missing_years)}")
-
-# Urutkan berdasarkan tahun
-df_grouped = df_combined.sort_values('Tahun').reset_index(drop=True)
-
-# Ubah nama kolom sesuai permintaan
-df_grouped.columns = ["Tahun", "Jumlah Penduduk (X)", "Jumlah Angkatan Kerja (Y)"]
-
-print(f"\nData final:")
-print(df_grouped)
-
-# Simpan ke file Excel
-output_path = "Data Cleansing.xlsx"
-try:
-    df_grouped.to_excel(output_path, index=False, sheet_name="Summary")
-    print(f"\nFile '{output_path}' berhasil disimpan!")
-except Exception as e:
-    print(f"Error menyimpan file: {str(e)}")
-
-# Tampilkan hasil dalam format yang diminta
-print("\n" + "="*60)
-print("HASIL DATA CLEANSING - KOTA TANGERANG")
-print("="*60)
-
-# Format header dengan spacing yang tepat
-print(f"{'Tahun':<6} {'Jumlah Penduduk (X)':<20} {'Jumlah Angkatan Kerja (Y)'}")
-
-# Format data rows
-for index, row in df_grouped.iterrows():
-    tahun = int(row['Tahun'])
-    penduduk = int(row['Jumlah Penduduk (X)']) if pd.notna(row['Jumlah Penduduk (X)']) else 0
-    angkatan_kerja = int(row['Jumlah Angkatan Kerja (Y)']) if pd.notna(row['Jumlah Angkatan Kerja (Y)']) else 0
-    print(f"{tahun:<6} {penduduk:<20} {angkatan_kerja}")
-
-print("="*60)
-
-# Tampilkan statistik
-print(f"\nSTATISTIK:")
-print(f"Total tahun data: {len(df_grouped)}")
-if len(df_grouped) > 0:
-    print(f"Rentang tahun: {int(df_grouped['Tahun'].min())} - {int(df_grouped['Tahun'].max())}")
-    if df_grouped['Jumlah Penduduk (X)'].sum() > 0:
-        print(f"Rata-rata jumlah penduduk: {df_grouped['Jumlah Penduduk (X)'].mean():,.0f}")
-    if df_grouped['Jumlah Angkatan Kerja (Y)'].sum() > 0:
-        print(f"Rata-rata angkatan kerja: {df_grouped['Jumlah Angkatan Kerja (Y)'].mean():,.0f}")
-
-print("\nPROSES SELESAI!")
\ No newline at end of file
+if __name__ == "__main__":
+    inisialisasi()
+    main()
@@ -0,0 +1,140 @@
+import zipfile
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+from cache_excel import NS_PKG_REL
+
+# Baris per blok saat menulis XML sheet; memori tetap sebesar satu blok
+BARIS_PER_BLOK = 50_000
+
+# Id pertama untuk format angka kustom (0-163 dicadangkan Excel)
+ID_FORMAT_KUSTOM = 164
+
+NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_REL_DOC = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+TIPE_KONTEN = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+
+_XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+
+def _atribut(teks):
+    return escape(teks, {'"': "&quot;"})
+
+
+def _content_types(jumlah_sheet):
+    sheet = "".join(f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+                    f'ContentType="{TIPE_KONTEN}.worksheet+xml"/>' for i in range(1, jumlah_sheet + 1))
+    return (_XML + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/xl/workbook.xml" ContentType="{TIPE_KONTEN}.sheet.main+xml"/>'
+            f'<Override PartName="/xl/styles.xml" ContentType="{TIPE_KONTEN}.styles+xml"/>'
+            f'{sheet}</Types>')
+
+
+def _rels_paket():
+    return (_XML + f'<Relationships xmlns="{NS_PKG_REL[1:-1]}">'
+            f'<Relationship Id="rId1" Type="{NS_REL_DOC}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>')
+
+
+def _workbook(nama_sheet):
+    sheet = "".join(f'<sheet name="{_atribut(nama)}" sheetId="{i}" r:id="rId{i}"/>'
+                    for i, nama in enumerate(nama_sheet, 1))
+    return (_XML + f'<workbook xmlns="{NS_MAIN}" xmlns:r="{NS_REL_DOC}"><sheets>{sheet}</sheets></workbook>')
+
+
+def _rels_workbook(jumlah_sheet):
+    sheet = "".join(f'<Relationship Id="rId{i}" Type="{NS_REL_DOC}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                    for i in range(1, jumlah_sheet + 1))
+    return (_XML + f'<Relationships xmlns="{NS_PKG_REL[1:-1]}">{sheet}'
+            f'<Relationship Id="rId{jumlah_sheet + 1}" Type="{NS_REL_DOC}/styles" Target="styles.xml"/>'
+            '</Relationships>')
+
+
+def _styles(daftar_format):
+    # xf 0 = bawaan, xf 1 = header tebal, xf 2.. = format angka sesuai urutan daftar_format
+    num_fmt = "".join(f'<numFmt numFmtId="{ID_FORMAT_KUSTOM + i}" formatCode="{_atribut(kode)}"/>'
+                      for i, kode in enumerate(daftar_format))
+    xf = "".join(f'<xf numFmtId="{ID_FORMAT_KUSTOM + i}" fontId="0" fillId="0" borderId="0" xfId="0" '
+                 'applyNumberFormat="1"/>' for i in range(len(daftar_format)))
+    return (_XML + f'<styleSheet xmlns="{NS_MAIN}">'
+            + (f'<numFmts count="{len(daftar_format)}">{num_fmt}</numFmts>' if daftar_format else "") +
+            '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+            '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+            '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+            '<fill><patternFill patternType="gray125"/></fill></fills>'
+            '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            f'<cellXfs count="{2 + len(daftar_format)}"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+            f'<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>{xf}</cellXfs>'
+            '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+            '</styleSheet>')
+
+
+def _sel_teks(nilai, gaya=""):
+    return f'<c t="inlineStr"{gaya}><is><t xml:space="preserve">{escape(str(nilai))}</t></is></c>'
+
+
+def _sel_kolom(kolom, gaya):
+    """String XML sel untuk satu kolom dalam satu blok; kolom numerik diformat secara vektor"""
+    if pd.api.types.is_numeric_dtype(kolom.dtype) and not pd.api.types.is_bool_dtype(kolom.dtype):
+        nilai = kolom.to_numpy()
+        kosong = ~np.isfinite(nilai.astype(np.float64))
+        teks = pd.Series(nilai.astype(str), dtype=object)
+        sel = f'<c{gaya}><v>' + teks + '</v></c>'
+        sel[kosong] = "<c/>"
+        return sel.to_numpy()
+
+    # Kolom campuran (misalnya Tahun dengan baris "Jumlah"): angka tetap sel angka
+    hasil = []
+    for nilai in kolom.tolist():
+        if nilai is None or (isinstance(nilai, float) and not np.isfinite(nilai)):
+            hasil.append("<c/>")
+        elif isinstance(nilai, (int, float, np.number)) and not isinstance(nilai, (bool, np.bool_)):
+            hasil.append(f'<c{gaya}><v>{nilai}</v></c>')
+        else:
+            hasil.append(_sel_teks(nilai))
+    return np.array(hasil, dtype=object)
+
+
+def _tulis_sheet(f, df, gaya_kolom, baris_per_blok):
+    f.write(f'{_XML}<worksheet xmlns="{NS_MAIN}"><sheetData>'.encode("utf-8"))
+    header = "".join(_sel_teks(kolom, ' s="1"') for kolom in df.columns)
+    f.write(f'<row>{header}</row>'.encode("utf-8"))
+    gaya = [f' s="{gaya_kolom[kolom]}"' if kolom in gaya_kolom else "" for kolom in df.columns]
+    for mulai in range(0, len(df), baris_per_blok):
+        blok = df.iloc[mulai:mulai + baris_per_blok]
+        baris = "<row>"
+        for i, g in enumerate(gaya):
+            baris = baris + _sel_kolom(blok.iloc[:, i], g)
+        baris = baris + "</row>"
+        f.write("\n".join(baris.tolist()).encode("utf-8"))
+    f.write(b"</sheetData></worksheet>")
+
+
+def simpan_xlsx(path, daftar_sheet, baris_per_blok=BARIS_PER_BLOK):
+    """Menulis beberapa sheet sekaligus ke satu workbook .xlsx dengan sel angka asli.
+
+    daftar_sheet: list (nama_sheet, DataFrame, {kolom: format angka Excel}).
+    XML sheet dibangun per blok baris dengan operasi string vektor dan langsung
+    di-stream ke arsip zip, sehingga cepat dan memori tetap konstan untuk tabel besar.
+    """
+    daftar_format = []
+    for _, _, format_kolom in daftar_sheet:
+        for kode in format_kolom.values():
+            if kode not in daftar_format:
+                daftar_format.append(kode)
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as arsip:
+        arsip.writestr("[Content_Types].xml", _content_types(len(daftar_sheet)))
+        arsip.writestr("_rels/.rels", _rels_paket())
+        arsip.writestr("xl/workbook.xml", _workbook([nama for nama, _, _ in daftar_sheet]))
+        arsip.writestr("xl/_rels/workbook.xml.rels", _rels_workbook(len(daftar_sheet)))
+        arsip.writestr("xl/styles.xml", _styles(daftar_format))
+        for i, (_, df, format_kolom) in enumerate(daftar_sheet, 1):
+            gaya_kolom = {kolom: 2 + daftar_format.index(kode) for kolom, kode in format_kolom.items()}
+            with arsip.open(f"xl/worksheets/sheet{i}.xml", "w", force_zip64=True) as f:
+                _tulis_sheet(f, df, gaya_kolom, baris_per_blok)
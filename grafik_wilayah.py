@@ -0,0 +1,262 @@
+import argparse
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from instrumentasi import inisialisasi, log, tahap, tambah, DIAM
+from model_regresi import nama_berkas_aman
+from regresi_batch import matriks_wilayah_tahun, regresi_batch, sejajarkan_wilayah
+
+FORMAT_RASTER = ("png",)
+FORMAT_VEKTOR = ("svg", "pdf")
+
+# Resolusi bawaan untuk banyak grafik; 300 dpi hanya perlu untuk grafik laporan tunggal
+DPI_BAWAAN = 100
+
+# Ukuran satu panel (inci) pada grafik per wilayah maupun halaman grid
+UKURAN_PANEL = (10, 6)
+UKURAN_PANEL_GRID = (4, 3)
+
+# Data dan kanvas milik proses worker (diisi oleh _inisialisasi_worker)
+_data_worker = None
+_kanvas_worker = None
+
+
+def _format_juta(nilai, _posisi=None):
+    return f'{nilai/1e6:.1f}M'
+
+
+class KanvasGrafik:
+    """Figure dan artist yang dibuat sekali lalu dipakai ulang untuk setiap wilayah.
+
+    Setiap panel memiliki garis data aktual, garis regresi, judul, dan label nilai
+    per periode; merender wilayah berikutnya cukup mengganti data artist tersebut
+    (set_data/set_text) tanpa membangun figure, axes, dan anotasi baru.
+    """
+
+    def __init__(self, tahun, baris=1, kolom=1, dpi=DPI_BAWAAN):
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from matplotlib.ticker import FuncFormatter
+
+        self.tahun = np.asarray(tahun)
+        self.grid = baris * kolom > 1
+        lebar, tinggi = UKURAN_PANEL_GRID if self.grid else UKURAN_PANEL
+        self.fig, axes = plt.subplots(baris, kolom, figsize=(lebar * kolom, tinggi * baris), dpi=dpi,
+                                      squeeze=False)
+        ukuran_huruf = 7 if self.grid else 9
+        rentang = float(self.tahun.max() - self.tahun.min()) if len(self.tahun) else 1.0
+        tepi = max(rentang * 0.05, 0.5)
+
+        self.panel = []
+        for ax in axes.ravel():
+            aktual, = ax.plot([], [], 'bo-', label="Data Aktual", markersize=4 if self.grid else 8, linewidth=2)
+            prediksi, = ax.plot([], [], 'r--', label="Regresi Linear", linewidth=2)
+            label_aktual = [ax.annotate("", (0, 0), textcoords="offset points", xytext=(0, 10),
+                                        ha='center', fontsize=ukuran_huruf) for _ in self.tahun]
+            label_prediksi = [ax.annotate("", (0, 0), textcoords="offset points", xytext=(0, -15),
+                                          ha='center', fontsize=ukuran_huruf, color='red') for _ in self.tahun]
+            ax.set_xlim(self.tahun.min() - tepi, self.tahun.max() + tepi)
+            ax.yaxis.set_major_formatter(FuncFormatter(_format_juta))
+            ax.grid(True, alpha=0.3)
+            # Judul dua baris sementara agar tight_layout menyisakan ruang untuk judul sebenarnya
+            judul = ax.set_title("Wilayah\nY = a + bX", fontsize=9 if self.grid else 14)
+            if not self.grid:
+                ax.set_xlabel("Tahun", fontsize=12)
+                ax.set_ylabel("Jumlah Angkatan Kerja", fontsize=12)
+                # Posisi legenda tetap; loc="best" dihitung ulang pada setiap render
+                ax.legend(fontsize=11, loc="upper left")
+            self.panel.append((ax, aktual, prediksi, label_aktual, label_prediksi, judul))
+
+        if self.grid:
+            self.fig.legend(*axes[0, 0].get_legend_handles_labels(), loc="lower center", ncol=2, fontsize=9)
+            self.fig.tight_layout(rect=(0, 0.04, 1, 1))
+        else:
+            self.fig.tight_layout()
+        # Tata letak dihitung sekali; tanpa layout engine savefig tidak menggambar figure dua kali
+        self.fig.set_layout_engine(None)
+
+    def _isi_panel(self, panel, nama, y, y_pred, a, b, r_squared):
+        ax, aktual, prediksi, label_aktual, label_prediksi, judul = panel
+        ax.set_visible(True)
+        aktual.set_data(self.tahun, y)
+        prediksi.set_data(self.tahun, y_pred)
+        for label, t, nilai in zip(label_aktual, self.tahun, y):
+            label.xy = (t, nilai)
+            label.set_text(_format_juta(nilai))
+            label.set_visible(bool(np.isfinite(nilai)))
+        for label, t, nilai in zip(label_prediksi, self.tahun, y_pred):
+            label.xy = (t, nilai)
+            label.set_text(_format_juta(nilai))
+            label.set_visible(bool(np.isfinite(nilai)))
+
+        if self.grid:
+            judul.set_text(f"{nama}\nY = {a:,.0f} + {b:.4f}X (r² = {r_squared:.3f})")
+        else:
+            judul.set_text(f"Regresi Linear: Penduduk vs Angkatan Kerja {nama}\n"
+                           f"Y = {a:,.0f} + {b:.6f}X (r² = {r_squared:.4f})")
+
+        # Batas sumbu Y dihitung langsung (lebih murah daripada relim/autoscale per artist)
+        nilai = np.concatenate([y, y_pred])
+        nilai = nilai[np.isfinite(nilai)]
+        if nilai.size:
+            bawah, atas = nilai.min(), nilai.max()
+            tepi = max((atas - bawah) * 0.15, abs(atas) * 0.01, 1.0)
+            ax.set_ylim(bawah - tepi, atas + tepi)
+
+    def _isi(self, daftar_panel):
+        for i, panel in enumerate(self.panel):
+            if i < len(daftar_panel):
+                self._isi_panel(panel, *daftar_panel[i])
+            else:
+                panel[0].set_visible(False)
+
+    def render(self, daftar_panel, path, format="png"):
+        """Mengisi panel dengan data (nama, y, y_pred, a, b, r²) lalu menyimpan satu halaman"""
+        self._isi(daftar_panel)
+        self.fig.savefig(path, format=format)
+        return os.path.getsize(path)
+
+    def png(self, daftar_panel):
+        """Seperti render, tetapi mengembalikan bytes PNG di memori (mis. untuk laporan PDF)"""
+        self._isi(daftar_panel)
+        buffer = io.BytesIO()
+        self.fig.savefig(buffer, format="png")
+        return buffer.getvalue()
+
+    def tutup(self):
+        import matplotlib.pyplot as plt
+        plt.close(self.fig)
+
+
+def _siapkan_matplotlib(format):
+    import matplotlib
+    matplotlib.use("Agg")
+    # Teks SVG tetap teks (bukan path per huruf) sehingga berkas vektor kecil
+    matplotlib.rcParams["svg.fonttype"] = "none"
+    matplotlib.rcParams["path.simplify"] = True
+
+
+def _inisialisasi_worker(data):
+    global _data_worker, _kanvas_worker
+    _data_worker = data
+    _kanvas_worker = None
+    _siapkan_matplotlib(data["format"])
+
+
+def _render_halaman(data, kanvas, indeks, path):
+    mulai = time.perf_counter()
+    daftar_panel = [(data["wilayah"][i], data["Y"][i], data["a"][i] + data["b"][i] * data["X"][i],
+                     data["a"][i], data["b"][i], data["r_squared"][i]) for i in indeks]
+    ukuran = kanvas.render(daftar_panel, path, data["format"])
+    return path, ukuran, time.perf_counter() - mulai
+
+
+def _halaman_worker(indeks, path):
+    global _kanvas_worker
+    if _kanvas_worker is None:
+        _kanvas_worker = KanvasGrafik(_data_worker["tahun"], *_data_worker["grid"], dpi=_data_worker["dpi"])
+    return _render_halaman(_data_worker, _kanvas_worker, indeks, path)
+
+
+def render_matriks(wilayah, tahun, X, Y, direktori, format="png", grid=None, dpi=DPI_BAWAAN, max_workers=None):
+    """Merender grafik regresi banyak wilayah dari matriks wilayah × tahun.
+
+    grid=None menghasilkan satu berkas per wilayah; grid=(baris, kolom) menghasilkan
+    halaman small multiples berisi baris × kolom wilayah. format "png" (raster) atau
+    "svg"/"pdf" (vektor). Halaman dibagi ke process pool; setiap worker membangun satu
+    KanvasGrafik dan memakainya ulang untuk semua halamannya.
+    Mengembalikan list (path, ukuran byte, detik render) per halaman.
+    """
+    if format not in FORMAT_RASTER + FORMAT_VEKTOR:
+        raise ValueError(f"Format grafik '{format}' tidak dikenal (pilihan: {FORMAT_RASTER + FORMAT_VEKTOR})")
+    os.makedirs(direktori, exist_ok=True)
+    grid = tuple(grid) if grid else (1, 1)
+    per_halaman = grid[0] * grid[1]
+
+    wilayah = [str(w) for w in wilayah]
+    X = np.asarray(X, dtype=np.float64)
+    Y = np.asarray(Y, dtype=np.float64)
+    hasil = regresi_batch(X, Y)
+    data = {"wilayah": wilayah, "tahun": np.asarray(tahun), "X": X, "Y": Y,
+            "a": hasil["a"], "b": hasil["b"], "r_squared": hasil["r_squared"],
+            "format": format, "grid": grid, "dpi": dpi}
+
+    halaman = [list(range(i, min(i + per_halaman, len(wilayah)))) for i in range(0, len(wilayah), per_halaman)]
+    if per_halaman == 1:
+        path = [os.path.join(direktori, f"{nama_berkas_aman(wilayah[i])}.{format}") for i, in halaman]
+    else:
+        path = [os.path.join(direktori, f"halaman_{nomor:03d}.{format}") for nomor in range(1, len(halaman) + 1)]
+
+    with tahap("render_wilayah", format=format, grid=f"{grid[0]}x{grid[1]}") as span:
+        span.baris = len(wilayah)
+        paralel = len(halaman) > 1 and max_workers != 1 and (os.cpu_count() or 1) > 1
+        if paralel:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_inisialisasi_worker,
+                                     initargs=(data,)) as executor:
+                chunksize = max(1, len(halaman) // (4 * (max_workers or os.cpu_count() or 1)))
+                keluaran = list(executor.map(_halaman_worker, halaman, path, chunksize=chunksize))
+        else:
+            _siapkan_matplotlib(format)
+            kanvas = KanvasGrafik(data["tahun"], *grid, dpi=dpi) if halaman else None
+            try:
+                keluaran = [_render_halaman(data, kanvas, indeks, p) for indeks, p in zip(halaman, path)]
+            finally:
+                if kanvas is not None:
+                    kanvas.tutup()
+        tambah("halaman", len(keluaran))
+        tambah("byte_output", sum(ukuran for _, ukuran, _ in keluaran))
+    return keluaran
+
+
+def render_wilayah(df_x, df_y, direktori, kolom_x='Jumlah Penduduk', kolom_y='Jumlah Angkatan Kerja', **opsi):
+    """Grafik regresi per wilayah dari dua tabel format panjang (Wilayah, Tahun, nilai).
+
+    Wilayah dipasangkan dengan sejajarkan_wilayah; opsi lain (format, grid, dpi, max_workers)
+    diteruskan ke render_matriks.
+    """
+    df_x, wilayah = sejajarkan_wilayah(df_x, df_y)
+    tahun = np.union1d(df_x['Tahun'].unique(), df_y['Tahun'].unique())
+    wilayah, tahun, X = matriks_wilayah_tahun(df_x, kolom_x, wilayah, tahun)
+    _, _, Y = matriks_wilayah_tahun(df_y, kolom_y, wilayah, tahun)
+    return render_matriks(wilayah, tahun, X, Y, direktori, **opsi)
+
+
+def _grid(teks):
+    baris, kolom = teks.lower().split("x")
+    return int(baris), int(kolom)
+
+
+if __name__ == "__main__":
+    from pembacaan_sheet import baca_penduduk_dan_bps
+
+    parser = argparse.ArgumentParser(description="Grafik regresi per wilayah (paralel, small multiples)")
+    parser.add_argument("--direktori", default="grafik_wilayah", help="folder keluaran grafik")
+    parser.add_argument("--format", choices=FORMAT_RASTER + FORMAT_VEKTOR, default="png")
+    parser.add_argument("--grid", type=_grid, help="halaman small multiples, misalnya 3x4 (bawaan: satu grafik per wilayah)")
+    parser.add_argument("--dpi", type=int, default=DPI_BAWAAN)
+    parser.add_argument("--workers", type=int, help="jumlah proses worker (bawaan: jumlah CPU)")
+    args = parser.parse_args()
+    inisialisasi()
+
+    log("MEMULAI RENDER GRAFIK PER WILAYAH...")
+    log("="*50)
+
+    df_x, df_y = baca_penduduk_dan_bps()
+
+    if df_x is None or df_y is None:
+        log("ERROR: Gagal membaca data per wilayah!", level=DIAM)
+    else:
+        mulai = time.perf_counter()
+        keluaran = render_wilayah(df_x, df_y, args.direktori, format=args.format, grid=args.grid,
+                                  dpi=args.dpi, max_workers=args.workers)
+        detik = time.perf_counter() - mulai
+        total_byte = sum(ukuran for _, ukuran, _ in keluaran)
+        log(f"{len(keluaran)} berkas ({total_byte/1024:,.0f} KB) disimpan di '{args.direktori}' dalam {detik:.2f} detik")
+
+    log("\nPROSES SELESAI!")
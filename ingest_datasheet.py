@@ -0,0 +1,168 @@
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from cache_excel import baca_excel, hash_berkas, NS_SHEET
+from instrumentasi import inisialisasi, log, tahap
+from panel_wilayah import PanelWilayahTahun
+from pembacaan_sheet import ekstrak_penduduk_per_kecamatan, ekstrak_bps_per_wilayah
+
+# Folder tempat workbook sumber diletakkan (satu workbook per kota per tahun)
+DIREKTORI_DATASHEET = "/datasheet"
+
+# Panel wilayah × tahun hasil ingest (dibaca dengan PanelWilayahTahun.muat)
+OUTPUT_PATH = "Panel Wilayah.npz"
+
+# Jenis sumber dikenali dari nama berkas: (kata kunci, jenis, ekstraktor, nama variabel)
+JENIS_SUMBER = [
+    (("penduduk",), "penduduk", ekstrak_penduduk_per_kecamatan, "Jumlah Penduduk"),
+    (("bps", "angkatan kerja"), "bps", ekstrak_bps_per_wilayah, "Jumlah Angkatan Kerja"),
+]
+
+POLA_TAHUN = re.compile(r"(?<!\d)(19|20)\d{2}(?!\d)")
+
+
+def jenis_sumber(file_path):
+    """Menentukan jenis workbook dari nama berkasnya, None jika tidak dikenali"""
+    nama = os.path.basename(file_path).lower()
+    for kata_kunci, jenis, _, _ in JENIS_SUMBER:
+        if any(kata in nama for kata in kata_kunci):
+            return jenis
+    return None
+
+
+def daftar_workbook(direktori=DIREKTORI_DATASHEET):
+    """Path semua workbook sumber yang dikenali di folder datasheet (urutan tetap)"""
+    if not os.path.isdir(direktori):
+        return []
+    return [os.path.join(direktori, nama) for nama in sorted(os.listdir(direktori))
+            if not nama.startswith("~$") and nama.lower().endswith((".xls", ".xlsx"))
+            and jenis_sumber(nama) is not None]
+
+
+def daftar_sheet(file_path):
+    """Daftar nama sheet; untuk .xlsx dibaca langsung dari workbook.xml tanpa parsing data"""
+    if zipfile.is_zipfile(file_path):
+        try:
+            with zipfile.ZipFile(file_path) as arsip:
+                workbook = ET.fromstring(arsip.read("xl/workbook.xml"))
+            return [sheet.get("name") for sheet in workbook.iter(f"{NS_SHEET}sheet")]
+        except (KeyError, ET.ParseError):
+            pass
+    return pd.ExcelFile(file_path).sheet_names
+
+
+def tahun_sheet(sheet, file_path):
+    """Tahun data sebuah sheet: dari nama sheet, atau dari nama berkas jika sheet tidak bertahun"""
+    for teks in (str(sheet), os.path.basename(file_path)):
+        cocok = POLA_TAHUN.search(teks)
+        if cocok:
+            return int(cocok.group(0))
+    return None
+
+
+def temukan_tugas(direktori=DIREKTORI_DATASHEET):
+    """Menemukan semua workbook sumber beserta sheet tahunannya.
+
+    Workbook .xlsx dipecah satu tugas per sheet karena setiap sheet dapat di-parsing
+    sendiri. Workbook .xls lama selalu di-parsing utuh, jadi satu tugas per berkas. Hash
+    isi berkas untuk kunci cache dihitung sekali per workbook di sini, bukan per tugas.
+    """
+    tugas = []
+    for file_path in daftar_workbook(direktori):
+        jenis = jenis_sumber(file_path)
+        sheets = [(sheet, tahun_sheet(sheet, file_path)) for sheet in daftar_sheet(file_path)]
+        sheets = [(sheet, tahun) for sheet, tahun in sheets if tahun is not None]
+        if not sheets:
+            continue
+
+        file_hash = hash_berkas(file_path)
+        if file_path.lower().endswith(".xlsx"):
+            tugas.extend((file_path, jenis, [item], file_hash) for item in sheets)
+        else:
+            tugas.append((file_path, jenis, sheets, file_hash))
+    return tugas
+
+
+def proses_tugas(tugas):
+    """Worker: parsing sheet-sheet satu tugas dan menerapkan deteksi kolom yang sama
+    dengan read_penduduk_data/read_bps_data. Mengembalikan data format rapi."""
+    file_path, jenis, sheets, file_hash = tugas
+    _, _, ekstraktor, variabel = next(item for item in JENIS_SUMBER if item[1] == jenis)
+
+    excel_data = baca_excel(file_path, [sheet for sheet, _ in sheets], file_hash)
+    hasil = []
+    for sheet, tahun in sheets:
+        df = ekstraktor(excel_data[sheet], tahun)
+        if df is None or df.empty:
+            continue
+        hasil.append(pd.DataFrame({
+            "Sumber": os.path.basename(file_path),
+            "Sheet": str(sheet),
+            "Wilayah": df["Wilayah"],
+            "Tahun": df["Tahun"],
+            "Variabel": variabel,
+            "Nilai": df[variabel],
+        }))
+    return hasil
+
+
+def ingest_datasheet(direktori=DIREKTORI_DATASHEET, max_workers=None):
+    """Membaca semua workbook di folder datasheet secara paralel ke satu tabel rapi.
+
+    Kolom hasil: Sumber, Sheet, Wilayah, Tahun, Variabel, Nilai.
+    """
+    tugas = temukan_tugas(direktori)
+    kolom = ["Sumber", "Sheet", "Wilayah", "Tahun", "Variabel", "Nilai"]
+    if not tugas:
+        return pd.DataFrame(columns=kolom)
+
+    hasil = []
+    if len(tugas) == 1 or max_workers == 1:
+        for item in tugas:
+            try:
+                hasil.extend(proses_tugas(item))
+            except Exception as e:
+                log(f"PERINGATAN: Gagal membaca {item[0]}: {str(e)}")
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(proses_tugas, item): item for item in tugas}
+            for future, item in futures.items():
+                try:
+                    hasil.extend(future.result())
+                except Exception as e:
+                    log(f"PERINGATAN: Gagal membaca {item[0]}: {str(e)}")
+
+    if not hasil:
+        return pd.DataFrame(columns=kolom)
+    return pd.concat(hasil, ignore_index=True)
+
+
+def main(direktori=DIREKTORI_DATASHEET, output_path=OUTPUT_PATH):
+    """Ingest semua workbook lalu menyimpan panel wilayah × tahun-nya (tahap 'ingest' di pipeline)"""
+    with tahap("ingest") as span:
+        log("MEMULAI INGEST DATASHEET...")
+        log("="*50)
+
+        df_tidy = ingest_datasheet(direktori)
+        span.baris = len(df_tidy)
+        log(f"Total baris: {len(df_tidy)}")
+        if not df_tidy.empty:
+            log(f"Sumber: {sorted(df_tidy['Sumber'].unique())}")
+            log(f"Tahun tersedia: {sorted(int(t) for t in df_tidy['Tahun'].unique())}")
+
+        panel = PanelWilayahTahun.dari_tidy(df_tidy)
+        panel.simpan(output_path)
+        log(f"Panel {len(panel.wilayah)} wilayah berhasil disimpan sebagai '{output_path}'")
+
+        log("\nPROSES SELESAI!")
+    return panel
+
+
+if __name__ == "__main__":
+    inisialisasi()
+    main()
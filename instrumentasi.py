@@ -0,0 +1,165 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Tingkat verbosity: 0 = hanya error, 1 = ringkas (bawaan), 2 = detail (kolom, DataFrame lengkap)
+DIAM, RINGKAS, DETAIL = 0, 1, 2
+
+_verbosity = int(os.environ.get("REGRESI_VERBOSITY", RINGKAS))
+_path_metrik = os.environ.get("REGRESI_METRIK")  # berkas JSON Lines untuk peristiwa tahap
+_lokal = threading.local()
+_kunci = threading.Lock()
+
+# Peristiwa tahap terakhir pada proses ini (dibatasi agar proses panjang tidak terus membesar);
+# catatan lengkap ditulis ke _path_metrik jika diatur
+MAKS_PERISTIWA = 10_000
+peristiwa = deque(maxlen=MAKS_PERISTIWA)
+
+
+def inisialisasi(tracemalloc_aktif=None):
+    """Menyalakan pengukuran memori puncak per tahap; dipanggil oleh entry point (dan worker).
+
+    Bawaan mengikuti REGRESI_TRACEMALLOC=1. Mengimpor modul ini saja tidak menyalakan tracemalloc.
+    """
+    if tracemalloc_aktif is None:
+        tracemalloc_aktif = os.environ.get("REGRESI_TRACEMALLOC") == "1"
+    if tracemalloc_aktif and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def atur_verbosity(level):
+    global _verbosity
+    _verbosity = int(level)
+
+
+def atur_path_metrik(path):
+    """Mengatur berkas JSON Lines tujuan peristiwa tahap (None untuk mematikan)"""
+    global _path_metrik
+    _path_metrik = path
+
+
+def log(pesan="", level=RINGKAS):
+    """Mencetak pesan jika tingkat verbosity mencukupi (langsung di-flush agar progres terlihat saat di-pipe)"""
+    if level <= _verbosity:
+        print(pesan, flush=True)
+
+
+def tampilkan(obj, judul=None, level=DETAIL):
+    """Mencetak objek besar (DataFrame, list) hanya pada verbosity detail"""
+    if level <= _verbosity:
+        if judul:
+            print(judul)
+        print(obj)
+
+
+def _span_aktif():
+    if not hasattr(_lokal, "span"):
+        _lokal.span = []
+    return _lokal.span
+
+
+def tambah(metrik, nilai=1):
+    """Menambah penghitung (misalnya cache_hit) pada semua tahap yang sedang aktif"""
+    for span in _span_aktif():
+        span.penghitung[metrik] = span.penghitung.get(metrik, 0) + nilai
+
+
+def _rss_maks_kb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+class Span:
+    """Data satu tahap yang sedang diukur"""
+
+    def __init__(self, nama, atribut):
+        self.nama = nama
+        self.atribut = dict(atribut)
+        self.baris = None
+        self.penghitung = {}
+        self.puncak_anak = 0
+
+
+def _tulis(data):
+    with _kunci:
+        peristiwa.append(data)
+        if _path_metrik:
+            with open(_path_metrik, "a", encoding="utf-8") as f:
+                f.write(json.dumps(data, default=str) + "\n")
+
+
+@contextmanager
+def tahap(nama, **atribut):
+    """Mengukur satu tahap: waktu, jumlah baris, memori puncak, dan penghitung (cache hit, dll.).
+
+    Contoh:
+        with tahap("baca_penduduk", file=path) as span:
+            df = ...
+            span.baris = len(df)
+
+    Memori puncak per tahap diukur dengan tracemalloc jika sedang aktif
+    (lihat inisialisasi); RSS maksimum proses selalu dicatat.
+    """
+    span = Span(nama, atribut)
+    induk = _span_aktif()
+    induk.append(span)
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    mulai = time.perf_counter()
+    status = "ok"
+    try:
+        yield span
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        detik = time.perf_counter() - mulai
+        induk.pop()
+        puncak = None
+        if tracemalloc.is_tracing():
+            # reset_peak() pada tahap anak ikut mereset puncak induk, jadi puncak anak diteruskan
+            puncak = max(tracemalloc.get_traced_memory()[1], span.puncak_anak)
+            if induk:
+                induk[-1].puncak_anak = max(induk[-1].puncak_anak, puncak)
+        data = {
+            "tahap": nama,
+            "induk": induk[-1].nama if induk else None,
+            "status": status,
+            "waktu": time.time(),
+            "detik": round(detik, 6),
+            "baris": span.baris,
+            "memori_puncak": puncak,
+            "rss_maks_kb": _rss_maks_kb(),
+            **span.penghitung,
+            **span.atribut,
+        }
+        _tulis(data)
+        log(f"[{nama}] {detik*1000:,.1f} ms" + (f", {span.baris:,} baris" if span.baris is not None else ""),
+            level=DETAIL)
+
+
+def diukur(nama):
+    """Dekorator tahap; jumlah baris diambil dari panjang nilai kembalian jika ada"""
+    def dekorator(fungsi):
+        @functools.wraps(fungsi)
+        def pembungkus(*args, **kwargs):
+            with tahap(nama) as span:
+                hasil = fungsi(*args, **kwargs)
+                if hasattr(hasil, "__len__") and not isinstance(hasil, (str, tuple, dict)):
+                    span.baris = len(hasil)
+                return hasil
+        return pembungkus
+    return dekorator
@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from akumulator_regresi import AkumulatorRegresi
+from instrumentasi import inisialisasi, log, tahap
+
+# Baris per blok saat streaming (≈8 MB per kolom float64)
+UKURAN_BLOK = 1 << 20
+
+# Kolom hasil cleansing -> (nama berkas kolom, dtype)
+KOLOM_BAWAAN = {
+    "Tahun": ("tahun", np.int64),
+    "Jumlah Penduduk (X)": ("x", np.float64),
+    "Jumlah Angkatan Kerja (Y)": ("y", np.float64),
+}
+
+BERKAS_META = "meta.json"
+
+
+def _potongan(sumber, kolom, ukuran_potongan):
+    if isinstance(sumber, pd.DataFrame):
+        return (sumber.iloc[i:i + ukuran_potongan] for i in range(0, len(sumber), ukuran_potongan))
+    if isinstance(sumber, (str, os.PathLike)):
+        return pd.read_csv(sumber, usecols=list(kolom), chunksize=ukuran_potongan)
+    return sumber
+
+
+def tulis_kolom(sumber, direktori, kolom=KOLOM_BAWAAN, ukuran_potongan=UKURAN_BLOK):
+    """Mengonversi data hasil cleansing sekali menjadi berkas kolom biner (satu berkas per kolom).
+
+    sumber dapat berupa DataFrame, path CSV (dibaca per potongan), atau iterable DataFrame,
+    sehingga konversinya sendiri juga tidak perlu memuat seluruh data ke memori.
+    """
+    os.makedirs(direktori, exist_ok=True)
+    berkas = {nama: open(os.path.join(direktori, f"{nama}.bin"), "wb") for nama, _ in kolom.values()}
+    n = 0
+    try:
+        for df in _potongan(sumber, kolom, ukuran_potongan):
+            # Baris dengan nilai kosong dibuang seperti dropna pada alur cleansing
+            df = df[list(kolom)].dropna()
+            for kolom_sumber, (nama, dtype) in kolom.items():
+                df[kolom_sumber].to_numpy(dtype=dtype).tofile(berkas[nama])
+            n += len(df)
+    finally:
+        for f in berkas.values():
+            f.close()
+
+    meta = {"n": n, "kolom": {nama: np.dtype(dtype).str for nama, dtype in kolom.values()}}
+    with open(os.path.join(direktori, BERKAS_META), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return DataKolom(direktori)
+
+
+class DataKolom:
+    """Kumpulan kolom biner di disk yang dibaca lewat memory map per blok"""
+
+    def __init__(self, direktori):
+        self.direktori = direktori
+        with open(os.path.join(direktori, BERKAS_META), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.n = meta["n"]
+        self.dtype = {nama: np.dtype(kode) for nama, kode in meta["kolom"].items()}
+
+    def __len__(self):
+        return self.n
+
+    def kolom(self, nama, mulai=0, akhir=None):
+        """Memory map (read-only) untuk baris [mulai, akhir) dari satu kolom"""
+        akhir = self.n if akhir is None else min(akhir, self.n)
+        dtype = self.dtype[nama]
+        if akhir <= mulai:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.direktori, f"{nama}.bin"), dtype=dtype, mode="r",
+                         offset=mulai * dtype.itemsize, shape=(akhir - mulai,))
+
+    def blok(self, *nama, ukuran_blok=UKURAN_BLOK):
+        """Iterasi tuple kolom per blok.
+
+        Setiap blok dipetakan sendiri dan dilepas setelah dipakai, sehingga halaman berkas
+        yang sudah dibaca tidak menumpuk di RSS dan memori puncak tetap sebesar satu blok.
+        """
+        for mulai in range(0, self.n, ukuran_blok):
+            yield tuple(self.kolom(k, mulai, mulai + ukuran_blok) for k in nama)
+
+    def tambah_kolom(self, nama, potongan):
+        """Menulis kolom baru dari iterable array per blok (misalnya residual)"""
+        path = os.path.join(self.direktori, f"{nama}.bin")
+        dtype = None
+        with open(path, "wb") as f:
+            for array in potongan:
+                array = np.asarray(array)
+                if dtype is None:
+                    dtype = array.dtype
+                array.astype(dtype, copy=False).tofile(f)
+        dtype = np.dtype(np.float64) if dtype is None else dtype
+        if os.path.getsize(path) != self.n * dtype.itemsize:
+            raise ValueError(f"Panjang kolom '{nama}' tidak sama dengan {self.n} baris")
+        self.dtype[nama] = dtype
+        meta = {"n": self.n, "kolom": {k: d.str for k, d in self.dtype.items()}}
+        with open(os.path.join(self.direktori, BERKAS_META), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+
+def regresi_memmap(data, kolom_x="x", kolom_y="y", ukuran_blok=UKURAN_BLOK):
+    """Regresi Y = a + bX (beserta r dan r²) dengan satu lintasan streaming per blok"""
+    with tahap("regresi_memmap", ukuran_blok=ukuran_blok) as span:
+        akumulator = AkumulatorRegresi()
+        for x, y in data.blok(kolom_x, kolom_y, ukuran_blok=ukuran_blok):
+            akumulator.update(x, y)
+        span.baris = akumulator.n
+    return akumulator
+
+
+def residual_memmap(data, a, b, kolom_x="x", kolom_y="y", ukuran_blok=UKURAN_BLOK, simpan=False):
+    """Statistik error Y - (a + bX) secara streaming; simpan=True juga menulis kolom 'residual'"""
+    total = {"sse": 0.0, "sae": 0.0, "sape": 0.0, "maks_abs": 0.0}
+
+    def residual_per_blok():
+        for x, y in data.blok(kolom_x, kolom_y, ukuran_blok=ukuran_blok):
+            selisih = y - (a + b * x)
+            mutlak = np.abs(selisih)
+            total["sse"] += float(selisih @ selisih)
+            total["sae"] += float(mutlak.sum())
+            total["sape"] += float((mutlak / np.abs(y)).sum())
+            if mutlak.size:
+                total["maks_abs"] = max(total["maks_abs"], float(mutlak.max()))
+            yield selisih
+
+    with tahap("residual_memmap", ukuran_blok=ukuran_blok) as span:
+        if simpan:
+            data.tambah_kolom("residual", residual_per_blok())
+        else:
+            for _ in residual_per_blok():
+                pass
+        span.baris = data.n
+
+    n = max(data.n, 1)
+    return {
+        "n": data.n,
+        "sse": total["sse"],
+        "rmse": (total["sse"] / n) ** 0.5,
+        "mae": total["sae"] / n,
+        "mape": total["sape"] / n * 100,
+        "maks_abs": total["maks_abs"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regresi out-of-core dari kolom memory-mapped")
+    parser.add_argument("--sumber", help="CSV hasil cleansing untuk dikonversi (sekali) ke kolom biner")
+    parser.add_argument("--direktori", default="data_kolom", help="folder berkas kolom")
+    parser.add_argument("--ukuran-blok", type=lambda s: int(float(s)), default=UKURAN_BLOK)
+    parser.add_argument("--simpan-residual", action="store_true")
+    args = parser.parse_args()
+    inisialisasi()
+
+    if args.sumber:
+        data = tulis_kolom(args.sumber, args.direktori, ukuran_potongan=args.ukuran_blok)
+        log(f"{data.n:,} baris dikonversi ke '{args.direktori}'")
+    else:
+        data = DataKolom(args.direktori)
+
+    akumulator = regresi_memmap(data, ukuran_blok=args.ukuran_blok)
+    error = residual_memmap(data, akumulator.a, akumulator.b, ukuran_blok=args.ukuran_blok,
+                            simpan=args.simpan_residual)
+    log(f"Persamaan regresi: Y = {akumulator.a:,.2f} + {akumulator.b:.6f}X")
+    log(f"Koefisien korelasi (r): {akumulator.r:.4f}")
+    log(f"Koefisien determinasi (r²): {akumulator.r_squared:.4f}")
+    log(f"RMSE: {error['rmse']:,.2f}  MAE: {error['mae']:,.2f}  MAPE: {error['mape']:.2f}%")
@@ -0,0 +1,266 @@
+import argparse
+import io
+
+import numpy as np
+
+from instrumentasi import inisialisasi, log, tahap, DIAM
+
+# Margin halaman dalam point (1/72 inci)
+MARGIN = 50
+
+# Judul kolom tabel data dan prediksi
+KOLOM_DATA = ["Tahun", "Penduduk", "Aktual", "Prediksi", "Error %", "Leverage", "Cook's D"]
+
+# Ukuran huruf tabel dan batas bawahnya saat tabel lebar dikecilkan agar muat satu halaman
+UKURAN_TABEL = 9
+UKURAN_TABEL_MIN = 5
+
+
+def _sel(nilai):
+    """Teks sel tabel dari nilai DataFrame: bilangan bulat dengan pemisah ribuan, NaN sebagai '-'"""
+    if isinstance(nilai, (float, np.floating)):
+        if np.isnan(nilai):
+            return "-"
+        return f"{nilai:,.0f}" if float(nilai).is_integer() else f"{nilai:,.4f}"
+    if isinstance(nilai, (int, np.integer)) and not isinstance(nilai, bool):
+        return str(nilai) if 1000 <= abs(nilai) < 10000 else f"{nilai:,}"
+    return str(nilai)
+
+
+def pembaca_gambar(gambar):
+    """ImageReader dari bytes PNG/JPEG, path, atau ImageReader yang sudah ada (tidak dibuat ulang)"""
+    from reportlab.lib.utils import ImageReader
+
+    if isinstance(gambar, ImageReader):
+        return gambar
+    return ImageReader(io.BytesIO(gambar) if isinstance(gambar, (bytes, bytearray)) else gambar)
+
+
+def _flowable_gambar(pembaca, lebar_maks, tinggi_maks):
+    """Flowable yang menggambar ImageReader apa adanya (tanpa membaca ulang sumber gambar)"""
+    from reportlab.platypus import Flowable
+
+    lebar_asli, tinggi_asli = pembaca.getSize()
+    skala = min(lebar_maks / lebar_asli, tinggi_maks / tinggi_asli)
+
+    class Gambar(Flowable):
+        def __init__(self):
+            super().__init__()
+            self.width, self.height = lebar_asli * skala, tinggi_asli * skala
+            self.hAlign = "CENTER"
+
+        def draw(self):
+            self.canv.drawImage(pembaca, 0, 0, self.width, self.height)
+
+    return Gambar()
+
+
+class LaporanPDF:
+    """Laporan regresi berhalaman banyak dengan reportlab platypus.
+
+    Satu bagian per wilayah (judul, grafik, ringkasan, tabel); tabel dipecah otomatis
+    per halaman dengan baris judul kolom yang diulang. Logo dibaca sekali sebagai satu
+    ImageReader dan digambar di setiap halaman (reportlab menyimpannya sekali di berkas).
+    Dokumen ditulis saat tutup().
+    """
+
+    def __init__(self, path, logo=None):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import SimpleDocTemplate
+
+        self.lebar, self.tinggi = A4
+        self.doc = SimpleDocTemplate(path, pagesize=A4, leftMargin=MARGIN, rightMargin=MARGIN,
+                                     topMargin=MARGIN, bottomMargin=MARGIN)
+        self.logo = None if logo is None else pembaca_gambar(logo)
+        self.gaya = getSampleStyleSheet()
+        self.cerita = []
+        self.jumlah_halaman = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.tutup()
+
+    @property
+    def lebar_isi(self):
+        return self.lebar - 2 * MARGIN
+
+    def _hiasi_halaman(self, canvas, doc):
+        """Logo dan nomor halaman, digambar reportlab pada setiap halaman"""
+        canvas.saveState()
+        if self.logo is not None:
+            lebar_logo, tinggi_logo = self.logo.getSize()
+            tinggi = 30
+            lebar = tinggi * lebar_logo / tinggi_logo
+            canvas.drawImage(self.logo, self.lebar - MARGIN - lebar, self.tinggi - 40, lebar, tinggi, mask="auto")
+        canvas.setFont("Helvetica", 8)
+        canvas.drawCentredString(self.lebar / 2, 25, f"Halaman {doc.page}")
+        canvas.restoreState()
+        self.jumlah_halaman = doc.page
+
+    def paragraf(self, teks, gaya="Normal", **atribut):
+        from reportlab.lib.styles import ParagraphStyle
+        from reportlab.platypus import Paragraph
+        from xml.sax.saxutils import escape
+
+        gaya = ParagraphStyle(f"{gaya}_{len(self.cerita)}", parent=self.gaya[gaya], **atribut) if atribut \
+            else self.gaya[gaya]
+        self.cerita.append(Paragraph(escape(str(teks)), gaya))
+
+    def tabel(self, judul, kolom, baris, ukuran=UKURAN_TABEL):
+        """Tabel (kolom = list judul, baris = iterable tuple teks) yang berlanjut ke halaman berikutnya.
+
+        Lebar kolom mengikuti teks terpanjang; tabel yang terlalu lebar dikecilkan hurufnya.
+        """
+        from reportlab.lib import colors
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        from reportlab.platypus import Spacer, Table, TableStyle
+
+        baris = [list(isi) for isi in baris]
+        lebar = [max([stringWidth(str(nama), "Helvetica-Bold", 1)]
+                     + [stringWidth(isi[i], "Helvetica", 1) for isi in baris])
+                 for i, nama in enumerate(kolom)]
+        jarak = 8
+        ukuran = max(UKURAN_TABEL_MIN, min(ukuran, (self.lebar_isi - jarak * len(kolom)) / sum(lebar)))
+
+        self.paragraf(judul, "Heading4")
+        tabel = Table([list(kolom)] + baris, colWidths=[w * ukuran + jarak for w in lebar], repeatRows=1,
+                      hAlign="LEFT")
+        tabel.setStyle(TableStyle([
+            ("FONT", (0, 0), (-1, 0), "Helvetica-Bold", ukuran),
+            ("FONT", (0, 1), (-1, -1), "Helvetica", ukuran),
+            ("LINEBELOW", (0, 0), (-1, 0), 0.5, colors.black),
+            ("LEFTPADDING", (0, 0), (-1, -1), 0),
+            ("RIGHTPADDING", (0, 0), (-1, -1), jarak),
+            ("TOPPADDING", (0, 0), (-1, -1), 1),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+        ]))
+        self.cerita.append(tabel)
+        self.cerita.append(Spacer(1, 10))
+
+    def tabel_dataframe(self, judul, df, ukuran=UKURAN_TABEL):
+        """Tabel dari DataFrame dengan format sel _sel"""
+        baris = [tuple(_sel(nilai) for nilai in isi) for isi in df.itertuples(index=False)]
+        self.tabel(judul, [str(nama) for nama in df.columns], baris, ukuran)
+
+    def tambah_wilayah(self, hasil, grafik=None, judul=None):
+        """Bagian satu hasil regresi: judul, grafik, ringkasan, info tambahan, dan tabel data.
+
+        grafik dapat berupa bytes PNG/JPEG atau ImageReader; sumbernya dibaca sekali.
+        """
+        from reportlab.lib.enums import TA_CENTER
+        from reportlab.platypus import PageBreak, Spacer
+
+        if self.cerita:
+            self.cerita.append(PageBreak())
+        self.paragraf("ANALISIS REGRESI LINEAR", "Title", fontSize=16, spaceAfter=4)
+        self.paragraf(judul or f"Penduduk vs Angkatan Kerja Kota {hasil.kota}", "Title", fontSize=16,
+                      alignment=TA_CENTER)
+
+        if grafik is not None:
+            self.cerita.append(_flowable_gambar(pembaca_gambar(grafik), self.lebar_isi, 300))
+            self.cerita.append(Spacer(1, 20))
+
+        for teks in (f"Persamaan Regresi: {hasil.persamaan}",
+                     f"Koefisien Korelasi (r): {hasil.r:.4f}",
+                     f"Koefisien Determinasi (r²): {hasil.r_squared:.4f}",
+                     f"Akurasi Model: {hasil.r_squared*100:.2f}%"):
+            self.paragraf(teks, fontSize=12, leading=20)
+        for parameter, nilai in hasil.info_tambahan:
+            self.paragraf(f"{parameter}: {nilai}", fontSize=10, leading=15)
+        self.cerita.append(Spacer(1, 20))
+
+        def baris_data():
+            data = zip(hasil.tahun, hasil.X, hasil.Y, hasil.y_pred,
+                       hasil.diagnostik["leverage"], hasil.diagnostik["cook"])
+            for t, x, actual, pred, leverage, cook in data:
+                error_pct = abs(actual - pred) / actual * 100
+                yield (str(t), f"{x:,.0f}", f"{actual:,.0f}", f"{pred:,.0f}", f"{error_pct:.2f}%",
+                       f"{leverage:.4f}", f"{cook:.4f}")
+
+        self.tabel("Data dan Prediksi:", KOLOM_DATA, baris_data())
+        for nama, df in getattr(hasil, "tabel_tambahan", {}).items():
+            self.tabel_dataframe(f"{nama}:", df)
+
+    def tutup(self):
+        if self.cerita:
+            self.doc.build(self.cerita, onFirstPage=self._hiasi_halaman, onLaterPages=self._hiasi_halaman)
+            self.cerita = []
+
+
+def hasil_per_wilayah(wilayah, tahun, X, Y):
+    """HasilRegresi setiap wilayah dari matriks wilayah × tahun (dibuat satu per satu saat diiterasi)"""
+    from regresi_linier_update import HasilRegresi
+
+    tahun = np.asarray(tahun)
+    for nama, x, y in zip(wilayah, np.asarray(X, dtype=np.float64), np.asarray(Y, dtype=np.float64)):
+        valid = ~(np.isnan(x) | np.isnan(y))
+        if valid.sum() >= 2:
+            yield HasilRegresi(tahun[valid], x[valid], y[valid], kota=str(nama))
+
+
+def buat_laporan_pdf(path, daftar_hasil, grafik=None, logo=None, format_judul="Penduduk vs Angkatan Kerja {kota}"):
+    """Menulis laporan PDF untuk banyak hasil regresi dalam satu berkas.
+
+    grafik: fungsi hasil -> bytes PNG; bawaan memakai KanvasGrafik yang dibuat sekali dan
+    dipakai ulang. PNG setiap wilayah di-encode sekali oleh matplotlib dan diteruskan ke
+    reportlab apa adanya. Logo (path/bytes) dibaca sekali dan dirujuk setiap halaman.
+    Mengembalikan jumlah halaman.
+    """
+    from grafik_wilayah import KanvasGrafik, _siapkan_matplotlib
+
+    kanvas, tahun_kanvas = None, None
+    with tahap("laporan_pdf") as span:
+        laporan = LaporanPDF(path, logo)
+        try:
+            jumlah = 0
+            for hasil in daftar_hasil:
+                if grafik is not None:
+                    gambar = grafik(hasil)
+                else:
+                    # Kanvas dibuat ulang hanya jika deret tahunnya berbeda
+                    if kanvas is None or not np.array_equal(tahun_kanvas, hasil.tahun):
+                        if kanvas is not None:
+                            kanvas.tutup()
+                        _siapkan_matplotlib("png")
+                        kanvas, tahun_kanvas = KanvasGrafik(hasil.tahun), hasil.tahun
+                    gambar = kanvas.png([(hasil.kota, hasil.Y, hasil.y_pred, hasil.a, hasil.b, hasil.r_squared)])
+                laporan.tambah_wilayah(hasil, gambar, format_judul.format(kota=hasil.kota))
+                jumlah += 1
+        finally:
+            if kanvas is not None:
+                kanvas.tutup()
+        laporan.tutup()
+        span.baris = jumlah
+    return laporan.jumlah_halaman
+
+
+if __name__ == "__main__":
+    from pembacaan_sheet import baca_penduduk_dan_bps
+    from regresi_batch import matriks_wilayah_tahun, sejajarkan_wilayah
+
+    parser = argparse.ArgumentParser(description="Laporan PDF regresi per wilayah (berhalaman banyak)")
+    parser.add_argument("--output", default="Laporan_Regresi_Wilayah.pdf")
+    parser.add_argument("--logo", help="gambar logo yang ditampilkan di setiap halaman")
+    args = parser.parse_args()
+    inisialisasi()
+
+    log("MEMULAI LAPORAN PDF PER WILAYAH...")
+    log("="*50)
+
+    df_x, df_y = baca_penduduk_dan_bps()
+
+    if df_x is None or df_y is None:
+        log("ERROR: Gagal membaca data per wilayah!", level=DIAM)
+    else:
+        df_x, wilayah = sejajarkan_wilayah(df_x, df_y)
+        tahun = np.union1d(df_x['Tahun'].unique(), df_y['Tahun'].unique())
+        wilayah, tahun, X = matriks_wilayah_tahun(df_x, 'Jumlah Penduduk', wilayah, tahun)
+        _, _, Y = matriks_wilayah_tahun(df_y, 'Jumlah Angkatan Kerja', wilayah, tahun)
+        jumlah_halaman = buat_laporan_pdf(args.output, hasil_per_wilayah(wilayah, tahun, X, Y), logo=args.logo)
+        log(f"File '{args.output}' berhasil disimpan ({jumlah_halaman} halaman)")
+
+    log("\nPROSES SELESAI!")
@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from instrumentasi import inisialisasi, log
+from model_regresi import muat_model, DIREKTORI_MODEL
+
+
+class ModelTidakDitemukan(KeyError):
+    """Nama model tidak ada di registri (dijawab 404, berbeda dari body yang tidak valid)"""
+
+    def __str__(self):
+        # KeyError bawaan mengutip pesannya (repr); pesan ini ditampilkan apa adanya ke klien
+        return str(self.args[0]) if self.args else ""
+
+
+def cari_artefak(direktori):
+    """Semua berkas *.json di bawah direktori (rekursif, urutan tetap), mis. hasil_batch/<kota>/model/*.json"""
+    for akar, subdirektori, daftar_berkas in os.walk(direktori):
+        subdirektori.sort()
+        for nama_berkas in sorted(daftar_berkas):
+            if nama_berkas.endswith(".json"):
+                yield os.path.join(akar, nama_berkas)
+
+
+class RegistriModel:
+    """Cache model di memori proses; setiap artefak dimuat sekali dan dimuat ulang hanya
+    jika berkasnya berubah saat registri di-refresh.
+
+    `direktori` boleh satu folder atau daftar folder; setiap folder dipindai rekursif.
+    Jika dua berkas memuat nama model yang sama, berkas yang ditemukan lebih dulu dipakai
+    dan berkas lainnya dilaporkan sebagai peringatan.
+    """
+
+    def __init__(self, direktori=DIREKTORI_MODEL):
+        self.direktori = [direktori] if isinstance(direktori, str) else list(direktori)
+        self.model = {}
+        self._berkas = {}  # path -> (mtime, model)
+        self._kunci = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        """Memuat artefak baru/berubah dan membuang model yang berkasnya sudah dihapus"""
+        with self._kunci:
+            ditemukan = [path for direktori in self.direktori for path in cari_artefak(direktori)]
+            for path in ditemukan:
+                waktu = os.path.getmtime(path)
+                if path in self._berkas and self._berkas[path][0] == waktu:
+                    continue
+                try:
+                    self._berkas[path] = (waktu, muat_model(path))
+                except (OSError, ValueError, KeyError) as e:
+                    log(f"PERINGATAN: Gagal memuat model {path}: {str(e)}")
+                    self._berkas.pop(path, None)
+
+            for path in set(self._berkas) - set(ditemukan):
+                del self._berkas[path]
+
+            model, pemilik = {}, {}
+            for path in ditemukan:
+                if path not in self._berkas:
+                    continue
+                m = self._berkas[path][1]
+                if m.nama in model:
+                    log(f"PERINGATAN: Model '{m.nama}' di {path} diabaikan; "
+                        f"nama yang sama sudah dimuat dari {pemilik[m.nama]}")
+                    continue
+                model[m.nama] = m
+                pemilik[m.nama] = path
+            self.model = model
+
+    def prediksi(self, nama, x):
+        model = self.model.get(nama)
+        if model is None:
+            raise ModelTidakDitemukan(f"Model '{nama}' tidak ditemukan")
+        y = model.prediksi(x)
+        return y.tolist() if isinstance(y, np.ndarray) else float(y)
+
+
+def jawab_permintaan(registri, data):
+    """Memproses satu body JSON prediksi.
+
+    Bentuk yang diterima:
+      {"model": "tangerang", "x": 1900000}                 -> {"y": ...}
+      {"model": "tangerang", "x": [1900000, 2000000]}      -> {"y": [...]}
+      {"permintaan": [{"model": ..., "x": ...}, ...]}      -> {"hasil": [{"y": ...}, ...]}
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Body harus berupa objek JSON")
+    if "permintaan" in data:
+        if not isinstance(data["permintaan"], list):
+            raise ValueError("'permintaan' harus berupa daftar")
+        hasil = []
+        for item in data["permintaan"]:
+            try:
+                hasil.append({"y": registri.prediksi(*_model_dan_x(item))})
+            except (KeyError, ValueError, TypeError) as e:
+                hasil.append({"error": str(e)})
+        return {"hasil": hasil}
+    return {"y": registri.prediksi(*_model_dan_x(data))}
+
+
+def _model_dan_x(item):
+    """Mengambil pasangan (model, x) dari satu permintaan; body yang tidak lengkap -> ValueError"""
+    if not isinstance(item, dict) or "model" not in item or "x" not in item:
+        raise ValueError("Permintaan harus berisi 'model' dan 'x'")
+    return item["model"], item["x"]
+
+
+class PenanganPrediksi(BaseHTTPRequestHandler):
+    """Handler HTTP/1.1 keep-alive sehingga klien dapat memakai satu koneksi untuk banyak permintaan"""
+
+    protocol_version = "HTTP/1.1"
+    # Header dan body dikirim terpisah; tanpa TCP_NODELAY setiap respons tertahan ~40 ms (Nagle)
+    disable_nagle_algorithm = True
+    registri = None
+
+    def _kirim(self, status, isi):
+        body = json.dumps(isi, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/model":
+            self._kirim(200, {nama: {"koefisien": m.koefisien.tolist(), "meta": m.meta}
+                              for nama, m in self.registri.model.items()})
+        elif self.path == "/sehat":
+            self._kirim(200, {"status": "ok", "jumlah_model": len(self.registri.model)})
+        else:
+            self._kirim(404, {"error": "tidak ditemukan"})
+
+    def do_POST(self):
+        panjang = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(panjang)
+        if self.path == "/muat-ulang":
+            self.registri.refresh()
+            self._kirim(200, {"jumlah_model": len(self.registri.model)})
+            return
+        if self.path != "/prediksi":
+            self._kirim(404, {"error": "tidak ditemukan"})
+            return
+        try:
+            self._kirim(200, jawab_permintaan(self.registri, json.loads(body)))
+        except ModelTidakDitemukan as e:
+            self._kirim(404, {"error": str(e)})
+        except (KeyError, ValueError, TypeError) as e:
+            self._kirim(400, {"error": str(e)})
+
+    def log_message(self, format, *args):
+        # Log per permintaan dimatikan agar tidak menambah latensi
+        pass
+
+
+def buat_server(host="127.0.0.1", port=8000, direktori=DIREKTORI_MODEL):
+    """Membuat server prediksi dengan registri model yang dimuat sekali di awal"""
+    handler = type("Penangan", (PenanganPrediksi,), {"registri": RegistriModel(direktori)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Layanan prediksi Y = a + bX dari artefak model")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--direktori", nargs="+", default=[DIREKTORI_MODEL],
+                        help="folder artefak model (*.json, dipindai rekursif), mis. model hasil_batch")
+    args = parser.parse_args()
+
+    inisialisasi()
+    server = buat_server(args.host, args.port, args.direktori)
+    log(f"Layanan prediksi berjalan di http://{args.host}:{args.port} "
+        f"({len(server.RequestHandlerClass.registri.model)} model)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
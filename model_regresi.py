@@ -0,0 +1,97 @@
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+# Versi format artefak model; naikkan jika struktur berkas berubah
+FORMAT_MODEL = "regresi-linier"
+VERSI_MODEL = 1
+
+# Folder artefak model bawaan (satu berkas JSON per kota)
+DIREKTORI_MODEL = "model"
+
+
+def nama_berkas_aman(nama):
+    """Nama berkas/direktori yang aman untuk sistem berkas dari nama kota"""
+    return re.sub(r"[^\w-]+", "_", str(nama)).strip("_") or "kota"
+
+
+def nama_model(kota):
+    """Nama model baku sebuah kota, dipakai untuk nama model sekaligus nama berkasnya"""
+    return nama_berkas_aman(kota).lower()
+
+
+def path_model(kota, direktori=DIREKTORI_MODEL):
+    """Path artefak model sebuah kota, mis. model/tangerang.json untuk 'Tangerang'"""
+    return os.path.join(direktori, f"{nama_model(kota)}.json")
+
+
+class ModelRegresi:
+    """Model regresi tersimpan: koefisien [a, b1, ..., bk] beserta metadata"""
+
+    __slots__ = ("nama", "koefisien", "meta")
+
+    def __init__(self, nama, koefisien, meta=None):
+        self.nama = nama
+        self.koefisien = np.asarray(koefisien, dtype=np.float64)
+        self.meta = dict(meta or {})
+
+    @classmethod
+    def dari_hasil(cls, hasil, nama=None):
+        """Membuat model dari HasilRegresi (regresi sederhana)"""
+        meta = {
+            "n": int(hasil.n),
+            "r": float(hasil.r),
+            "r_squared": float(hasil.r_squared),
+            "tahun": [int(min(hasil.tahun)), int(max(hasil.tahun))],
+            "kota": hasil.kota,
+        }
+        return cls(nama or nama_model(hasil.kota), [hasil.a, hasil.b], meta)
+
+    @property
+    def k(self):
+        return self.koefisien.size - 1
+
+    def prediksi(self, X):
+        """Y = a + bX untuk satu nilai atau banyak nilai sekaligus (vektor)"""
+        X = np.asarray(X, dtype=np.float64)
+        if self.k == 1:
+            return self.koefisien[0] + self.koefisien[1] * X
+        return self.koefisien[0] + np.atleast_2d(X) @ self.koefisien[1:]
+
+    def ke_dict(self):
+        return {
+            "format": FORMAT_MODEL,
+            "versi": VERSI_MODEL,
+            "nama": self.nama,
+            "koefisien": self.koefisien.tolist(),
+            "meta": self.meta,
+            "dibuat": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+    def __repr__(self):
+        return f"ModelRegresi(nama={self.nama!r}, koefisien={self.koefisien.tolist()})"
+
+
+def simpan_model(model, path):
+    """Menyimpan model sebagai artefak JSON ringkas"""
+    direktori = os.path.dirname(path)
+    if direktori:
+        os.makedirs(direktori, exist_ok=True)
+    sementara = f"{path}.tmp"
+    with open(sementara, "w", encoding="utf-8") as f:
+        json.dump(model.ke_dict(), f, separators=(",", ":"))
+    os.replace(sementara, path)
+
+
+def muat_model(path):
+    """Memuat artefak model dan memeriksa format serta versinya"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format") != FORMAT_MODEL:
+        raise ValueError(f"'{path}' bukan artefak model regresi")
+    if data.get("versi", 0) > VERSI_MODEL:
+        raise ValueError(f"Versi model {data.get('versi')} di '{path}' belum didukung (maks {VERSI_MODEL})")
+    return ModelRegresi(data["nama"], data["koefisien"], data.get("meta"))
@@ -0,0 +1,276 @@
+import numpy as np
+import pandas as pd
+
+from regresi_batch import regresi_batch
+
+# Kapasitas awal sumbu wilayah dan tahun; diperbesar dua kali lipat saat penuh
+KAPASITAS_AWAL = 16
+
+METODE_IMPUTASI = ("linier", "ffill")
+
+
+class PanelWilayahTahun:
+    """Penyimpanan kolumnar data panel wilayah × tahun.
+
+    Setiap variabel disimpan sebagai satu array float64 (wilayah × tahun) dengan NaN
+    untuk data kosong. Wilayah dipetakan ke baris lewat dict dan tahun ke kolom lewat
+    selisih dengan tahun_awal, sehingga pencarian satu sel O(1). Sumbu tahun selalu
+    berurutan tanpa lompatan, jadi tahun yang hilang tampak sebagai kolom NaN dan dapat
+    dideteksi/diimputasi secara vektor. Kapasitas kedua sumbu dicadangkan bertingkat
+    sehingga menambah tahun atau wilayah baru tidak membangun ulang panel.
+    """
+
+    def __init__(self, variabel, kapasitas=KAPASITAS_AWAL):
+        self.variabel = list(variabel)
+        self.tahun_awal = None
+        self.n_tahun = 0
+        self._wilayah = []
+        self._baris = {}
+        self._dtype = {}
+        self._data = {v: np.full((1, kapasitas), np.nan) for v in self.variabel}
+
+    def __repr__(self):
+        rentang = f"{self.tahun_awal}-{self.tahun_awal + self.n_tahun - 1}" if self.n_tahun else "-"
+        return f"PanelWilayahTahun({len(self._wilayah)} wilayah, tahun {rentang}, variabel={self.variabel})"
+
+    # === Sumbu wilayah dan tahun ===
+
+    @property
+    def wilayah(self):
+        return pd.Index(self._wilayah, name="Wilayah")
+
+    @property
+    def tahun(self):
+        if not self.n_tahun:
+            return np.empty(0, dtype=np.int64)
+        return np.arange(self.tahun_awal, self.tahun_awal + self.n_tahun)
+
+    def _perbesar(self, baris, kolom, geser=0):
+        """Memastikan kapasitas minimal baris × kolom; geser > 0 menyisipkan kolom di depan (tahun lebih awal)"""
+        kapasitas_baris, kapasitas_kolom = next(iter(self._data.values())).shape
+        if baris <= kapasitas_baris and kolom <= kapasitas_kolom and not geser:
+            return
+        # Tumbuh dua kali lipat (amortisasi O(1) per tahun/wilayah baru), atau langsung
+        # sebesar kebutuhan jika lompatannya lebih besar dari itu (misalnya isi awal)
+        baru_baris = max(baris, 2 * kapasitas_baris) if baris > kapasitas_baris else kapasitas_baris
+        baru_kolom = max(kolom, 2 * kapasitas_kolom) if kolom > kapasitas_kolom else kapasitas_kolom
+        for v, data in self._data.items():
+            baru = np.full((baru_baris, baru_kolom), np.nan)
+            baru[:len(self._wilayah), geser:geser + self.n_tahun] = data[:len(self._wilayah), :self.n_tahun]
+            self._data[v] = baru
+        if geser:
+            self.tahun_awal -= geser
+            self.n_tahun += geser
+
+    def _indeks_baris(self, wilayah, buat=False):
+        """Nomor baris untuk satu atau banyak wilayah; buat=True menambah wilayah baru"""
+        if np.ndim(wilayah) == 0:
+            indeks = self._baris.get(wilayah)
+            if indeks is None:
+                if not buat:
+                    raise KeyError(f"Wilayah '{wilayah}' tidak ada di panel")
+                indeks = self._tambah_wilayah(wilayah)
+            return indeks
+
+        # Kamus hanya dicari sekali per nama unik
+        kode, unik = pd.factorize(np.asarray(wilayah, dtype=object))
+        baris_unik = np.empty(len(unik), dtype=np.intp)
+        for i, nama in enumerate(unik):
+            indeks = self._baris.get(nama)
+            if indeks is None:
+                if not buat:
+                    raise KeyError(f"Wilayah '{nama}' tidak ada di panel")
+                indeks = self._tambah_wilayah(nama)
+            baris_unik[i] = indeks
+        return baris_unik[kode]
+
+    def _tambah_wilayah(self, nama):
+        self._perbesar(len(self._wilayah) + 1, self.n_tahun)
+        indeks = self._baris[nama] = len(self._wilayah)
+        self._wilayah.append(nama)
+        return indeks
+
+    def _indeks_kolom(self, tahun, buat=False):
+        """Nomor kolom untuk satu atau banyak tahun; buat=True memperluas rentang tahun"""
+        tahun = np.asarray(tahun, dtype=np.int64)
+        if tahun.size == 0:
+            return tahun
+        if self.tahun_awal is None:
+            if not buat:
+                raise KeyError("Panel belum berisi tahun")
+            self.tahun_awal = int(tahun.min())
+        kolom = tahun - self.tahun_awal
+        if buat:
+            terkecil = int(kolom.min())
+            if terkecil < 0:
+                self._perbesar(len(self._wilayah), self.n_tahun - terkecil, geser=-terkecil)
+                kolom = tahun - self.tahun_awal
+            terbesar = int(kolom.max()) + 1
+            self._perbesar(len(self._wilayah), terbesar)
+            self.n_tahun = max(self.n_tahun, terbesar)
+        elif kolom.min() < 0 or kolom.max() >= self.n_tahun:
+            raise KeyError(f"Tahun di luar rentang panel {self.tahun_awal}-{self.tahun_awal + self.n_tahun - 1}")
+        return kolom
+
+    def perluas_tahun(self, tahun_awal, tahun_akhir):
+        """Memastikan rentang tahun mencakup [tahun_awal, tahun_akhir] (tahun baru berisi NaN)"""
+        self._indeks_kolom([tahun_awal, tahun_akhir], buat=True)
+
+    # === Isi dan baca ===
+
+    def isi(self, variabel, wilayah, tahun, nilai):
+        """Mengisi sel (wilayah, tahun) satu variabel; wilayah/tahun/nilai dapat berupa skalar atau array.
+
+        Wilayah dan tahun baru ditambahkan otomatis. Jika satu sel muncul lebih dari sekali,
+        nilai terakhir yang dipakai.
+        """
+        nilai = np.asarray(nilai)
+        if variabel not in self._dtype and nilai.size:
+            self._dtype[variabel] = np.int64 if np.issubdtype(nilai.dtype, np.integer) else np.float64
+        elif nilai.size and not np.issubdtype(nilai.dtype, np.integer):
+            self._dtype[variabel] = np.float64
+        kolom = self._indeks_kolom(tahun, buat=True)
+        baris = self._indeks_baris(wilayah, buat=True)
+        self._data[variabel][baris, kolom] = nilai
+
+    def tambah_tahun(self, tahun, nilai):
+        """Menambah satu tahun baru: nilai = {variabel: Series/dict wilayah -> nilai}"""
+        self.perluas_tahun(tahun, tahun)
+        for variabel, per_wilayah in nilai.items():
+            per_wilayah = pd.Series(per_wilayah)
+            self.isi(variabel, per_wilayah.index, tahun, per_wilayah.to_numpy())
+
+    def nilai(self, variabel, wilayah, tahun):
+        """Nilai satu sel (NaN jika kosong), pencarian O(1)"""
+        return self._data[variabel][self._indeks_baris(wilayah), self._indeks_kolom(tahun)]
+
+    def matriks(self, variabel):
+        """View (tanpa salinan) matriks wilayah × tahun satu variabel"""
+        return self._data[variabel][:len(self._wilayah), :self.n_tahun]
+
+    # === Celah dan imputasi ===
+
+    def celah(self, variabel=None):
+        """Mask sel kosong (wilayah × tahun); dengan beberapa variabel, sel kosong jika salah satunya kosong"""
+        variabel = self.variabel if variabel is None else [variabel] if isinstance(variabel, str) else variabel
+        mask = np.zeros((len(self._wilayah), self.n_tahun), dtype=bool)
+        for v in variabel:
+            mask |= np.isnan(self.matriks(v))
+        return mask
+
+    def tahun_hilang(self, wilayah, tahun_diharapkan=None, variabel=None):
+        """Tahun (dari tahun_diharapkan, bawaan seluruh rentang) yang datanya tidak lengkap untuk satu wilayah"""
+        tahun = self.tahun if tahun_diharapkan is None else np.asarray(tahun_diharapkan, dtype=np.int64)
+        if tahun.size == 0:
+            return tahun
+        if self.tahun_awal is None or wilayah not in self._baris:
+            return np.unique(tahun)
+        kolom = tahun - self.tahun_awal
+        di_rentang = (kolom >= 0) & (kolom < self.n_tahun)
+        hilang = ~di_rentang
+        hilang[di_rentang] = self.celah(variabel)[self._baris[wilayah], kolom[di_rentang]]
+        return np.unique(tahun[hilang])
+
+    def imputasi(self, variabel=None, metode="linier"):
+        """Mengisi celah di antara dua tahun berdata secara vektor untuk semua wilayah.
+
+        metode "linier" menginterpolasi antara tahun berdata terdekat sebelum dan sesudahnya;
+        "ffill" memakai nilai tahun berdata sebelumnya. Celah di awal (dan untuk "linier" juga
+        di akhir) deret tidak diisi. Mengembalikan mask sel yang diisi.
+        """
+        if metode not in METODE_IMPUTASI:
+            raise ValueError(f"Metode imputasi '{metode}' tidak dikenal (pilihan: {METODE_IMPUTASI})")
+        variabel = self.variabel if variabel is None else [variabel] if isinstance(variabel, str) else variabel
+        diisi = np.zeros((len(self._wilayah), self.n_tahun), dtype=bool)
+        kolom = np.arange(self.n_tahun)
+        for v in variabel:
+            data = self.matriks(v)
+            valid = ~np.isnan(data)
+            # Kolom berdata terdekat di kiri dan kanan setiap sel (-1 / n_tahun jika tidak ada)
+            kiri = np.maximum.accumulate(np.where(valid, kolom, -1), axis=1)
+            kanan = np.minimum.accumulate(np.where(valid, kolom, self.n_tahun)[:, ::-1], axis=1)[:, ::-1]
+            baris = np.arange(data.shape[0])[:, None]
+            nilai_kiri = data[baris, np.maximum(kiri, 0)]
+            if metode == "ffill":
+                isi = ~valid & (kiri >= 0)
+                nilai = nilai_kiri
+            else:
+                isi = ~valid & (kiri >= 0) & (kanan < self.n_tahun)
+                nilai_kanan = data[baris, np.minimum(kanan, self.n_tahun - 1)]
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    bobot = (kolom - kiri) / (kanan - kiri)
+                    nilai = nilai_kiri + bobot * (nilai_kanan - nilai_kiri)
+            data[isi] = nilai[isi]
+            if self._dtype.get(v) == np.int64 and isi.any():
+                data[isi] = np.round(data[isi])
+            diisi |= isi
+        return diisi
+
+    # === Keluaran untuk tahap regresi ===
+
+    def pasangan(self, wilayah, variabel_x, variabel_y):
+        """(tahun, X, Y) satu wilayah untuk tahun yang kedua variabelnya terisi, dengan dtype asal"""
+        baris = self._indeks_baris(wilayah)
+        x = self.matriks(variabel_x)[baris]
+        y = self.matriks(variabel_y)[baris]
+        lengkap = ~(np.isnan(x) | np.isnan(y))
+        return (self.tahun[lengkap], x[lengkap].astype(self._dtype.get(variabel_x, np.float64)),
+                y[lengkap].astype(self._dtype.get(variabel_y, np.float64)))
+
+    def ke_dataframe(self, wilayah, kolom):
+        """Tabel tahun berdata lengkap satu wilayah; kolom = {variabel: nama kolom keluaran}"""
+        baris = self._indeks_baris(wilayah)
+        lengkap = ~self.celah(list(kolom))[baris]
+        # Tanpa celah cukup slice (tanpa indeks boolean)
+        pilih = slice(None) if lengkap.all() else lengkap
+        data = {"Tahun": self.tahun[pilih]}
+        for variabel, nama in kolom.items():
+            data[nama] = self.matriks(variabel)[baris, pilih].astype(self._dtype.get(variabel, np.float64))
+        return pd.DataFrame(data)
+
+    def regresi(self, variabel_x, variabel_y):
+        """Regresi Y = a + bX setiap wilayah langsung dari matriks panel (tanpa pivot/merge)"""
+        hasil = regresi_batch(self.matriks(variabel_x), self.matriks(variabel_y))
+        return pd.DataFrame({
+            "Wilayah": self.wilayah,
+            "n": hasil["n"],
+            "Intercept (a)": hasil["a"],
+            "Slope (b)": hasil["b"],
+            "Koefisien Korelasi (r)": hasil["r"],
+            "Koefisien Determinasi (r²)": hasil["r_squared"],
+        })
+
+    # === Konstruksi dan penyimpanan ===
+
+    @classmethod
+    def dari_tidy(cls, df, kolom_wilayah="Wilayah", kolom_tahun="Tahun", kolom_variabel="Variabel",
+                  kolom_nilai="Nilai"):
+        """Panel dari tabel rapi (misalnya hasil ingest_datasheet)"""
+        variabel = pd.unique(df[kolom_variabel])
+        panel = cls(variabel)
+        for v, grup in df.groupby(kolom_variabel, sort=False):
+            panel.isi(v, grup[kolom_wilayah].to_numpy(), grup[kolom_tahun].to_numpy(), grup[kolom_nilai].to_numpy())
+        return panel
+
+    def simpan(self, path):
+        """Menyimpan panel ke satu berkas .npz"""
+        np.savez(path, wilayah=np.asarray(self._wilayah, dtype=object), variabel=np.asarray(self.variabel),
+                 tahun_awal=np.int64(self.tahun_awal if self.tahun_awal is not None else 0),
+                 n_tahun=np.int64(self.n_tahun),
+                 dtype=np.asarray([np.dtype(self._dtype.get(v, np.float64)).str for v in self.variabel]),
+                 **{f"data_{i}": self.matriks(v) for i, v in enumerate(self.variabel)})
+
+    @classmethod
+    def muat(cls, path):
+        with np.load(path, allow_pickle=True) as berkas:
+            variabel = berkas["variabel"].tolist()
+            wilayah = berkas["wilayah"].tolist()
+            panel = cls(variabel)
+            panel._wilayah = wilayah
+            panel._baris = {nama: i for i, nama in enumerate(wilayah)}
+            panel.n_tahun = int(berkas["n_tahun"])
+            panel.tahun_awal = int(berkas["tahun_awal"]) if panel.n_tahun else None
+            for i, (v, kode) in enumerate(zip(variabel, berkas["dtype"])):
+                panel._dtype[v] = np.dtype(kode).type
+                panel._data[v] = np.array(berkas[f"data_{i}"], dtype=np.float64).reshape(len(wilayah), panel.n_tahun)
+        return panel
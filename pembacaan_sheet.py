@@ -0,0 +1,158 @@
+import glob
+import re
+
+import pandas as pd
+import numpy as np
+
+from cache_excel import baca_excel
+
+# Awalan jenis wilayah pada sheet BPS -> bentuk baku; nama tanpa awalan diberi AWALAN_BAWAAN
+AWALAN_WILAYAH = {"kota": "kota", "kab": "kab", "kabupaten": "kab"}
+AWALAN_BAWAAN = "Kota"
+
+# Pola file penduduk per kota (satu file per kota, baris per kecamatan); {kota} diganti nama kota
+POLA_PENDUDUK_KOTA = "/datasheet/Data Penduduk - Kota {kota}.xls"
+
+
+def cari_kolom_penduduk(df):
+    """Mencari kolom jumlah penduduk pada sheet data penduduk"""
+    for col in df.columns:
+        if 'penduduk' in col.lower() or 'jumlah' in col.lower():
+            return col
+
+    # Ambil kolom numerik pertama (setelah kolom pertama yang biasanya nama kecamatan)
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    if numeric_cols:
+        return numeric_cols[0]
+    return None
+
+
+def cari_kolom_angkatan_kerja(df):
+    """Mencari kolom angkatan kerja pada sheet BPS (kolom 'Jumlah' atau kolom numerik terakhir)"""
+    for col in df.columns:
+        if 'jumlah' in col.lower():
+            return col
+
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    if numeric_cols:
+        return numeric_cols[-1]
+    return None
+
+
+def normalisasi_wilayah(nama):
+    """Nama wilayah baku untuk pencocokan persis: huruf kecil, tanpa tanda baca, spasi tunggal,
+    dan "Kabupaten" disingkat "Kab" (sehingga "Kab. Tangerang" sama dengan "KABUPATEN TANGERANG")"""
+    kata = re.sub(r"[^\w]+", " ", str(nama).lower()).split()
+    if kata and kata[0] in AWALAN_WILAYAH:
+        kata[0] = AWALAN_WILAYAH[kata[0]]
+    return " ".join(kata)
+
+
+def nama_wilayah_baku(kota, awalan=AWALAN_BAWAAN):
+    """Nama baku wilayah yang dicari; kota tanpa awalan jenis wilayah dianggap '<awalan> <kota>'"""
+    baku = normalisasi_wilayah(kota)
+    if baku.split(" ", 1)[0] in AWALAN_WILAYAH.values():
+        return baku
+    return normalisasi_wilayah(f"{awalan} {kota}")
+
+
+def cari_baris_wilayah(df, kota, kolom=None, awalan=AWALAN_BAWAAN):
+    """Label satu baris yang nama wilayahnya (bawaan: kolom pertama) persis sama dengan kota
+    setelah normalisasi; None jika tidak ada, ValueError jika lebih dari satu baris cocok"""
+    kolom = df.columns[0] if kolom is None else kolom
+    target = nama_wilayah_baku(kota, awalan)
+    nama = df[kolom].map(lambda v: normalisasi_wilayah(v) if pd.notna(v) else "")
+    cocok = df.index[(nama == target).to_numpy()]
+    if len(cocok) > 1:
+        raise ValueError(f"{len(cocok)} baris cocok dengan wilayah '{target}': "
+                         f"{', '.join(map(str, df.loc[cocok, kolom]))}")
+    return cocok[0] if len(cocok) else None
+
+
+def ekstrak_per_wilayah(df, tahun, kolom_nilai, nama_nilai):
+    """Mengambil nilai setiap wilayah (kolom pertama) dari satu sheet dalam format panjang"""
+    kolom_wilayah = df.columns[0]
+    wilayah = df[kolom_wilayah].astype("string").str.strip()
+    nilai = pd.to_numeric(df[kolom_nilai], errors='coerce')
+
+    # Buang baris tanpa nama wilayah, tanpa nilai, dan baris total
+    valid = wilayah.notna() & nilai.notna() & ~wilayah.str.lower().isin(["jumlah", "total"])
+    return pd.DataFrame({
+        'Wilayah': wilayah[valid].to_numpy(dtype=object),
+        'Tahun': int(tahun),
+        nama_nilai: nilai[valid].to_numpy(),
+    })
+
+
+def ekstrak_penduduk_per_kecamatan(df, tahun):
+    """Jumlah penduduk setiap kecamatan dari satu sheet data penduduk"""
+    df.columns = df.columns.astype(str).str.strip()
+    penduduk_col = cari_kolom_penduduk(df)
+    if penduduk_col is None:
+        return None
+    return ekstrak_per_wilayah(df, tahun, penduduk_col, 'Jumlah Penduduk')
+
+
+def ekstrak_bps_per_wilayah(df, tahun):
+    """Jumlah angkatan kerja setiap kabupaten/kota dari satu sheet BPS"""
+    df.columns = df.columns.astype(str).str.strip()
+    angkatan_kerja_col = cari_kolom_angkatan_kerja(df)
+    if angkatan_kerja_col is None:
+        return None
+    return ekstrak_per_wilayah(df, tahun, angkatan_kerja_col, 'Jumlah Angkatan Kerja')
+
+
+def baca_per_wilayah(file_path, sheets_list, ekstraktor):
+    """Membaca beberapa sheet tahunan dan menggabungkan hasil ekstraksi per wilayah"""
+    excel_data = baca_excel(file_path, sheets_list)
+    hasil = [ekstraktor(df, year) for year, df in excel_data.items()]
+    hasil = [df for df in hasil if df is not None]
+    if not hasil:
+        return None
+    return pd.concat(hasil, ignore_index=True)
+
+
+def baca_penduduk_dan_bps(sheets_list=None, pola_penduduk=POLA_PENDUDUK_KOTA, file_bps=None):
+    """Tabel penduduk per kota dan angkatan kerja BPS (format panjang) untuk CLI per wilayah.
+
+    Penduduk per kecamatan dijumlahkan per kota agar setingkat dengan baris kabupaten/kota
+    BPS. Sheet dan file BPS bawaan sama dengan data_cleansing_update. Mengembalikan
+    (df_penduduk, df_bps); tabel yang tidak ada atau gagal dibaca bernilai None.
+    """
+    # Diimpor saat dipanggil karena data_cleansing_update sendiri mengimpor modul ini
+    from data_cleansing_update import FILE_BPS, sheets_to_read
+
+    sheets_list = sheets_to_read if sheets_list is None else sheets_list
+    df_penduduk = baca_penduduk_per_kota(sheets_list, pola_penduduk)
+    try:
+        df_bps = baca_per_wilayah(file_bps or FILE_BPS, sheets_list, ekstrak_bps_per_wilayah)
+    except (OSError, ValueError):
+        df_bps = None
+    return df_penduduk, df_bps
+
+
+def total_per_kota(df, kota, kolom_nilai='Jumlah Penduduk', awalan=AWALAN_BAWAAN):
+    """Menjumlahkan nilai semua kecamatan per tahun menjadi satu baris wilayah kota,
+    setingkat dengan data BPS (kota tanpa awalan jenis wilayah diberi awalan)"""
+    nama = kota if normalisasi_wilayah(kota) == nama_wilayah_baku(kota, awalan) else f"{awalan} {kota}"
+    total = df.groupby('Tahun', as_index=False)[kolom_nilai].sum()
+    total.insert(0, 'Wilayah', nama)
+    return total
+
+
+def baca_penduduk_per_kota(sheets_list, pola_penduduk=POLA_PENDUDUK_KOTA):
+    """Jumlah penduduk setiap kota (total kecamatan per tahun) dari semua file yang cocok dengan pola.
+
+    Nama kota diambil dari bagian {kota} nama file. Mengembalikan tabel format panjang
+    (Wilayah, Tahun, Jumlah Penduduk) atau None jika tidak ada file yang terbaca.
+    """
+    awal, akhir = pola_penduduk.split("{kota}", 1)
+    hasil = []
+    for path in sorted(glob.glob(pola_penduduk.replace("{kota}", "*"))):
+        kota = path[len(awal):len(path) - len(akhir)]
+        df = baca_per_wilayah(path, sheets_list, ekstrak_penduduk_per_kecamatan)
+        if df is not None:
+            hasil.append(total_per_kota(df, kota))
+    if not hasil:
+        return None
+    return pd.concat(hasil, ignore_index=True)
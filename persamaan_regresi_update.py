@@ -1,54 +1,43 @@
 import pandas as pd
 
-# Baca file Excel dari Data Cleansing.xlsx sheet summary
-file_path = "Data Cleansing.xlsx"
-df = pd.read_excel(file_path, sheet_name="Summary")
+from akumulator_regresi import AkumulatorRegresi
+from ekspor_xlsx import simpan_xlsx
+from instrumentasi import inisialisasi, log, tampilkan, tahap, DIAM
 
-# Tampilkan struktur data untuk memastikan kolom yang tersedia
-print("Kolom yang tersedia:")
-print(df.columns.tolist())
-print("\nBeberapa baris pertama:")
-print(df.head())
+# Lokasi file masukan dan hasil
+INPUT_PATH = "Data Cleansing.xlsx"
+OUTPUT_PATH = "Tabel_Persamaan_Regresi_dari_Data_Cleansing.xlsx"
 
-# Asumsi kolom yang dibutuhkan (sesuaikan dengan struktur data yang sebenarnya)
+# Format angka Excel: pemisah ribuan dengan locale Indonesia (titik)
+FORMAT_RIBUAN = "[$-421]#,##0"
+FORMAT_KOEFISIEN = "[$-421]#,##0.00####"
+
+# Kemungkinan nama kolom (sesuaikan dengan struktur data yang sebenarnya)
 # Biasanya dalam data cleansing ada kolom seperti: Tahun, Jumlah_Penduduk, Angkatan_Kerja
-# Sesuaikan nama kolom dengan yang ada di file Data Cleansing.xlsx
+possible_year_cols = ['Tahun', 'Year', 'tahun', 'TAHUN']
+possible_population_cols = ['Jumlah Penduduk (X)', 'Jumlah Penduduk', 'Jumlah_Penduduk', 'Population', 'Penduduk', 'JUMLAH_PENDUDUK']
+possible_workforce_cols = ['Jumlah Angkatan Kerja (Y)', 'Angkatan Kerja', 'Angkatan_Kerja', 'Workforce', 'ANGKATAN_KERJA']
 
-try:
-    # Coba beberapa kemungkinan nama kolom
-    possible_year_cols = ['Tahun', 'Year', 'tahun', 'TAHUN']
-    possible_population_cols = ['Jumlah Penduduk (X)', 'Jumlah Penduduk', 'Jumlah_Penduduk', 'Population', 'Penduduk', 'JUMLAH_PENDUDUK']
-    possible_workforce_cols = ['Jumlah Angkatan Kerja (Y)', 'Angkatan Kerja', 'Angkatan_Kerja', 'Workforce', 'ANGKATAN_KERJA']
-    
-    year_col = None
-    population_col = None
-    workforce_col = None
-    
-    # Cari kolom tahun
-    for col in possible_year_cols:
-        if col in df.columns:
-            year_col = col
-            break
-    
-    # Cari kolom jumlah penduduk
-    for col in possible_population_cols:
-        if col in df.columns:
-            population_col = col
-            break
-    
-    # Cari kolom angkatan kerja
-    for col in possible_workforce_cols:
+
+def cari_kolom(df, kandidat):
+    """Mengembalikan nama kolom pertama dari daftar kandidat yang ada di DataFrame"""
+    for col in kandidat:
         if col in df.columns:
-            workforce_col = col
-            break
+            return col
+    return None
+
+
+def siapkan_data(df):
+    """Mengambil kolom Tahun, Jumlah Penduduk, dan Angkatan Kerja yang numerik dan lengkap"""
+    year_col = cari_kolom(df, possible_year_cols)
+    population_col = cari_kolom(df, possible_population_cols)
+    workforce_col = cari_kolom(df, possible_workforce_cols)
     
     if not all([year_col, population_col, workforce_col]):
-        print("Error: Tidak dapat menemukan kolom yang diperlukan.")
-        print(f"Kolom tahun ditemukan: {year_col}")
-        print(f"Kolom penduduk ditemukan: {population_col}")
-        print(f"Kolom angkatan kerja ditemukan: {workforce_col}")
-        print("\nSilakan sesuaikan nama kolom dalam script dengan nama kolom yang sebenarnya.")
-        exit()
+        raise ValueError(
+            "Tidak dapat menemukan kolom yang diperlukan "
+            f"(tahun: {year_col}, penduduk: {population_col}, angkatan kerja: {workforce_col})"
+        )
     
     # Ambil data yang diperlukan dan bersihkan
     df_clean = df[[year_col, population_col, workforce_col]].dropna()
@@ -63,76 +52,104 @@ try:
     # Pastikan data numerik
     df_clean['Jumlah Penduduk'] = pd.to_numeric(df_clean['Jumlah Penduduk'], errors='coerce')
     df_clean['Angkatan Kerja'] = pd.to_numeric(df_clean['Angkatan Kerja'], errors='coerce')
-    df_clean = df_clean.dropna()
-    
-    print(f"\nData yang akan digunakan untuk regresi:")
-    print(df_clean)
-    
-    # Hitung x^2, y^2, xy untuk persamaan regresi
-    df_clean["x"] = df_clean["Jumlah Penduduk"]
-    df_clean["y"] = df_clean["Angkatan Kerja"]
-    df_clean["x²"] = df_clean["x"] ** 2
-    df_clean["y²"] = df_clean["y"] ** 2
-    df_clean["xy"] = df_clean["x"] * df_clean["y"]
+    return df_clean.dropna()
+
+
+def tabel_persamaan(df_clean):
+    """Tabel x, y, x², y², xy beserta baris jumlah (nilai numerik, belum diformat)"""
+    df_tabel = pd.DataFrame({
+        "Tahun": df_clean["Tahun"],
+        "x": df_clean["Jumlah Penduduk"],
+        "y": df_clean["Angkatan Kerja"],
+    })
+    df_tabel["x²"] = df_tabel["x"] ** 2
+    df_tabel["y²"] = df_tabel["y"] ** 2
+    df_tabel["xy"] = df_tabel["x"] * df_tabel["y"]
     
     # Tambahkan baris jumlah
     sum_row = pd.DataFrame({
         "Tahun": ["Jumlah"],
-        "x": [df_clean["x"].sum()],
-        "y": [df_clean["y"].sum()],
-        "x²": [df_clean["x²"].sum()],
-        "y²": [df_clean["y²"].sum()],
-        "xy": [df_clean["xy"].sum()]
+        "x": [df_tabel["x"].sum()],
+        "y": [df_tabel["y"].sum()],
+        "x²": [df_tabel["x²"].sum()],
+        "y²": [df_tabel["y²"].sum()],
+        "xy": [df_tabel["xy"].sum()]
     })
     
-    df_final = pd.concat([df_clean[["Tahun", "x", "y", "x²", "y²", "xy"]], sum_row], ignore_index=True)
-    
-    # Format ribuan (gunakan titik sebagai pemisah ribuan)
-    def format_ribuan(val):
-        if isinstance(val, (int, float)) and val == val:  # val == val untuk check NaN
-            return f"{int(val):,}".replace(",", ".")
-        return val
-    
-    df_final = df_final.applymap(format_ribuan)
-    
-    # Hitung koefisien regresi
-    n = len(df_clean)
-    sum_x = df_clean["x"].sum()
-    sum_y = df_clean["y"].sum()
-    sum_x2 = df_clean["x²"].sum()
-    sum_xy = df_clean["xy"].sum()
-    
-    # Rumus: a = (Σy)(Σx²) - (Σx)(Σxy) / n(Σx²) - (Σx)²
-    # Rumus: b = n(Σxy) - (Σx)(Σy) / n(Σx²) - (Σx)²
-    denominator = n * sum_x2 - sum_x**2
-    a = (sum_y * sum_x2 - sum_x * sum_xy) / denominator
-    b = (n * sum_xy - sum_x * sum_y) / denominator
-    
-    print(f"\nPersamaan Regresi: y = {a:.2f} + {b:.6f}x")
-    print(f"Dimana:")
-    print(f"y = Angkatan Kerja")
-    print(f"x = Jumlah Penduduk")
-    
-    # Simpan ke Excel
-    output_path = "Tabel_Persamaan_Regresi_dari_Data_Cleansing.xlsx"
-    
-    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-        df_final.to_excel(writer, index=False, sheet_name="Persamaan Regresi")
+    return pd.concat([df_tabel, sum_row], ignore_index=True)
+
+
+def hitung_persamaan(df_clean):
+    """Menghitung koefisien regresi dan mengembalikan (a, b)"""
+    # Akumulator co-moment (stabil secara numerik), setara dengan rumus
+    # a = ((Σy)(Σx²) - (Σx)(Σxy)) / (n(Σx²) - (Σx)²)
+    # b = (n(Σxy) - (Σx)(Σy)) / (n(Σx²) - (Σx)²)
+    akumulator = AkumulatorRegresi.dari_data(df_clean["Jumlah Penduduk"], df_clean["Angkatan Kerja"])
+    return akumulator.a, akumulator.b
+
+
+def simpan_tabel_persamaan(df_final, a, b, output_path=OUTPUT_PATH):
+    """Ekspor opsional tabel perhitungan dan persamaan final ke Excel.
+
+    Nilai ditulis sebagai sel angka asli dengan format ribuan Indonesia, dan kedua sheet
+    ditulis dalam satu kali lintasan lewat ekspor_xlsx.
+    """
+    result_df = pd.DataFrame({
+        'Keterangan': ['Konstanta (a)', 'Koefisien (b)', 'Persamaan Regresi'],
+        'Nilai': [float(a), float(b), f"y = {a:.2f} + {b:.6f}x"]
+    })
+    format_angka = {kolom: FORMAT_RIBUAN for kolom in df_final.columns if kolom != "Tahun"}
+    simpan_xlsx(output_path, [
+        ("Persamaan Regresi", df_final, format_angka),
+        ("Hasil Regresi", result_df, {"Nilai": FORMAT_KOEFISIEN}),
+    ])
+
+
+def main(df=None, output_path=OUTPUT_PATH):
+    """Menjalankan perhitungan persamaan; df dapat diberikan langsung tanpa membaca Excel"""
+    try:
+        with tahap("persamaan") as span:
+            if df is None:
+                # Baca file Excel dari Data Cleansing.xlsx sheet summary
+                df = pd.read_excel(INPUT_PATH, sheet_name="Summary")
+            
+            # Tampilkan struktur data untuk memastikan kolom yang tersedia
+            tampilkan(df.columns.tolist(), "Kolom yang tersedia:")
+            tampilkan(df.head(), "\nBeberapa baris pertama:")
+            
+            df_clean = siapkan_data(df)
+            span.baris = len(df_clean)
+            
+            tampilkan(df_clean, "\nData yang akan digunakan untuk regresi:")
+            
+            df_final = tabel_persamaan(df_clean)
+            a, b = hitung_persamaan(df_clean)
+            
+            log(f"\nPersamaan Regresi: y = {a:.2f} + {b:.6f}x")
+            log(f"Dimana:")
+            log(f"y = Angkatan Kerja")
+            log(f"x = Jumlah Penduduk")
+            
+            # Simpan ke Excel
+            if output_path:
+                with tahap("simpan_persamaan"):
+                    simpan_tabel_persamaan(df_final, a, b, output_path)
+                
+                log(f"\nFile berhasil disimpan ke: {output_path}")
+                log("Sheet 'Persamaan Regresi' berisi tabel perhitungan")
+                log("Sheet 'Hasil Regresi' berisi persamaan final")
         
-        # Tambahkan sheet untuk hasil persamaan
-        result_df = pd.DataFrame({
-            'Keterangan': ['Konstanta (a)', 'Koefisien (b)', 'Persamaan Regresi'],
-            'Nilai': [f"{a:.2f}", f"{b:.6f}", f"y = {a:.2f} + {b:.6f}x"]
-        })
-        result_df.to_excel(writer, index=False, sheet_name="Hasil Regresi")
-    
-    print(f"\nFile berhasil disimpan ke: {output_path}")
-    print("Sheet 'Persamaan Regresi' berisi tabel perhitungan")
-    print("Sheet 'Hasil Regresi' berisi persamaan final")
-
-except Exception as e:
-    print(f"Error: {e}")
-    print("\nPastikan:")
-    print("1. File 'Data Cleansing.xlsx' ada di direktori yang sama")
-    print("2. Sheet 'summary' tersedia dalam file")
-    print("3. Kolom yang diperlukan tersedia (Tahun, Jumlah Penduduk, Angkatan Kerja)")
\ No newline at end of file
+        return df_final, a, b
+    
+    except Exception as e:
+        log(f"Error: {e}", level=DIAM)
+        log("\nPastikan:", level=DIAM)
+        log("1. File 'Data Cleansing.xlsx' ada di direktori yang sama", level=DIAM)
+        log("2. Sheet 'summary' tersedia dalam file", level=DIAM)
+        log("3. Kolom yang diperlukan tersedia (Tahun, Jumlah Penduduk, Angkatan Kerja)", level=DIAM)
+        return None
+
+
+if __name__ == "__main__":
+    inisialisasi()
+    main()
@@ -0,0 +1,234 @@
+import argparse
+import ast
+import hashlib
+import importlib
+import json
+import os
+import zipfile
+
+from cache_excel import hash_berkas, sidik_sheet_xlsx
+from data_cleansing_update import FILE_PENDUDUK, FILE_BPS, sheets_to_read
+from ingest_datasheet import daftar_workbook, OUTPUT_PATH as PATH_PANEL
+from instrumentasi import inisialisasi, log
+from model_regresi import path_model
+
+# Berkas status yang mencatat hash masukan/keluaran setiap tahap pada run terakhir
+PATH_STATUS = ".pipeline_status.json"
+
+
+def hash_konten(file_path):
+    """Hash isi berkas; None jika berkas tidak ada.
+
+    Untuk .xlsx metadata docProps (waktu dibuat/diubah) diabaikan agar workbook yang
+    ditulis ulang dengan isi sama tetap dianggap tidak berubah.
+    """
+    if not os.path.exists(file_path):
+        return None
+    if file_path.lower().endswith(".xlsx") and zipfile.is_zipfile(file_path):
+        h = hashlib.sha256()
+        with zipfile.ZipFile(file_path) as arsip:
+            for info in sorted(arsip.infolist(), key=lambda i: i.filename):
+                if not info.filename.startswith("docProps/"):
+                    h.update(f"{info.filename}:{info.CRC}:{info.file_size};".encode("utf-8"))
+        return h.hexdigest()
+    return hash_berkas(file_path)
+
+
+def hash_sheet(file_path, sheets_list):
+    """Hash hanya sheet yang dibaca dari sebuah workbook, dari sidik sheet cache_excel.
+
+    Perubahan pada sheet lain tidak mengubah hash ini. Jika sidik per sheet tidak tersedia
+    (misalnya .xls lama, lihat sidik_sheet_xlsx) seluruh isi berkas yang di-hash.
+    """
+    sidik = sidik_sheet_xlsx(file_path) if os.path.exists(file_path) else {}
+    if not sidik or any(sheet not in sidik for sheet in sheets_list):
+        return hash_konten(file_path)
+    isi = json.dumps({sheet: sidik[sheet] for sheet in sheets_list}, sort_keys=True)
+    return hashlib.sha256(isi.encode("utf-8")).hexdigest()
+
+
+def modul_lokal(modul, direktori="."):
+    """Berkas .py modul beserta semua modul lokal yang diimpornya (rekursif, lewat AST).
+
+    Hanya modul yang berkasnya ada di direktori yang dihitung; import di dalam fungsi ikut
+    terdeteksi, pustaka luar (numpy, pandas, ...) diabaikan.
+    """
+    hasil, antrian = set(), [modul]
+    while antrian:
+        nama = antrian.pop()
+        berkas = f"{nama}.py"
+        path = os.path.join(direktori, berkas)
+        if berkas in hasil or not os.path.isfile(path):
+            continue
+        hasil.add(berkas)
+        with open(path, encoding="utf-8") as f:
+            pohon = ast.parse(f.read(), filename=path)
+        for simpul in ast.walk(pohon):
+            if isinstance(simpul, ast.Import):
+                antrian.extend(alias.name.split(".")[0] for alias in simpul.names)
+            elif isinstance(simpul, ast.ImportFrom) and simpul.level == 0 and simpul.module:
+                antrian.append(simpul.module.split(".")[0])
+    return sorted(hasil)
+
+
+class Tahap:
+    """Satu tahap pipeline: modul yang fungsi main()-nya dijalankan beserta berkas masukan dan keluarannya.
+
+    masukan hanya berisi berkas data; kode tahap (modul dan semua modul lokal yang
+    diimpornya) ditambahkan otomatis oleh masukan_lengkap. Jika sheet diberikan, tahap
+    hanya membaca sheet tersebut dari masukannya dan workbook masukan di-hash per sheet.
+    """
+
+    def __init__(self, nama, modul, masukan, keluaran, sheet=None):
+        self.nama = nama
+        self.modul = modul
+        self.masukan = list(masukan)
+        self.keluaran = list(keluaran)
+        self.sheet = list(sheet) if sheet else None
+
+    def masukan_lengkap(self, direktori="."):
+        return self.masukan + modul_lokal(self.modul, direktori)
+
+    def jalankan(self, direktori):
+        # Dijalankan di proses yang sama: tanpa biaya start interpreter dan import ulang
+        cwd = os.getcwd()
+        os.chdir(direktori)
+        try:
+            importlib.import_module(self.modul).main()
+        finally:
+            os.chdir(cwd)
+
+
+# Rantai cleansing -> persamaan/regresi, dan ingest semua workbook datasheet ke panel wilayah × tahun;
+# kode script (dan modul yang diimpornya) juga dihitung sebagai masukan
+TAHAP_BAWAAN = [
+    Tahap("ingest", "ingest_datasheet", daftar_workbook(), [PATH_PANEL]),
+    Tahap("cleansing", "data_cleansing_update", [FILE_PENDUDUK, FILE_BPS], ["Data Cleansing.xlsx"],
+          sheet=sheets_to_read),
+    Tahap("persamaan", "persamaan_regresi_update", ["Data Cleansing.xlsx"],
+          ["Tabel_Persamaan_Regresi_dari_Data_Cleansing.xlsx"]),
+    Tahap("regresi", "regresi_linier_update", ["Data Cleansing.xlsx"],
+          ["Regresi_Output_Data_dan_Grafik.xlsx", "Analisis_Regresi_Linier.pdf", "grafik_regresi.png",
+           path_model("Tangerang")]),
+]
+
+
+class Pipeline:
+    """Menjalankan tahap-tahap sebagai DAG dan hanya mengulang tahap yang basi.
+
+    Sebuah tahap basi jika belum pernah dijalankan, hash salah satu masukannya berbeda
+    dari run terakhir, atau salah satu keluarannya hilang/berubah. Tahap hilir hanya
+    ikut diulang jika isi keluaran tahap hulu benar-benar berubah.
+
+    Kebasian dicatat per tahap. Untuk workbook .xlsx yang hanya dibaca sebagian
+    (Tahap.sheet) hash masukan diambil dari sidik sheet yang dibaca saja, sehingga
+    perubahan sheet lain tidak membuat tahap basi; .xls lama tetap di-hash utuh.
+    """
+
+    def __init__(self, tahap=TAHAP_BAWAAN, direktori=".", path_status=PATH_STATUS):
+        self.tahap = {t.nama: t for t in tahap}
+        self.direktori = direktori
+        self.path_status = os.path.join(direktori, path_status)
+        self.urutan = self._urutan_topologis()
+
+    def _path(self, file_path):
+        return os.path.join(self.direktori, file_path)
+
+    def _urutan_topologis(self):
+        """Mengurutkan tahap sehingga pembuat sebuah berkas selalu jalan sebelum pemakainya"""
+        pembuat = {}
+        for t in self.tahap.values():
+            for berkas in t.keluaran:
+                pembuat[berkas] = t.nama
+
+        urutan, sedang, selesai = [], set(), set()
+
+        def kunjungi(nama):
+            if nama in selesai:
+                return
+            if nama in sedang:
+                raise ValueError(f"Siklus dependensi pada tahap '{nama}'")
+            sedang.add(nama)
+            for berkas in self.tahap[nama].masukan:
+                if berkas in pembuat and pembuat[berkas] != nama:
+                    kunjungi(pembuat[berkas])
+            sedang.discard(nama)
+            selesai.add(nama)
+            urutan.append(nama)
+
+        for nama in self.tahap:
+            kunjungi(nama)
+        return urutan
+
+    def _muat_status(self):
+        try:
+            with open(self.path_status, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _simpan_status(self, status):
+        with open(self.path_status, "w", encoding="utf-8") as f:
+            json.dump(status, f, indent=2)
+
+    def _hash(self, daftar_berkas):
+        return {berkas: hash_konten(self._path(berkas)) for berkas in daftar_berkas}
+
+    def _hash_masukan(self, t):
+        """Hash masukan data (per sheet jika Tahap.sheet diberikan) dan kode tahap"""
+        return {berkas: hash_sheet(self._path(berkas), t.sheet) if t.sheet and berkas in t.masukan
+                else hash_konten(self._path(berkas))
+                for berkas in t.masukan_lengkap(self.direktori)}
+
+    def basi(self, nama, status):
+        """Alasan tahap perlu dijalankan ulang, atau None jika masih mutakhir"""
+        t = self.tahap[nama]
+        catatan = status.get(nama)
+        if catatan is None:
+            return "belum pernah dijalankan"
+        masukan = self._hash_masukan(t)
+        dihapus = sorted(set(catatan["masukan"]) - set(masukan))
+        if dihapus:
+            return f"masukan dihapus: {dihapus[0]}"
+        for berkas, h in masukan.items():
+            if catatan["masukan"].get(berkas) != h:
+                return f"masukan berubah: {berkas}"
+        for berkas, h in self._hash(t.keluaran).items():
+            if h is None:
+                return f"keluaran hilang: {berkas}"
+            if catatan["keluaran"].get(berkas) != h:
+                return f"keluaran berubah: {berkas}"
+        return None
+
+    def jalankan(self, paksa=False, cek_saja=False):
+        """Menjalankan tahap yang basi sesuai urutan DAG; mengembalikan daftar tahap yang dijalankan"""
+        status = self._muat_status()
+        dijalankan = []
+        for nama in self.urutan:
+            alasan = "dipaksa" if paksa else self.basi(nama, status)
+            if alasan is None:
+                log(f"[{nama}] mutakhir, dilewati")
+                continue
+
+            log(f"[{nama}] dijalankan ({alasan})")
+            if cek_saja:
+                dijalankan.append(nama)
+                continue
+
+            t = self.tahap[nama]
+            t.jalankan(self.direktori)
+            status[nama] = {"masukan": self._hash_masukan(t),
+                            "keluaran": self._hash(t.keluaran)}
+            self._simpan_status(status)
+            dijalankan.append(nama)
+        return dijalankan
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Menjalankan pipeline regresi secara inkremental")
+    parser.add_argument("--paksa", action="store_true", help="jalankan ulang semua tahap")
+    parser.add_argument("--cek", action="store_true", help="hanya tampilkan tahap yang basi")
+    args = parser.parse_args()
+    inisialisasi()
+
+    Pipeline().jalankan(paksa=args.paksa, cek_saja=args.cek)
@@ -0,0 +1,225 @@
+import numpy as np
+import pandas as pd
+
+# Skenario pertumbuhan penduduk: (nama, model tren X, laju pertumbuhan per tahun untuk model "laju")
+SKENARIO_BAWAAN = (
+    ("Tren Linier", "linier", None),
+    ("Tren Eksponensial", "eksponensial", None),
+    ("Laju 1%/th", "laju", 0.01),
+    ("Laju 2,5%/th", "laju", 0.025),
+)
+
+MODEL_TREN = ("linier", "eksponensial", "laju")
+
+# Horizon bawaan: 1-30 tahun setelah tahun data terakhir
+HORIZON_BAWAAN = np.arange(1, 31)
+
+
+def kuantil_normal(p):
+    """Kuantil distribusi normal baku (aproksimasi rasional Acklam, galat relatif < 1.2e-9)"""
+    a = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+         1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+    b = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+         6.680131188771972e+01, -1.328068155288572e+01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+         -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00)
+
+    p = np.asarray(p, dtype=np.float64)
+    ekor = np.minimum(p, 1.0 - p)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Daerah ekor
+        q = np.sqrt(-2.0 * np.log(ekor))
+        x_ekor = ((((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5])
+                  / ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1.0))
+        x_ekor = np.where(p < 0.5, x_ekor, -x_ekor)
+        # Daerah tengah
+        q = p - 0.5
+        r = q * q
+        x_tengah = ((((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q
+                    / (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1.0))
+    return np.where(ekor < 0.02425, x_ekor, x_tengah)
+
+
+def kuantil_t(p, df):
+    """Kuantil atas distribusi t Student (p > 0.5) tanpa scipy.
+
+    Memakai algoritma Hill (1970, CACM 396) yang tepat untuk df 1 dan 2 dan
+    bergalat sekitar 1e-6 untuk df lainnya. p dan df dapat berupa array (di-broadcast).
+    """
+    p, df = np.broadcast_arrays(np.asarray(p, dtype=np.float64), np.asarray(df, dtype=np.float64))
+    dua_ekor = 2.0 * (1.0 - p)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        n = np.where(df >= 1, df, np.nan)
+        a = 1.0 / (n - 0.5)
+        b = 48.0 / (a * a)
+        c = ((20700.0 * a / b - 98.0) * a - 16.0) * a + 96.36
+        d = ((94.5 / (b + c) - 3.0) / b + 1.0) * np.sqrt(a * np.pi / 2.0) * n
+        x = d * dua_ekor
+        y = x ** (2.0 / n)
+
+        # Cabang aproksimasi asimtotik lewat kuantil normal
+        z = kuantil_normal(0.5 * dua_ekor)
+        z2 = z * z
+        c_besar = c + np.where(n < 5, 0.3 * (n - 4.5) * (z + 0.6), 0.0)
+        c_besar = (((0.05 * d * z - 5.0) * z - 7.0) * z - 2.0) * z + b + c_besar
+        y_besar = (((((0.4 * z2 + 6.3) * z2 + 36.0) * z2 + 94.5) / c_besar - z2 - 3.0) / b + 1.0) * z
+        y_besar = np.expm1(a * y_besar * y_besar)
+
+        # Cabang ekor jauh
+        y_kecil = ((1.0 / (((n + 6.0) / (n * y) - 0.089 * d - 0.822) * (n + 2.0) * 3.0)
+                    + 0.5 / (n + 4.0)) * y - 1.0) * (n + 1.0) / (n + 2.0) + 1.0 / y
+
+        t = np.sqrt(n * np.where(y > 0.05 + a, y_besar, y_kecil))
+        t = np.where(n == 2, np.sqrt(2.0 / (dua_ekor * (2.0 - dua_ekor)) - 2.0), t)
+        t = np.where(n == 1, 1.0 / np.tan(dua_ekor * np.pi / 2.0), t)
+    return t
+
+
+def _fit(T, V, valid):
+    """Regresi V = c + d·(T - T̄) per baris; mengembalikan statistik untuk interval prediksi"""
+    n = valid.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rata_t = np.where(valid, T, 0.0).sum(axis=1) / n
+        rata_v = np.where(valid, V, 0.0).sum(axis=1) / n
+        dt = np.where(valid, T - rata_t[:, None], 0.0)
+        dv = np.where(valid, V - rata_v[:, None], 0.0)
+        stt = np.einsum("ij,ij->i", dt, dt)
+        d = np.einsum("ij,ij->i", dt, dv) / stt
+        sisa = np.where(valid, dv - d[:, None] * dt, 0.0)
+        s2 = np.einsum("ij,ij->i", sisa, sisa) / (n - 2)
+    return {"n": n, "rata_t": rata_t, "c": rata_v, "d": d, "stt": stt, "s2": s2}
+
+
+def _varians_prediksi(fit, t0):
+    """Varians prediksi satu observasi baru pada t0 (bentuk (baris, ...))"""
+    bentuk = (-1,) + (1,) * (np.ndim(t0) - 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        jarak = t0 - fit["rata_t"].reshape(bentuk)
+        return fit["s2"].reshape(bentuk) * (1.0 + 1.0 / fit["n"].reshape(bentuk)
+                                            + jarak * jarak / fit["stt"].reshape(bentuk))
+
+
+def proyeksi(tahun, X, Y, horizon=HORIZON_BAWAAN, skenario=SKENARIO_BAWAAN, tingkat=0.95):
+    """Proyeksi Y = a + bX beberapa tahun ke depan untuk setiap skenario pertumbuhan X.
+
+    tahun berukuran (jumlah_tahun,), X dan Y berukuran (jumlah_tahun,) atau
+    (jumlah_wilayah, jumlah_tahun); NaN diabaikan. X diekstrapolasi dengan model tren
+    ("linier", "eksponensial" = laju konstan hasil fit log X, atau "laju" tetap dari
+    nilai X terakhir), lalu dimasukkan ke persamaan regresi. Interval prediksi Y
+    menggabungkan ketidakpastian regresi Y|X dan ketidakpastian tren X
+    (Var = s²(1 + 1/n + (x - x̄)²/Sxx) + b²·Var(X̂)), dengan kuantil t df = n - 2.
+
+    Semua horizon × skenario × wilayah dihitung sebagai operasi array (skenario, wilayah,
+    horizon). Mengembalikan dict: tahun, horizon, skenario, x, x_bawah, x_atas, y, y_bawah, y_atas.
+    """
+    tahun = np.asarray(tahun, dtype=np.float64)
+    X = np.asarray(X, dtype=np.float64)
+    Y = np.asarray(Y, dtype=np.float64)
+    if X.shape != Y.shape or X.shape[-1] != tahun.shape[0]:
+        raise ValueError(f"Ukuran tahun {tahun.shape}, X {X.shape}, dan Y {Y.shape} tidak cocok")
+    for nama, model, _ in skenario:
+        if model not in MODEL_TREN:
+            raise ValueError(f"Model tren '{model}' pada skenario '{nama}' tidak dikenal (pilihan: {MODEL_TREN})")
+    satu_dimensi = X.ndim == 1
+    X = np.atleast_2d(X)
+    Y = np.atleast_2d(Y)
+    horizon = np.asarray(horizon, dtype=np.float64)
+    T = np.broadcast_to(tahun, X.shape)
+
+    valid = ~(np.isnan(X) | np.isnan(Y))
+    valid_x = ~np.isnan(X)
+    tahun_akhir = tahun.max()
+    t0 = tahun_akhir + horizon  # (horizon,)
+
+    # Regresi Y|X per wilayah
+    fit_y = _fit(X, Y, valid)
+    a = fit_y["c"] - fit_y["d"] * fit_y["rata_t"]
+    b = fit_y["d"]
+
+    # Model tren X (dihitung sekali per model, dipakai semua skenario yang memakainya)
+    fit_linier = _fit(T, X, valid_x)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fit_log = _fit(T, np.log(np.where(X > 0, X, np.nan)), valid_x & (X > 0))
+    indeks_akhir = np.where(valid_x, np.arange(X.shape[1]), -1).max(axis=1)
+    ada = indeks_akhir >= 0
+    x_akhir = np.where(ada, X[np.arange(X.shape[0]), np.maximum(indeks_akhir, 0)], np.nan)
+    t_akhir = tahun[np.maximum(indeks_akhir, 0)]
+
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        pusat = {
+            "linier": fit_linier["c"][:, None] + fit_linier["d"][:, None] * (t0 - fit_linier["rata_t"][:, None]),
+            "eksponensial": fit_log["c"][:, None] + fit_log["d"][:, None] * (t0 - fit_log["rata_t"][:, None]),
+        }
+        varians = {"linier": _varians_prediksi(fit_linier, t0[None, :]),
+                   "eksponensial": _varians_prediksi(fit_log, t0[None, :])}
+
+        kuantil_x = {"linier": kuantil_t(0.5 + tingkat / 2, fit_linier["n"] - 2)[:, None],
+                     "eksponensial": kuantil_t(0.5 + tingkat / 2, fit_log["n"] - 2)[:, None]}
+
+        x, x_bawah, x_atas, var_x = [], [], [], []
+        for _, model, laju in skenario:
+            if model == "laju":
+                nilai = x_akhir[:, None] * (1.0 + laju) ** (t0[None, :] - t_akhir[:, None])
+                x.append(nilai)
+                x_bawah.append(nilai)
+                x_atas.append(nilai)
+                var_x.append(np.zeros_like(nilai))
+            elif model == "linier":
+                se = np.sqrt(varians["linier"])
+                x.append(pusat["linier"])
+                x_bawah.append(pusat["linier"] - kuantil_x["linier"] * se)
+                x_atas.append(pusat["linier"] + kuantil_x["linier"] * se)
+                var_x.append(varians["linier"])
+            else:
+                # Interval di ruang log; varians X lewat metode delta
+                nilai = np.exp(pusat["eksponensial"])
+                se = np.sqrt(varians["eksponensial"])
+                x.append(nilai)
+                x_bawah.append(np.exp(pusat["eksponensial"] - kuantil_x["eksponensial"] * se))
+                x_atas.append(np.exp(pusat["eksponensial"] + kuantil_x["eksponensial"] * se))
+                var_x.append(nilai * nilai * varians["eksponensial"])
+        x, x_bawah, x_atas, var_x = (np.stack(v) for v in (x, x_bawah, x_atas, var_x))  # (skenario, wilayah, horizon)
+
+        # Satu operasi broadcast untuk semua skenario × wilayah × horizon
+        y = a[None, :, None] + b[None, :, None] * x
+        var_y = _varians_prediksi(fit_y, x.transpose(1, 0, 2)).transpose(1, 0, 2) + b[None, :, None] ** 2 * var_x
+        lebar = kuantil_t(0.5 + tingkat / 2, fit_y["n"] - 2)[None, :, None] * np.sqrt(var_y)
+
+    hasil = {
+        "tahun": t0.astype(np.int64),
+        "horizon": horizon.astype(np.int64),
+        "skenario": [nama for nama, _, _ in skenario],
+        "tingkat": tingkat,
+        "x": x, "x_bawah": x_bawah, "x_atas": x_atas,
+        "y": y, "y_bawah": y - lebar, "y_atas": y + lebar,
+    }
+    if satu_dimensi:
+        hasil.update({kunci: hasil[kunci][:, 0] for kunci in ("x", "x_bawah", "x_atas", "y", "y_bawah", "y_atas")})
+    return hasil
+
+
+def tabel_proyeksi(hasil, wilayah=None):
+    """Tabel panjang hasil proyeksi: satu baris per (skenario, [wilayah,] horizon).
+
+    wilayah: daftar nama wilayah jika proyeksi dihitung untuk banyak wilayah.
+    """
+    y = hasil["y"]
+    jumlah_skenario, jumlah_horizon = y.shape[0], y.shape[-1]
+    jumlah_wilayah = 1 if y.ndim == 2 else y.shape[1]
+    ulang = jumlah_wilayah * jumlah_horizon
+    persen = f"{hasil['tingkat']*100:.0f}%"
+
+    tabel = {"Skenario": np.repeat(hasil["skenario"], ulang)}
+    if y.ndim == 3:
+        nama = np.arange(jumlah_wilayah) if wilayah is None else np.asarray(wilayah)
+        tabel["Wilayah"] = np.tile(np.repeat(nama, jumlah_horizon), jumlah_skenario)
+    tabel.update({
+        "Tahun": np.tile(hasil["tahun"], jumlah_skenario * jumlah_wilayah),
+        "Horizon": np.tile(hasil["horizon"], jumlah_skenario * jumlah_wilayah),
+        "Penduduk (X)": np.round(hasil["x"].ravel()),
+        "Angkatan Kerja (Y)": np.round(y.ravel()),
+        f"Batas Bawah {persen}": np.round(hasil["y_bawah"].ravel()),
+        f"Batas Atas {persen}": np.round(hasil["y_atas"].ravel()),
+    })
+    return pd.DataFrame(tabel)
@@ -0,0 +1,122 @@
+import pandas as pd
+import numpy as np
+
+from instrumentasi import inisialisasi, log, DIAM
+from pembacaan_sheet import normalisasi_wilayah
+
+
+def matriks_wilayah_tahun(df_long, kolom_nilai, wilayah=None, tahun=None, kolom_waktu='Tahun'):
+    """Menyusun data format panjang (Wilayah, Tahun, nilai) menjadi matriks wilayah × tahun.
+
+    Sel yang tidak ada datanya berisi NaN. Urutan wilayah dan tahun dapat dipaksa
+    agar dua matriks (X dan Y) sejajar. kolom_waktu dapat diganti untuk periode
+    bulanan/kuartalan.
+    """
+    matriks = df_long.pivot_table(index='Wilayah', columns=kolom_waktu, values=kolom_nilai, aggfunc='sum')
+    if wilayah is not None:
+        matriks = matriks.reindex(index=wilayah)
+    if tahun is not None:
+        matriks = matriks.reindex(columns=tahun)
+    return matriks.index, matriks.columns.to_numpy(), matriks.to_numpy(dtype=np.float64)
+
+
+def regresi_batch(X, Y):
+    """Regresi linier sederhana Y = a + bX untuk setiap baris matriks X dan Y sekaligus.
+
+    X dan Y berukuran (jumlah_grup, jumlah_observasi); NaN dianggap data hilang dan
+    diabaikan per grup. Semua grup dihitung dalam satu lintasan NumPy dengan rumus
+    co-moment terpusat. Mengembalikan dict berisi array n, a, b, r, dan r_squared.
+    """
+    X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    if X.shape != Y.shape:
+        raise ValueError(f"Ukuran X {X.shape} dan Y {Y.shape} tidak sama")
+
+    valid = ~(np.isnan(X) | np.isnan(Y))
+    n = valid.sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.where(valid, X, 0.0).sum(axis=1) / n
+        mean_y = np.where(valid, Y, 0.0).sum(axis=1) / n
+        dx = np.where(valid, X - mean_x[:, None], 0.0)
+        dy = np.where(valid, Y - mean_y[:, None], 0.0)
+
+        m2_x = np.einsum('ij,ij->i', dx, dx)
+        m2_y = np.einsum('ij,ij->i', dy, dy)
+        c_xy = np.einsum('ij,ij->i', dx, dy)
+
+        b = c_xy / m2_x
+        a = mean_y - b * mean_x
+        r = c_xy / np.sqrt(m2_x * m2_y)
+
+    # Grup dengan kurang dari dua observasi tidak dapat diregresikan
+    kurang = n < 2
+    b[kurang] = np.nan
+    a[kurang] = np.nan
+    r[kurang] = np.nan
+
+    return {"n": n, "a": a, "b": b, "r": r, "r_squared": r ** 2}
+
+
+def sejajarkan_wilayah(df_x, df_y):
+    """Wilayah yang ada di kedua tabel format panjang, dicocokkan dengan nama baku.
+
+    Nama wilayah df_x diganti ejaan df_y jika sama setelah normalisasi ("KOTA TANGERANG" =
+    "Kota Tangerang"). Mengembalikan (df_x, wilayah). ValueError jika tidak ada wilayah yang
+    sama, biasanya karena tingkatnya berbeda (kecamatan vs kabupaten/kota): jumlahkan dulu
+    ke tingkat yang sama, misalnya dengan pembacaan_sheet.total_per_kota.
+    """
+    nama_y = dict(zip(df_y['Wilayah'].map(normalisasi_wilayah), df_y['Wilayah']))
+    nama_x = df_x['Wilayah'].map(normalisasi_wilayah).map(nama_y)
+    df_x = df_x.assign(Wilayah=nama_x.where(nama_x.notna(), df_x['Wilayah']))
+    wilayah = pd.Index(df_x['Wilayah']).intersection(pd.Index(df_y['Wilayah'])).unique().sort_values()
+    if wilayah.empty:
+        raise ValueError(f"Tidak ada wilayah yang sama pada kedua tabel (mis. {df_x['Wilayah'].iloc[0]!r} vs "
+                         f"{df_y['Wilayah'].iloc[0]!r}); samakan tingkat wilayahnya lebih dulu")
+    return df_x, wilayah
+
+
+def regresi_per_wilayah(df_x, df_y, kolom_x='Jumlah Penduduk', kolom_y='Jumlah Angkatan Kerja'):
+    """Regresi Y = a + bX untuk setiap wilayah dari dua tabel format panjang.
+
+    Wilayah dipasangkan dengan sejajarkan_wilayah. Mengembalikan tabel kolom (satu baris
+    per wilayah) berisi n, a, b, r, dan r².
+    """
+    df_x, wilayah = sejajarkan_wilayah(df_x, df_y)
+    tahun = np.union1d(df_x['Tahun'].unique(), df_y['Tahun'].unique())
+
+    wilayah, tahun, X = matriks_wilayah_tahun(df_x, kolom_x, wilayah, tahun)
+    _, _, Y = matriks_wilayah_tahun(df_y, kolom_y, wilayah, tahun)
+    hasil = regresi_batch(X, Y)
+
+    return pd.DataFrame({
+        "Wilayah": wilayah,
+        "n": hasil["n"],
+        "Intercept (a)": hasil["a"],
+        "Slope (b)": hasil["b"],
+        "Koefisien Korelasi (r)": hasil["r"],
+        "Koefisien Determinasi (r²)": hasil["r_squared"],
+    })
+
+
+if __name__ == "__main__":
+    from pembacaan_sheet import baca_penduduk_dan_bps
+
+    inisialisasi()
+
+    log("MEMULAI REGRESI BATCH PER WILAYAH...")
+    log("="*50)
+
+    df_x, df_y = baca_penduduk_dan_bps()
+
+    if df_x is None or df_y is None:
+        log("ERROR: Gagal membaca data per wilayah!", level=DIAM)
+    else:
+        df_hasil = regresi_per_wilayah(df_x, df_y)
+        log(f"Jumlah wilayah yang diregresikan: {len(df_hasil)}")
+
+        output_path = "Regresi_Per_Wilayah.xlsx"
+        df_hasil.to_excel(output_path, index=False, sheet_name="Regresi Per Wilayah")
+        log(f"File '{output_path}' berhasil disimpan!")
+
+    log("\nPROSES SELESAI!")
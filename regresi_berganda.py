@@ -0,0 +1,253 @@
+import numpy as np
+
+
+def _sebagai_matriks(X):
+    X = np.asarray(X, dtype=np.float64)
+    return X[:, None] if X.ndim == 1 else X
+
+
+class HasilBerganda:
+    """Hasil regresi berganda Y = b0 + b1·X1 + ... + bk·Xk"""
+
+    def __init__(self, koefisien, kovarians, n, rss, tss, ridge=0.0):
+        self.koefisien = koefisien          # [b0, b1, ..., bk]
+        self.kovarians = kovarians          # matriks kovarians koefisien
+        self.n = n
+        self.k = len(koefisien) - 1
+        self.rss = rss                      # jumlah kuadrat residual
+        self.tss = tss                      # jumlah kuadrat total terhadap rata-rata
+        self.ridge = ridge
+
+    @property
+    def intercept(self):
+        return self.koefisien[0]
+
+    @property
+    def slope(self):
+        return self.koefisien[1:]
+
+    @property
+    def standard_error(self):
+        return np.sqrt(np.diag(self.kovarians))
+
+    @property
+    def t_stat(self):
+        return self.koefisien / self.standard_error
+
+    @property
+    def r_squared(self):
+        return 1.0 - self.rss / self.tss
+
+    def prediksi(self, X):
+        return self.intercept + _sebagai_matriks(X) @ self.slope
+
+    def __repr__(self):
+        return f"HasilBerganda(n={self.n}, k={self.k}, r²={self.r_squared:.4f}, ridge={self.ridge})"
+
+
+def _kovarians(G_inv, G, sigma2, ridge):
+    """Kovarians koefisien; untuk ridge memakai bentuk sandwich (G+λI)⁻¹ G (G+λI)⁻¹"""
+    if ridge:
+        return sigma2 * (G_inv @ G @ G_inv)
+    return sigma2 * G_inv
+
+
+def _matriks_ridge(p, ridge):
+    """Penalti ridge pada diagonal, intercept tidak dipenalti"""
+    D = np.eye(p) * ridge
+    D[0, 0] = 0.0
+    return D
+
+
+class AkumulatorBerganda:
+    """Akumulator XᵀX, Xᵀy, dan yᵀy per potongan data untuk regresi berganda.
+
+    Matriks desain penuh tidak pernah dibentuk: setiap potongan (n_i × k) hanya
+    menambah matriks (k+1) × (k+1). Kolom X dan y digeser dengan rata-rata potongan
+    pertama agar jumlah kuadrat tidak kehilangan presisi saat n sangat besar.
+    Akumulator dapat digabung dengan merge().
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self.n = 0
+        self.geser_x = None
+        self.geser_y = 0.0
+        self.G = np.zeros((k + 1, k + 1))   # ZᵀZ, Z = [1, X - geser_x]
+        self.h = np.zeros(k + 1)            # Zᵀ(y - geser_y)
+        self.yy = 0.0                       # (y - geser_y)ᵀ(y - geser_y)
+
+    def update(self, X, y):
+        """Menambahkan satu potongan data X (n × k) dan y (n)"""
+        X = _sebagai_matriks(X)
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if X.shape != (y.size, self.k):
+            raise ValueError(f"Ukuran X {X.shape} tidak cocok dengan y ({y.size}) dan k={self.k}")
+        if y.size == 0:
+            return self
+        if self.geser_x is None:
+            self.geser_x = X.mean(axis=0)
+            self.geser_y = float(y.mean())
+
+        Xc = X - self.geser_x
+        yc = y - self.geser_y
+        jumlah_x = Xc.sum(axis=0)
+
+        self.G[0, 0] += y.size
+        self.G[0, 1:] += jumlah_x
+        self.G[1:, 0] += jumlah_x
+        self.G[1:, 1:] += Xc.T @ Xc
+        self.h[0] += yc.sum()
+        self.h[1:] += Xc.T @ yc
+        self.yy += float(yc @ yc)
+        self.n += y.size
+        return self
+
+    def _geser_ke(self, geser_x, geser_y):
+        """Mengembalikan (G, h, yy) akumulator ini jika dihitung dengan titik geser lain"""
+        d = self.geser_x - geser_x
+        e = self.geser_y - geser_y
+        T = np.eye(self.k + 1)
+        T[1:, 0] = d
+        G = T @ self.G @ T.T
+        h = T @ (self.h + e * self.G[:, 0])
+        yy = self.yy + 2.0 * e * self.h[0] + e * e * self.n
+        return G, h, yy
+
+    def merge(self, other):
+        """Menggabungkan akumulator lain ke akumulator ini"""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.geser_x, self.geser_y = other.geser_x.copy(), other.geser_y
+            self.G, self.h, self.yy, self.n = other.G.copy(), other.h.copy(), other.yy, other.n
+            return self
+        G, h, yy = other._geser_ke(self.geser_x, self.geser_y)
+        self.G += G
+        self.h += h
+        self.yy += yy
+        self.n += other.n
+        return self
+
+    def selesaikan(self, ridge=0.0):
+        """Menyelesaikan persamaan normal dengan dekomposisi Cholesky"""
+        p = self.k + 1
+        if self.n <= p:
+            raise ValueError(f"Jumlah data ({self.n}) harus lebih besar dari jumlah parameter ({p})")
+
+        A = self.G + _matriks_ridge(p, ridge)
+        L = np.linalg.cholesky(A)
+        c = np.linalg.solve(L.T, np.linalg.solve(L, self.h))
+        L_inv = np.linalg.solve(L, np.eye(p))
+        A_inv = L_inv.T @ L_inv
+
+        rss = max(self.yy - 2.0 * c @ self.h + c @ self.G @ c, 0.0)
+        tss = self.yy - self.h[0] ** 2 / self.n
+        kov = _kovarians(A_inv, self.G, rss / (self.n - p), ridge)
+
+        # Kembalikan ke skala asli: b0 = c0 + geser_y - Σ cj·geser_xj
+        M = np.eye(p)
+        M[0, 1:] = -self.geser_x
+        koefisien = M @ c
+        koefisien[0] += self.geser_y
+        return HasilBerganda(koefisien, M @ kov @ M.T, self.n, rss, tss, ridge)
+
+
+def regresi_berganda(X, y, ridge=0.0):
+    """Regresi berganda dalam memori dengan dekomposisi QR (ridge lewat baris augmentasi)"""
+    X = _sebagai_matriks(X)
+    y = np.asarray(y, dtype=np.float64).ravel()
+    n, k = X.shape
+    p = k + 1
+    if n <= p:
+        raise ValueError(f"Jumlah data ({n}) harus lebih besar dari jumlah parameter ({p})")
+
+    # Pemusatan kolom menjaga kondisi matriks; intercept dipulihkan di akhir
+    mean_x = X.mean(axis=0)
+    mean_y = y.mean()
+    Z = np.column_stack([np.ones(n), X - mean_x])
+    yc = y - mean_y
+    if ridge:
+        Z = np.vstack([Z, np.sqrt(_matriks_ridge(p, ridge))])
+        yc = np.concatenate([yc, np.zeros(p)])
+
+    Q, R = np.linalg.qr(Z)
+    c = np.linalg.solve(R, Q.T @ yc)
+    R_inv = np.linalg.solve(R, np.eye(p))
+    A_inv = R_inv @ R_inv.T
+
+    residual = (y - mean_y) - Z[:n] @ c
+    rss = float(residual @ residual)
+    tss = float((y - mean_y) @ (y - mean_y))
+    G = Z[:n].T @ Z[:n]
+    kov = _kovarians(A_inv, G, rss / (n - p), ridge)
+
+    M = np.eye(p)
+    M[0, 1:] = -mean_x
+    koefisien = M @ c
+    koefisien[0] += mean_y
+    return HasilBerganda(koefisien, M @ kov @ M.T, n, rss, tss, ridge)
+
+
+def regresi_berganda_chunk(potongan, k, ridge=0.0):
+    """Regresi berganda dari iterable potongan (X, y) tanpa memuat seluruh data"""
+    akumulator = AkumulatorBerganda(k)
+    for X, y in potongan:
+        akumulator.update(X, y)
+    return akumulator.selesaikan(ridge)
+
+
+def regresi_berganda_batch(X, Y, ridge=0.0):
+    """Regresi berganda untuk banyak grup sekaligus.
+
+    X berukuran (grup, n, k) dan Y berukuran (grup, n); observasi dengan NaN diabaikan
+    per grup. Persamaan normal semua grup diselesaikan bersamaan dengan Cholesky bertumpuk.
+    Mengembalikan dict berisi koefisien (grup, k+1), standard_error (grup, k+1),
+    r_squared, dan n.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    Y = np.asarray(Y, dtype=np.float64)
+    if X.ndim == 2:
+        X = X[:, :, None]
+    g, n, k = X.shape
+    p = k + 1
+
+    valid = ~(np.isnan(Y) | np.isnan(X).any(axis=2))
+    jumlah = valid.sum(axis=1)
+    w = valid.astype(np.float64)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.einsum('gn,gnk->gk', w, np.nan_to_num(X)) / jumlah[:, None]
+        mean_y = np.einsum('gn,gn->g', w, np.nan_to_num(Y)) / jumlah
+    Xc = np.where(valid[:, :, None], X - mean_x[:, None, :], 0.0)
+    yc = np.where(valid, Y - mean_y[:, None], 0.0)
+    Z = np.concatenate([w[:, :, None], Xc], axis=2)
+
+    G = np.einsum('gni,gnj->gij', Z, Z)
+    h = np.einsum('gni,gn->gi', Z, yc)
+    yy = np.einsum('gn,gn->g', yc, yc)
+
+    # Grup yang datanya kurang diberi sistem identitas agar Cholesky bertumpuk tetap jalan
+    cukup = jumlah > p
+    A = G + _matriks_ridge(p, ridge)
+    A[~cukup] = np.eye(p)
+    L = np.linalg.cholesky(A)
+    c = np.linalg.solve(L.transpose(0, 2, 1), np.linalg.solve(L, h[:, :, None]))[:, :, 0]
+    A_inv = np.linalg.inv(A)
+
+    rss = np.maximum(yy - 2.0 * np.einsum('gi,gi->g', c, h) + np.einsum('gi,gij,gj->g', c, G, c), 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma2 = rss / (jumlah - p)
+        r_squared = 1.0 - rss / yy
+        kov = (A_inv @ G @ A_inv if ridge else A_inv) * sigma2[:, None, None]
+
+    M = np.broadcast_to(np.eye(p), (g, p, p)).copy()
+    M[:, 0, 1:] = -mean_x
+    koefisien = np.einsum('gij,gj->gi', M, c)
+    koefisien[:, 0] += mean_y
+    se = np.sqrt(np.einsum('gij,gjk,gik->gi', M, kov, M))
+
+    koefisien[~cukup] = np.nan
+    se[~cukup] = np.nan
+    r_squared[~cukup] = np.nan
+    return {"n": jumlah, "koefisien": koefisien, "standard_error": se, "r_squared": r_squared}
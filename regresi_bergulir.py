@@ -0,0 +1,132 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from instrumentasi import inisialisasi, log, DIAM
+from regresi_batch import matriks_wilayah_tahun, sejajarkan_wilayah
+
+
+def regresi_bergulir(X, Y, jendela=None, min_observasi=3):
+    """Regresi Y = a + bX bergulir (rolling) atau meluas (expanding) sepanjang sumbu waktu.
+
+    X dan Y berukuran (jumlah_observasi,) atau (jumlah_wilayah, jumlah_periode); NaN dianggap
+    data hilang. Jumlah n, Σx, Σy, Σx², Σy², Σxy dibentuk sekali sebagai jumlah kumulatif,
+    sehingga setiap langkah jendela (menambah satu periode dan membuang satu periode)
+    cukup satu pengurangan, O(1) per langkah, dan semua wilayah dihitung bersamaan.
+    jendela=None berarti jendela meluas dari periode pertama.
+
+    Mengembalikan dict berisi array n, a, b, r, dan r_squared berukuran sama dengan X;
+    jendela dengan observasi kurang dari min_observasi berisi NaN.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    Y = np.asarray(Y, dtype=np.float64)
+    if X.shape != Y.shape:
+        raise ValueError(f"Ukuran X {X.shape} dan Y {Y.shape} tidak sama")
+    if jendela is not None and jendela < 2:
+        raise ValueError("Jendela regresi bergulir minimal 2 periode")
+    satu_dimensi = X.ndim == 1
+    X = np.atleast_2d(X)
+    Y = np.atleast_2d(Y)
+
+    valid = ~(np.isnan(X) | np.isnan(Y))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Data dipusatkan pada rata-rata wilayahnya agar selisih jumlah kumulatif
+        # tidak kehilangan presisi pada nilai besar (jutaan jiwa)
+        jumlah_valid = valid.sum(axis=1)
+        pusat_x = np.nan_to_num(np.where(valid, X, 0.0).sum(axis=1) / jumlah_valid)[:, None]
+        pusat_y = np.nan_to_num(np.where(valid, Y, 0.0).sum(axis=1) / jumlah_valid)[:, None]
+    dx = np.where(valid, X - pusat_x, 0.0)
+    dy = np.where(valid, Y - pusat_y, 0.0)
+
+    kumulatif = np.cumsum(np.stack([valid.astype(np.float64), dx, dy, dx * dx, dy * dy, dx * dy]), axis=2)
+    if jendela is None:
+        jumlah = kumulatif
+    else:
+        jumlah = kumulatif.copy()
+        jumlah[..., jendela:] -= kumulatif[..., :-jendela]
+    n, sx, sy, sxx, syy, sxy = jumlah
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        m2_x = np.maximum(sxx - sx * sx / n, 0.0)
+        m2_y = np.maximum(syy - sy * sy / n, 0.0)
+        c_xy = sxy - sx * sy / n
+
+        b = c_xy / m2_x
+        a = (pusat_y + sy / n) - b * (pusat_x + sx / n)
+        r = c_xy / np.sqrt(m2_x * m2_y)
+
+    n = np.rint(n).astype(np.int64)
+    kurang = n < max(2, min_observasi)
+    b[kurang] = np.nan
+    a[kurang] = np.nan
+    r[kurang] = np.nan
+
+    hasil = {"n": n, "a": a, "b": b, "r": r, "r_squared": r ** 2}
+    if satu_dimensi:
+        hasil = {kunci: nilai[0] for kunci, nilai in hasil.items()}
+    return hasil
+
+
+def _periode_lengkap(periode):
+    """Melengkapi periode yang bolong (tahun, bulan, kuartal) agar jendela dihitung per periode kalender"""
+    periode = pd.Index(periode).sort_values()
+    if len(periode) == 0:
+        return periode.to_numpy()
+    if isinstance(periode.dtype, pd.PeriodDtype):
+        return pd.period_range(periode.min(), periode.max(), freq=periode.freq).to_numpy()
+    if pd.api.types.is_integer_dtype(periode.dtype):
+        return np.arange(periode.min(), periode.max() + 1)
+    return periode.to_numpy()
+
+
+def regresi_bergulir_per_wilayah(df_x, df_y, jendela=None, kolom_x='Jumlah Penduduk',
+                                 kolom_y='Jumlah Angkatan Kerja', kolom_waktu='Tahun', min_observasi=3):
+    """Deret waktu a, b, dan r² per wilayah dari dua tabel format panjang.
+
+    kolom_waktu dapat berisi tahun (int) atau pd.Period bulanan/kuartalan; periode yang
+    tidak ada datanya diisi NaN sehingga jendela selalu mencakup `jendela` periode kalender.
+    Wilayah dipasangkan dengan sejajarkan_wilayah. Mengembalikan tabel panjang dengan satu
+    baris per (wilayah, periode).
+    """
+    df_x, wilayah = sejajarkan_wilayah(df_x, df_y)
+    periode = _periode_lengkap(pd.Index(df_x[kolom_waktu]).union(pd.Index(df_y[kolom_waktu])).unique())
+
+    wilayah, periode, X = matriks_wilayah_tahun(df_x, kolom_x, wilayah, periode, kolom_waktu)
+    _, _, Y = matriks_wilayah_tahun(df_y, kolom_y, wilayah, periode, kolom_waktu)
+    hasil = regresi_bergulir(X, Y, jendela, min_observasi)
+
+    return pd.DataFrame({
+        "Wilayah": np.repeat(np.asarray(wilayah), len(periode)),
+        kolom_waktu: np.tile(periode, len(wilayah)),
+        "n": hasil["n"].ravel(),
+        "Intercept (a)": hasil["a"].ravel(),
+        "Slope (b)": hasil["b"].ravel(),
+        "Koefisien Korelasi (r)": hasil["r"].ravel(),
+        "Koefisien Determinasi (r²)": hasil["r_squared"].ravel(),
+    })
+
+
+if __name__ == "__main__":
+    from pembacaan_sheet import baca_penduduk_dan_bps
+
+    parser = argparse.ArgumentParser(description="Regresi bergulir a, b, r² per wilayah")
+    parser.add_argument("--jendela", type=int, help="lebar jendela dalam periode (bawaan: jendela meluas)")
+    parser.add_argument("--output", default="Regresi_Bergulir.xlsx")
+    args = parser.parse_args()
+    inisialisasi()
+
+    log("MEMULAI REGRESI BERGULIR PER WILAYAH...")
+    log("="*50)
+
+    df_x, df_y = baca_penduduk_dan_bps()
+
+    if df_x is None or df_y is None:
+        log("ERROR: Gagal membaca data per wilayah!", level=DIAM)
+    else:
+        df_hasil = regresi_bergulir_per_wilayah(df_x, df_y, args.jendela)
+        log(f"Jumlah baris (wilayah × periode): {len(df_hasil)}")
+        df_hasil.to_excel(args.output, index=False, sheet_name="Regresi Bergulir")
+        log(f"File '{args.output}' berhasil disimpan!")
+
+    log("\nPROSES SELESAI!")
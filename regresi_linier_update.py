@@ -1,225 +1,343 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-from openpyxl import load_workbook
-from openpyxl.drawing.image import Image as ExcelImage
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
+import argparse
+import functools
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from akumulator_regresi import AkumulatorRegresi
+from bootstrap import bootstrap_regresi
+from instrumentasi import inisialisasi, log, tampilkan, tahap, DIAM
+from laporan_pdf import LaporanPDF
+from model_regresi import ModelRegresi, simpan_model, path_model
+from proyeksi import proyeksi, tabel_proyeksi
+from regresi_robust import baris_info_robust
+from uji_permutasi import uji_permutasi
+from validasi_silang import diagnostik_pengaruh, baris_info_validasi
+
+# Lokasi file masukan dan hasil
+INPUT_PATH = "Data Cleansing.xlsx"
+EXCEL_PATH = "Regresi_Output_Data_dan_Grafik.xlsx"
+PDF_PATH = "Analisis_Regresi_Linier.pdf"
+GRAFIK_PATH = "grafik_regresi.png"
+
+# Data dummy jika file tidak bisa dibaca
+TAHUN_DUMMY = [2020, 2021, 2022, 2023, 2024]
+X_DUMMY = [1742604, 1771092, 1834962, 1912679, 1927815]
+Y_DUMMY = [5552172, 5698344, 5940618, 5516656, 5797923]
+
+
+class HasilRegresi:
+    """Hasil regresi linier Y = a + bX beserta data, prediksi, dan tabel ringkasannya"""
+
+    def __init__(self, tahun, X, Y, kota="Tangerang"):
+        self.tahun = np.asarray(tahun)
+        self.X = np.asarray(X)
+        self.Y = np.asarray(Y)
+        self.kota = kota
+        
+        # Satu kali lintasan data dengan akumulator co-moment (stabil secara numerik)
+        self.akumulator = AkumulatorRegresi.dari_data(self.X, self.Y)
+        self.a = self.akumulator.a
+        self.b = self.akumulator.b
+        self.r = self.akumulator.r
+        self.r_squared = self.akumulator.r_squared
+        self.y_pred = self.a + self.b * self.X.astype(np.float64)
+        
+        # Baris (Parameter, Nilai) dari analisis tambahan (bootstrap, dll.) untuk Info Regresi dan PDF
+        self.info_tambahan = []
+        
+        # Tabel tambahan {nama: DataFrame} (proyeksi, dll.) sebagai sheet Excel dan bagian PDF
+        self.tabel_tambahan = {}
+
+    @property
+    def n(self):
+        return len(self.X)
+
+    @functools.cached_property
+    def diagnostik(self):
+        """Leverage dan Cook's distance per observasi (bentuk tertutup, tanpa fit ulang).
 
-print("MEMULAI ANALISIS REGRESI...")
-print("="*50)
+        Dihitung saat pertama dibutuhkan (tabel hasil, PDF) agar fit biasa tetap satu lintasan.
+        """
+        return diagnostik_pengaruh(self.X, self.Y)
 
-# === Baca Data dari File Data Cleansing.xlsx ===
-try:
-    # Baca data dari sheet Summary
-    input_file = "Data Cleansing.xlsx"
+    @property
+    def persamaan(self):
+        return f"Y = {self.a:,.2f} + {self.b:.6f}X"
+
+    def tabel_hasil(self):
+        """Tabel data aktual, prediksi, dan error per tahun"""
+        selisih = self.Y - self.y_pred
+        return pd.DataFrame({
+            "Tahun": self.tahun,
+            "Jumlah Penduduk (X)": self.X,
+            "Angkatan Kerja Aktual (Y)": self.Y,
+            "Angkatan Kerja Prediksi": np.round(self.y_pred).astype(np.int64),
+            "Selisih (Aktual - Prediksi)": np.round(selisih).astype(np.int64),
+            "Persentase Error (%)": np.round(np.abs(selisih) / self.Y * 100, 2),
+            "Leverage (h)": np.round(self.diagnostik["leverage"], 4),
+            "Cook's Distance": np.round(self.diagnostik["cook"], 4)
+        })
+
+    def tabel_info(self):
+        """Tabel parameter regresi untuk sheet Info Regresi"""
+        return pd.DataFrame({
+            "Parameter": ["Intercept (a)", "Slope (b)", "Koefisien Korelasi (r)", "Koefisien Determinasi (r²)", "Persamaan Regresi"]
+                         + [parameter for parameter, _ in self.info_tambahan],
+            "Nilai": [f"{self.a:,.2f}", f"{self.b:.6f}", f"{self.r:.4f}", f"{self.r_squared:.4f}", self.persamaan]
+                     + [nilai for _, nilai in self.info_tambahan]
+        })
+
+
+def baca_data_cleansing(input_file=INPUT_PATH):
+    """Membaca tahun, X, dan Y dari sheet Summary; memakai data dummy jika gagal"""
+    try:
+        if not os.path.exists(input_file):
+            raise FileNotFoundError(f"File '{input_file}' tidak ditemukan! "
+                                    "Pastikan Anda sudah menjalankan script data cleansing terlebih dahulu.")
+        
+        # Baca data dari sheet Summary
+        df_source = pd.read_excel(input_file, sheet_name="Summary")
+        log(f"Data berhasil dibaca dari '{input_file}'")
+        return df_source
     
-    if not os.path.exists(input_file):
-        print(f"ERROR: File '{input_file}' tidak ditemukan!")
-        print("Pastikan Anda sudah menjalankan script data cleansing terlebih dahulu.")
-        exit()
+    except Exception as e:
+        log(f"ERROR membaca file: {str(e)}", level=DIAM)
+        log("Menggunakan data dummy untuk testing...")
+        return pd.DataFrame({
+            "Tahun": TAHUN_DUMMY,
+            "Jumlah Penduduk (X)": X_DUMMY,
+            "Jumlah Angkatan Kerja (Y)": Y_DUMMY
+        })
+
+
+def hitung_regresi(df_source, kota="Tangerang"):
+    """Menghitung regresi langsung dari DataFrame hasil cleansing"""
+    return HasilRegresi(
+        df_source['Tahun'].to_numpy(),
+        df_source['Jumlah Penduduk (X)'].to_numpy(),  # Data Penduduk
+        df_source['Jumlah Angkatan Kerja (Y)'].to_numpy(),  # Data Angkatan Kerja
+        kota=kota
+    )
+
+
+def hitung_regresi_panel(panel, kota="Tangerang", variabel_x="Jumlah Penduduk", variabel_y="Jumlah Angkatan Kerja"):
+    """Menghitung regresi satu wilayah langsung dari PanelWilayahTahun (tanpa DataFrame perantara)"""
+    return HasilRegresi(*panel.pasangan(kota, variabel_x, variabel_y), kota=kota)
+
+
+def lengkapi_hasil(hasil, seed=0):
+    """Analisis tambahan opsional untuk run tunggal (main) dan batch (jalankan_analisis):
+    baris Info Regresi dari bootstrap, uji permutasi, validasi silang, dan regresi robust,
+    serta tabel proyeksi. seed tetap agar hasil dapat diulang.
+
+    Tidak dijalankan oleh fit biasa; aktifkan dengan lengkap=True (CLI: --lengkap)."""
+    # Interval kepercayaan dan p-value slope dengan bootstrap
+    with tahap("bootstrap"):
+        hasil.info_tambahan.extend(bootstrap_regresi(hasil.X, hasil.Y, seed=seed).baris_info())
     
-    # Baca data dari sheet Summary
-    df_source = pd.read_excel(input_file, sheet_name="Summary")
-    print(f"Data berhasil dibaca dari '{input_file}'")
-    print("Data yang dibaca:")
-    print(df_source)
+    # Uji permutasi r dan b (eksak untuk n kecil, Monte Carlo untuk n besar)
+    with tahap("uji_permutasi"):
+        hasil.info_tambahan.extend(uji_permutasi(hasil.X, hasil.Y, seed=seed).baris_info())
     
-    # Ekstrak data ke variabel
-    tahun = df_source['Tahun'].tolist()
-    X = df_source['Jumlah Penduduk (X)'].tolist()  # Data Penduduk
-    Y = df_source['Jumlah Angkatan Kerja (Y)'].tolist()  # Data Angkatan Kerja
-    n = len(X)
+    # Validasi silang leave-one-out (dan k-fold jika data cukup)
+    with tahap("validasi_silang"):
+        hasil.info_tambahan.extend(baris_info_validasi(hasil.X, hasil.Y))
     
-    print(f"\nData yang akan dianalisis:")
-    print(f"Tahun: {tahun}")
-    print(f"Jumlah Penduduk (X): {X}")
-    print(f"Jumlah Angkatan Kerja (Y): {Y}")
-    print(f"Jumlah data: {n}")
+    # Estimasi robust (Theil–Sen dan Huber) sebagai pembanding OLS untuk data BPS yang kotor
+    with tahap("regresi_robust"):
+        hasil.info_tambahan.extend(baris_info_robust(hasil.X, hasil.Y))
     
-except Exception as e:
-    print(f"ERROR membaca file: {str(e)}")
-    print("Menggunakan data dummy untuk testing...")
+    # Proyeksi angkatan kerja 1-30 tahun ke depan untuk beberapa skenario pertumbuhan penduduk
+    with tahap("proyeksi"):
+        hasil.tabel_tambahan["Proyeksi"] = tabel_proyeksi(proyeksi(hasil.tahun, hasil.X, hasil.Y))
+    return hasil
+
+
+def render_grafik(hasil, format="png", dpi=300):
+    """Render grafik data aktual dan garis regresi sekali ke memori; mengembalikan bytes.
+
+    matplotlib dimuat saat dibutuhkan dan memakai backend Agg.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
     
-    # Data dummy jika file tidak bisa dibaca
-    tahun = [2020, 2021, 2022, 2023, 2024]
-    X = [1742604, 1771092, 1834962, 1912679, 1927815]
-    Y = [5552172, 5698344, 5940618, 5516656, 5797923]
-    n = len(X)
-
-print("\n" + "="*50)
-print("MENGHITUNG REGRESI LINEAR...")
-
-# === Hitung Regresi nilai a, b, dan Y=a+bX ===
-sum_X = sum(X)
-sum_Y = sum(Y)
-sum_XY = sum([X[i]*Y[i] for i in range(n)])
-sum_X2 = sum([X[i]**2 for i in range(n)])
-
-# Hitung koefisien regresi
-b = (n * sum_XY - sum_X * sum_Y) / (n * sum_X2 - sum_X**2)
-a = (sum_Y - b * sum_X) / n
-
-# Hitung prediksi
-y_pred = [a + b * x for x in X]
-
-# Tampilkan hasil perhitungan
-print(f"Koefisien a (intercept): {a:,.2f}")
-print(f"Koefisien b (slope): {b:.6f}")
-print(f"Persamaan regresi: Y = {a:,.2f} + {b:.6f}X")
-
-# Hitung koefisien korelasi (R)
-mean_X = sum_X / n
-mean_Y = sum_Y / n
-numerator = sum([(X[i] - mean_X) * (Y[i] - mean_Y) for i in range(n)])
-denominator_X = sum([(X[i] - mean_X)**2 for i in range(n)])
-denominator_Y = sum([(Y[i] - mean_Y)**2 for i in range(n)])
-r = numerator / (denominator_X * denominator_Y)**0.5
-r_squared = r**2
-
-print(f"Koefisien korelasi (r): {r:.4f}")
-print(f"Koefisien determinasi (r²): {r_squared:.4f}")
-print(f"Akurasi model: {r_squared*100:.2f}%")
-
-print("\n" + "="*50)
-print("MEMBUAT GRAFIK...")
-
-# === Simpan Gambar Grafik ===
-plt.figure(figsize=(10, 6))
-plt.plot(tahun, Y, 'bo-', label="Data Aktual", markersize=8, linewidth=2)
-plt.plot(tahun, y_pred, 'r--', label="Regresi Linear", linewidth=2)
-
-# Tambahkan informasi pada grafik
-plt.xlabel("Tahun", fontsize=12)
-plt.ylabel("Jumlah Angkatan Kerja", fontsize=12)
-plt.title(f"Regresi Linear: Penduduk vs Angkatan Kerja Kota Tangerang\nY = {a:,.0f} + {b:.6f}X (r² = {r_squared:.4f})", fontsize=14)
-plt.grid(True, alpha=0.3)
-plt.legend(fontsize=11)
-
-# Format y-axis untuk menampilkan angka dalam jutaan
-plt.gca().yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x/1e6:.1f}M'))
-
-# Tambahkan nilai pada setiap titik
-for i, (t, actual, pred) in enumerate(zip(tahun, Y, y_pred)):
-    plt.annotate(f'{actual/1e6:.1f}M', (t, actual), textcoords="offset points", xytext=(0,10), ha='center', fontsize=9)
-    plt.annotate(f'{pred/1e6:.1f}M', (t, pred), textcoords="offset points", xytext=(0,-15), ha='center', fontsize=9, color='red')
-
-plt.tight_layout()
-plt.savefig("grafik_regresi.png", dpi=300, bbox_inches='tight')
-plt.close()
-
-print("Grafik berhasil disimpan sebagai 'grafik_regresi.png'")
-
-print("\n" + "="*50)
-print("MENYIMPAN HASIL KE EXCEL...")
-
-# === Simpan Data ke Excel ===
-df_result = pd.DataFrame({
-    "Tahun": tahun,
-    "Jumlah Penduduk (X)": X,
-    "Angkatan Kerja Aktual (Y)": Y,
-    "Angkatan Kerja Prediksi": [round(y) for y in y_pred],
-    "Selisih (Aktual - Prediksi)": [round(Y[i] - y_pred[i]) for i in range(n)],
-    "Persentase Error (%)": [round(abs(Y[i] - y_pred[i])/Y[i]*100, 2) for i in range(n)]
-})
-
-# Tambahkan informasi regresi
-df_info = pd.DataFrame({
-    "Parameter": ["Intercept (a)", "Slope (b)", "Koefisien Korelasi (r)", "Koefisien Determinasi (r²)", "Persamaan Regresi"],
-    "Nilai": [f"{a:,.2f}", f"{b:.6f}", f"{r:.4f}", f"{r_squared:.4f}", f"Y = {a:,.2f} + {b:.6f}X"]
-})
-
-excel_path = "Regresi_Output_Data_dan_Grafik.xlsx"
-
-try:
-    with pd.ExcelWriter(excel_path, engine="openpyxl") as writer:
-        df_result.to_excel(writer, index=False, sheet_name="Data dan Hasil")
-        df_info.to_excel(writer, index=False, sheet_name="Info Regresi")
+    a, b, r_squared = hasil.a, hasil.b, hasil.r_squared
+    tahun, Y, y_pred = hasil.tahun, hasil.Y, hasil.y_pred
     
-    print(f"Data berhasil disimpan ke '{excel_path}'")
+    fig = plt.figure(figsize=(10, 6))
+    plt.plot(tahun, Y, 'bo-', label="Data Aktual", markersize=8, linewidth=2)
+    plt.plot(tahun, y_pred, 'r--', label="Regresi Linear", linewidth=2)
     
-    # Tambah Grafik ke Excel
-    wb = load_workbook(excel_path)
-    ws = wb["Data dan Hasil"]
+    # Tambahkan informasi pada grafik
+    plt.xlabel("Tahun", fontsize=12)
+    plt.ylabel("Jumlah Angkatan Kerja", fontsize=12)
+    plt.title(f"Regresi Linear: Penduduk vs Angkatan Kerja Kota {hasil.kota}\nY = {a:,.0f} + {b:.6f}X (r² = {r_squared:.4f})", fontsize=14)
+    plt.grid(True, alpha=0.3)
+    plt.legend(fontsize=11)
     
-    # Tambahkan grafik
-    img = ExcelImage("grafik_regresi.png")
-    img.anchor = "H2"  # Posisi grafik
-    img.width = 600    # Lebar grafik
-    img.height = 360   # Tinggi grafik
-    ws.add_image(img)
+    # Format y-axis untuk menampilkan angka dalam jutaan
+    plt.gca().yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x/1e6:.1f}M'))
     
-    wb.save(excel_path)
-    print("Grafik berhasil ditambahkan ke Excel")
+    # Tambahkan nilai pada setiap titik
+    for i, (t, actual, pred) in enumerate(zip(tahun, Y, y_pred)):
+        plt.annotate(f'{actual/1e6:.1f}M', (t, actual), textcoords="offset points", xytext=(0,10), ha='center', fontsize=9)
+        plt.annotate(f'{pred/1e6:.1f}M', (t, pred), textcoords="offset points", xytext=(0,-15), ha='center', fontsize=9, color='red')
     
-except Exception as e:
-    print(f"ERROR menyimpan Excel: {str(e)}")
+    plt.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=format, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return buffer.getvalue()
 
-print("\n" + "="*50)
-print("MEMBUAT PDF...")
 
-# === Simpan Grafik dalam PDF ===
-pdf_path = "Analisis_Regresi_Linier.pdf"
+def buat_grafik(hasil, path_grafik=GRAFIK_PATH, grafik=None):
+    """Menyimpan grafik PNG; memakai hasil render yang sudah ada jika diberikan"""
+    if grafik is None:
+        grafik = render_grafik(hasil)
+    with open(path_grafik, "wb") as f:
+        f.write(grafik)
+    return grafik
 
-try:
-    c = canvas.Canvas(pdf_path, pagesize=A4)
-    width, height = A4
-    
-    # Judul
-    c.setFont("Helvetica-Bold", 16)
-    c.drawCentredString(width / 2, height - 50, "ANALISIS REGRESI LINEAR")
-    c.drawCentredString(width / 2, height - 70, "Penduduk vs Angkatan Kerja Kota Tangerang")
-    
-    # Grafik
-    c.drawImage("grafik_regresi.png", 50, height / 2 - 50, width=500, height=300, preserveAspectRatio=True)
-    
-    # Informasi regresi
-    c.setFont("Helvetica", 12)
-    y_pos = height / 2 - 100
-    c.drawString(50, y_pos, f"Persamaan Regresi: Y = {a:,.2f} + {b:.6f}X")
-    c.drawString(50, y_pos - 20, f"Koefisien Korelasi (r): {r:.4f}")
-    c.drawString(50, y_pos - 40, f"Koefisien Determinasi (r²): {r_squared:.4f}")
-    c.drawString(50, y_pos - 60, f"Akurasi Model: {r_squared*100:.2f}%")
-    
-    # Tabel data
-    c.setFont("Helvetica-Bold", 10)
-    c.drawString(50, y_pos - 100, "Data dan Prediksi:")
+
+def simpan_excel(hasil, excel_path=EXCEL_PATH, grafik=None):
+    """Ekspor opsional data, info regresi, dan grafik ke Excel dalam satu kali tulis"""
+    from openpyxl.drawing.image import Image as ExcelImage
     
-    c.setFont("Helvetica", 9)
-    header_y = y_pos - 120
-    c.drawString(50, header_y, "Tahun")
-    c.drawString(100, header_y, "Penduduk")
-    c.drawString(180, header_y, "Aktual")
-    c.drawString(250, header_y, "Prediksi")
-    c.drawString(320, header_y, "Error %")
+    if grafik is None:
+        grafik = render_grafik(hasil)
     
-    for i, (t, x, actual, pred) in enumerate(zip(tahun, X, Y, y_pred)):
-        row_y = header_y - 20 - (i * 15)
-        error_pct = abs(actual - pred) / actual * 100
-        c.drawString(50, row_y, str(t))
-        c.drawString(100, row_y, f"{x:,}")
-        c.drawString(180, row_y, f"{actual:,}")
-        c.drawString(250, row_y, f"{pred:,.0f}")
-        c.drawString(320, row_y, f"{error_pct:.2f}%")
+    with pd.ExcelWriter(excel_path, engine="openpyxl") as writer:
+        hasil.tabel_hasil().to_excel(writer, index=False, sheet_name="Data dan Hasil")
+        hasil.tabel_info().to_excel(writer, index=False, sheet_name="Info Regresi")
+        for nama, df in hasil.tabel_tambahan.items():
+            df.to_excel(writer, index=False, sheet_name=nama)
+        
+        # Tambahkan grafik langsung dari memori sebelum workbook ditutup
+        img = ExcelImage(io.BytesIO(grafik))
+        img.anchor = "J2"  # Posisi grafik
+        img.width = 600    # Lebar grafik
+        img.height = 360   # Tinggi grafik
+        writer.sheets["Data dan Hasil"].add_image(img)
+
+
+def buat_pdf(hasil, pdf_path=PDF_PATH, grafik=None):
+    """Ekspor opsional ringkasan analisis ke PDF; tabel data berlanjut ke halaman berikutnya"""
+    if grafik is None:
+        grafik = render_grafik(hasil)
     
-    c.save()
-    print(f"PDF berhasil disimpan sebagai '{pdf_path}'")
+    with LaporanPDF(pdf_path) as laporan:
+        laporan.tambah_wilayah(hasil, grafik)
+
+
+def buat_laporan(hasil, excel_path=EXCEL_PATH, pdf_path=PDF_PATH, path_grafik=GRAFIK_PATH):
+    """Membuat grafik PNG, Excel, dan PDF sekaligus dari satu kali render grafik.
+
+    Ketiga artefak ditulis bersamaan di thread terpisah. Mengembalikan dict
+    {path: pesan error atau None} untuk setiap artefak.
+    """
+    with tahap("render_grafik"):
+        grafik = render_grafik(hasil)
+    tugas = [
+        (path_grafik, buat_grafik, path_grafik),
+        (excel_path, simpan_excel, excel_path),
+        (pdf_path, buat_pdf, pdf_path),
+    ]
     
-except Exception as e:
-    print(f"ERROR membuat PDF: {str(e)}")
-
-print("\n" + "="*60)
-print("RINGKASAN HASIL ANALISIS")
-print("="*60)
-print(f"File input: Data Cleansing.xlsx")
-print(f"Jumlah data: {n} tahun ({min(tahun)}-{max(tahun)})")
-print(f"Persamaan regresi: Y = {a:,.2f} + {b:.6f}X")
-print(f"Koefisien korelasi (r): {r:.4f}")
-print(f"Koefisien determinasi (r²): {r_squared:.4f}")
-print(f"Akurasi model: {r_squared*100:.2f}%")
-print("\nFile output yang dihasilkan:")
-print(f"1. {excel_path}")
-print(f"2. {pdf_path}")
-print(f"3. grafik_regresi.png")
-print("\nPROSES SELESAI!")
-print("="*60)
\ No newline at end of file
+    status = {}
+    with tahap("tulis_laporan"), ThreadPoolExecutor(max_workers=len(tugas)) as executor:
+        futures = {path: executor.submit(fungsi, hasil, tujuan, grafik=grafik) for path, fungsi, tujuan in tugas}
+        for path, future in futures.items():
+            try:
+                future.result()
+                status[path] = None
+            except Exception as e:
+                status[path] = str(e)
+    return status
+
+
+def main(df_source=None, excel_path=EXCEL_PATH, pdf_path=PDF_PATH, path_grafik=GRAFIK_PATH, model_path=None,
+         kota="Tangerang", lengkap=False):
+    """Menjalankan analisis regresi; df_source dapat diberikan langsung tanpa membaca Excel.
+
+    model_path bawaan diturunkan dari nama kota (model/<kota>.json). Dengan lengkap=True
+    hasil juga dilengkapi bootstrap, uji permutasi, validasi silang, regresi robust, dan proyeksi.
+    """
+    with tahap("regresi") as span:
+        log("MEMULAI ANALISIS REGRESI...")
+        log("="*50)
+        
+        # === Baca Data dari File Data Cleansing.xlsx ===
+        if df_source is None:
+            df_source = baca_data_cleansing()
+        span.baris = len(df_source)
+        tampilkan(df_source, "Data yang dibaca:")
+        
+        log("\n" + "="*50)
+        log("MENGHITUNG REGRESI LINEAR...")
+        
+        # === Hitung Regresi nilai a, b, dan Y=a+bX ===
+        with tahap("hitung_regresi"):
+            hasil = hitung_regresi(df_source, kota=kota)
+        
+        # Bootstrap, uji permutasi, validasi silang, regresi robust, dan proyeksi (opsional)
+        if lengkap:
+            lengkapi_hasil(hasil)
+        
+        # Tampilkan hasil perhitungan
+        log(f"Koefisien a (intercept): {hasil.a:,.2f}")
+        log(f"Koefisien b (slope): {hasil.b:.6f}")
+        log(f"Persamaan regresi: {hasil.persamaan}")
+        log(f"Koefisien korelasi (r): {hasil.r:.4f}")
+        log(f"Koefisien determinasi (r²): {hasil.r_squared:.4f}")
+        log(f"Akurasi model: {hasil.r_squared*100:.2f}%")
+        for parameter, nilai in hasil.info_tambahan:
+            log(f"{parameter}: {nilai}")
+        
+        # === Simpan artefak model untuk layanan prediksi ===
+        model_path = model_path or path_model(hasil.kota)
+        simpan_model(ModelRegresi.dari_hasil(hasil), model_path)
+        log(f"Model berhasil disimpan sebagai '{model_path}'")
+        
+        log("\n" + "="*50)
+        log("MEMBUAT GRAFIK, EXCEL, DAN PDF...")
+        
+        # === Render grafik sekali, lalu simpan PNG, Excel, dan PDF bersamaan ===
+        with tahap("laporan"):
+            status = buat_laporan(hasil, excel_path, pdf_path, path_grafik)
+        for path, error in status.items():
+            if error is None:
+                log(f"'{path}' berhasil disimpan")
+            else:
+                log(f"ERROR menyimpan '{path}': {error}", level=DIAM)
+        
+        log("\n" + "="*60)
+        log("RINGKASAN HASIL ANALISIS")
+        log("="*60)
+        log(f"Jumlah data: {hasil.n} tahun ({min(hasil.tahun)}-{max(hasil.tahun)})")
+        log(f"Persamaan regresi: {hasil.persamaan}")
+        log(f"Koefisien korelasi (r): {hasil.r:.4f}")
+        log(f"Koefisien determinasi (r²): {hasil.r_squared:.4f}")
+        log(f"Akurasi model: {hasil.r_squared*100:.2f}%")
+        log("\nFile output yang dihasilkan:")
+        log(f"1. {excel_path}")
+        log(f"2. {pdf_path}")
+        log(f"3. {path_grafik}")
+        log(f"4. {model_path}")
+        log("\nPROSES SELESAI!")
+        log("="*60)
+    return hasil
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regresi linier Y = a + bX dari Data Cleansing.xlsx")
+    parser.add_argument("--lengkap", action="store_true",
+                        help="tambahkan bootstrap, uji permutasi, validasi silang, regresi robust, dan proyeksi")
+    args = parser.parse_args()
+
+    inisialisasi()
+    main(lengkap=args.lengkap)
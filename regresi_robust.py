@@ -0,0 +1,382 @@
+import warnings
+
+import numpy as np
+
+from akumulator_regresi import AkumulatorRegresi
+from regresi_batch import regresi_batch
+
+# Konstanta tuning Huber (efisiensi 95% pada galat normal)
+C_HUBER = 1.345
+
+# Faktor konsistensi MAD terhadap simpangan baku normal
+FAKTOR_MAD = 0.6744897501960817
+
+# Ukuran sampel acak untuk mode potongan (chunk)
+UKURAN_SAMPEL = 200_000
+
+_MAKS_BISEKSI = 200
+
+
+def _sebagai_matriks(X, Y):
+    X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    if X.shape != Y.shape:
+        raise ValueError(f"Ukuran X {X.shape} dan Y {Y.shape} tidak sama")
+    return X, Y
+
+
+def _inversi(z, daftar=False):
+    """Jumlah pasangan i < j dengan z[i] > z[j] (tegas) untuk setiap baris.
+
+    Merge sort bottom-up yang divektorkan: pada setiap level kedua setengah blok sudah
+    terurut, sehingga sort stabil hanya menggabung dua run. Untuk setiap elemen setengah
+    kanan, elemen kiri yang lebih besar adalah ekor setengah kiri sepanjang
+    lebar - (jumlah elemen kiri sebelum posisinya). O(n) per level, O(n log n) per baris.
+
+    daftar=True juga mengembalikan semua pasangan inversi (baris, i, j) dalam O(n log n + K).
+    """
+    g, n = z.shape
+    n_pad = 1 << max(0, (n - 1).bit_length())
+    # Padding +inf di akhir tidak pernah membentuk inversi
+    blok = np.full((g, n_pad), np.inf)
+    blok[:, :n] = z
+    total = np.zeros(g, dtype=np.int64)
+    if daftar:
+        indeks = np.tile(np.arange(n_pad), (g, 1))
+        pasangan = []
+
+    lebar = 1
+    while lebar < n_pad:
+        blok = blok.reshape(-1, 2 * lebar)
+        urutan = np.argsort(blok, axis=1, kind="stable")
+        dari_kiri = urutan < lebar
+        lebih_besar = np.where(dari_kiri, 0, lebar - np.cumsum(dari_kiri, axis=1))
+        total += lebih_besar.reshape(g, -1).sum(axis=1)
+        if daftar:
+            indeks = indeks.reshape(-1, 2 * lebar)
+            c = lebih_besar.ravel()
+            if c.any():
+                nomor_blok = np.repeat(np.arange(blok.shape[0]), 2 * lebar)
+                awal = np.repeat(nomor_blok * 2 * lebar + lebar - c, c)
+                langkah = np.arange(c.sum()) - np.repeat(np.cumsum(c) - c, c)
+                kanan = np.repeat(nomor_blok * 2 * lebar + urutan.ravel(), c)
+                datar = indeks.ravel()
+                pasangan.append((np.repeat(nomor_blok // (n_pad // (2 * lebar)), c),
+                                 datar[awal + langkah], datar[kanan]))
+            indeks = np.take_along_axis(indeks, urutan, axis=1)
+        blok = np.take_along_axis(blok, urutan, axis=1)
+        lebar *= 2
+
+    if not daftar:
+        return total
+    kosong = np.empty(0, dtype=np.int64)
+    baris, i, j = (np.concatenate(kolom) for kolom in zip(*pasangan)) if pasangan else (kosong,) * 3
+    return total, baris, i, j
+
+
+def _braket_sampel(xs, ys, n, k, jumlah_pasangan, batas, rng, ukuran=4096):
+    """Braket awal statistik urutan ke-k dari slope sejumlah pasangan acak.
+
+    Kuantil slope sampel di sekitar k/N (± 4 simpangan baku binomial) hampir selalu
+    mengapit statistik yang dicari; braket yang ternyata tidak mengapit diganti [-B, B].
+    """
+    g = xs.shape[0]
+    i = (rng.random((g, ukuran)) * n[:, None]).astype(np.int64)
+    j = (rng.random((g, ukuran)) * n[:, None]).astype(np.int64)
+    xi, xj = np.take_along_axis(xs, i, axis=1), np.take_along_axis(xs, j, axis=1)
+    yi, yj = np.take_along_axis(ys, i, axis=1), np.take_along_axis(ys, j, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.where(xi != xj, (yj - yi) / (xj - xi), np.nan)
+        m = np.isfinite(slope).sum(axis=1)
+        p = k / np.maximum(jumlah_pasangan, 1)
+        sisi = 4.0 * np.sqrt(p * (1 - p) / np.maximum(m, 1)) + 1.0 / np.maximum(m, 1)
+        slope_urut = np.sort(np.where(np.isfinite(slope), slope, np.inf), axis=1)
+        posisi = lambda q: np.clip((q * m).astype(np.int64), 0, np.maximum(m - 1, 0))[:, None]
+        bawah = np.take_along_axis(slope_urut, posisi(p - sisi), axis=1)[:, 0]
+        atas = np.take_along_axis(slope_urut, posisi(p + sisi), axis=1)[:, 0]
+    cukup = (m >= 100) & np.isfinite(bawah) & np.isfinite(atas) & (atas > bawah)
+    return np.where(cukup, bawah, -batas), np.where(cukup, atas, batas)
+
+
+def _median_slope(X, Y):
+    """Median semua slope pasangan (x_i ≠ x_j) per baris tanpa membentuk n² slope.
+
+    Jumlah slope < t sama dengan jumlah inversi z = y - t·x pada data terurut menurut x,
+    sehingga statistik urutan ke-k dicari dengan bisection pada t (setiap langkah satu
+    hitung inversi O(n log n)) sampai braket hanya memuat O(n) slope, yang kemudian
+    didaftar dan dipilih tepat. Semua baris diproses bersamaan.
+    """
+    valid = ~(np.isnan(X) | np.isnan(Y))
+    n = valid.sum(axis=1)
+    if X.shape[1] < 2:
+        return np.full(X.shape[0], np.nan), n
+
+    # Urutkan menurut x (data hilang di akhir); x sama diurutkan menurut y sehingga
+    # pasangan x sama tidak pernah terhitung sebagai inversi
+    urutan = np.lexsort((np.where(valid, Y, np.inf), np.where(valid, X, np.inf)), axis=1)
+    xs = np.take_along_axis(np.where(valid, X, 0.0), urutan, axis=1)
+    ys = np.take_along_axis(np.where(valid, Y, np.inf), urutan, axis=1)
+    valid_urut = np.take_along_axis(valid, urutan, axis=1)
+
+    # Jumlah pasangan dengan x berbeda = total pasangan - pasangan dengan x sama
+    awal_run = np.ones(xs.shape, dtype=bool)
+    awal_run[:, 1:] = xs[:, 1:] != xs[:, :-1]
+    indeks = np.broadcast_to(np.arange(xs.shape[1]), xs.shape)
+    posisi_dalam_run = indeks - np.maximum.accumulate(np.where(awal_run, indeks, 0), axis=1)
+    jumlah_pasangan = n * (n - 1) // 2 - np.where(valid_urut, posisi_dalam_run, 0).sum(axis=1)
+
+    # Semua slope berada di [-B, B] dengan B = rentang y / selisih x positif terkecil
+    dx = np.diff(xs, axis=1)
+    dx_min = np.where(valid_urut[:, 1:] & (dx > 0), dx, np.inf).min(axis=1, initial=np.inf)
+    rentang_y = np.where(valid, Y, -np.inf).max(axis=1) - np.where(valid, Y, np.inf).min(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        batas = np.where(np.isfinite(dx_min) & np.isfinite(rentang_y), rentang_y / dx_min, 0.0) + 1.0
+
+    # Statistik urutan bawah dan atas (sama jika jumlah pasangan ganjil), dibiseksi bersamaan
+    k = np.concatenate([(jumlah_pasangan + 1) // 2, jumlah_pasangan // 2 + 1])
+    xs2, ys2 = np.concatenate([xs, xs]), np.concatenate([ys, ys])
+    n2, batas2 = np.concatenate([n, n]), np.concatenate([batas, batas])
+    hitung = lambda t: _inversi(ys2 - t[:, None] * xs2)
+
+    # Braket dari sampel pasangan acak; dicek sekali, yang gagal kembali ke [-B, B]
+    bawah, atas = _braket_sampel(xs2, ys2, n2, k, np.concatenate([jumlah_pasangan, jumlah_pasangan]),
+                                 batas2, np.random.default_rng(0))
+    jumlah_bawah, jumlah_atas = hitung(bawah), hitung(atas)
+    salah = (jumlah_bawah >= k) | (jumlah_atas < k)
+    bawah = np.where(salah, -batas2, bawah)
+    atas = np.where(salah, batas2, atas)
+    jumlah_bawah = np.where(salah, 0, jumlah_bawah)
+    jumlah_atas = np.where(salah, np.concatenate([jumlah_pasangan, jumlah_pasangan]), jumlah_atas)
+
+    # Bisection sampai braket [bawah, atas) memuat paling banyak ±4n slope kandidat
+    # (atau lebarnya habis karena banyak slope kembar)
+    maks_kandidat = np.maximum(4 * n2, 1024)
+    for _ in range(_MAKS_BISEKSI):
+        skala = np.maximum(np.maximum(np.abs(bawah), np.abs(atas)), 1e-12 * batas2)
+        sempit = atas - bawah <= 4 * np.finfo(np.float64).eps * skala
+        aktif = (jumlah_atas - jumlah_bawah > maks_kandidat) & ~sempit
+        if not aktif.any():
+            break
+        tengah = 0.5 * (bawah + atas)
+        jumlah = hitung(tengah)
+        kurang = aktif & (jumlah < k)
+        lebih = aktif & (jumlah >= k)
+        bawah, jumlah_bawah = np.where(kurang, tengah, bawah), np.where(kurang, jumlah, jumlah_bawah)
+        atas, jumlah_atas = np.where(lebih, tengah, atas), np.where(lebih, jumlah, jumlah_atas)
+
+    # Slope kandidat = pasangan yang urutannya berbalik antara z(bawah) dan z(atas);
+    # statistik ke-k dipilih tepat dari kandidat tersebut
+    hasil = 0.5 * (bawah + atas)
+    perlu = np.flatnonzero(~sempit & (jumlah_pasangan[np.arange(2 * len(n)) % len(n)] > 0))
+    if perlu.size:
+        xs_p, ys_p = xs2[perlu], ys2[perlu]
+        urutan_bawah = np.argsort(ys_p - bawah[perlu, None] * xs_p, axis=1, kind="stable")
+        z_atas = np.take_along_axis(ys_p - atas[perlu, None] * xs_p, urutan_bawah, axis=1)
+        _, baris, i, j = _inversi(z_atas, daftar=True)
+        i, j = urutan_bawah[baris, i], urutan_bawah[baris, j]
+        slope = (ys_p[baris, j] - ys_p[baris, i]) / (xs_p[baris, j] - xs_p[baris, i])
+        urut = np.lexsort((slope, baris))
+        baris, slope = baris[urut], slope[urut]
+        awal = np.searchsorted(baris, np.arange(perlu.size))
+        akhir = np.searchsorted(baris, np.arange(perlu.size), side="right")
+        ada = akhir > awal
+        pilih = np.clip(awal + (k[perlu] - jumlah_bawah[perlu]) - 1, awal, np.maximum(akhir - 1, awal))
+        hasil[perlu[ada]] = slope[pilih[ada]]
+
+    g = X.shape[0]
+    slope = 0.5 * (hasil[:g] + hasil[g:])
+    slope[jumlah_pasangan < 1] = np.nan
+    return slope, n
+
+
+def theil_sen_batch(X, Y):
+    """Regresi Theil–Sen untuk setiap baris matriks X dan Y sekaligus.
+
+    b = median slope semua pasangan, a = median(y - b·x). NaN dianggap data hilang.
+    Mengembalikan dict berisi array n, a, dan b.
+    """
+    X, Y = _sebagai_matriks(X, Y)
+    b, n = _median_slope(X, Y)
+    a = np.full(b.shape, np.nan)
+    ada = ~np.isnan(b)
+    a[ada] = np.nanmedian(Y[ada] - b[ada, None] * X[ada], axis=1)
+    return {"n": n, "a": a, "b": b}
+
+
+def theil_sen(x, y):
+    """Regresi Theil–Sen satu kelompok data; mengembalikan dict n, a, b"""
+    hasil = theil_sen_batch(np.ravel(x)[None, :], np.ravel(y)[None, :])
+    return {kunci: nilai[0].item() for kunci, nilai in hasil.items()}
+
+
+def _skala_mad(residual):
+    """Skala robust MAD / 0.6745 per baris (mengabaikan NaN)"""
+    with warnings.catch_warnings():
+        # Grup tanpa residual (kurang dari 2 observasi) menghasilkan NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        median = np.nanmedian(residual, axis=1, keepdims=True)
+        return np.nanmedian(np.abs(residual - median), axis=1) / FAKTOR_MAD
+
+
+def _bobot_huber(residual, skala, c):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        u = np.abs(residual) / (c * skala[:, None])
+        # Skala nol (fit sempurna pada mayoritas data): semua bobot 1
+        return np.where(np.isfinite(u) & (u > 1.0), 1.0 / u, 1.0)
+
+
+def huber_batch(X, Y, c=C_HUBER, maks_iterasi=50, toleransi=1e-10):
+    """Regresi Huber (IRLS) untuk setiap baris matriks X dan Y sekaligus.
+
+    Dimulai dari OLS; setiap iterasi menghitung skala MAD residual, bobot Huber
+    min(1, c·s/|e|), lalu fit kuadrat terkecil berbobot dalam bentuk tertutup untuk
+    semua grup bersamaan. Mengembalikan dict berisi array n, a, b, skala, dan iterasi.
+    """
+    X, Y = _sebagai_matriks(X, Y)
+    valid = ~(np.isnan(X) | np.isnan(Y))
+    awal = regresi_batch(X, Y)
+    n = awal["n"]
+
+    # Dipusatkan pada rata-rata grup agar jumlah berbobot tetap presisi
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pusat_x = np.where(valid, X, 0.0).sum(axis=1) / n
+        pusat_y = np.where(valid, Y, 0.0).sum(axis=1) / n
+    dx = np.where(valid, X - pusat_x[:, None], np.nan)
+    dy = np.where(valid, Y - pusat_y[:, None], np.nan)
+    b = awal["b"].copy()
+    a = np.zeros_like(b)  # intercept dalam koordinat terpusat
+
+    iterasi = 0
+    skala = np.full(b.shape, np.nan)
+    while iterasi < maks_iterasi:
+        iterasi += 1
+        residual = dy - (a[:, None] + b[:, None] * dx)
+        skala = _skala_mad(residual)
+        w = np.where(valid, _bobot_huber(residual, skala, c), 0.0)
+        x0 = np.where(valid, dx, 0.0)
+        y0 = np.where(valid, dy, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sw = w.sum(axis=1)
+            mx = (w * x0).sum(axis=1) / sw
+            my = (w * y0).sum(axis=1) / sw
+            ex = x0 - mx[:, None]
+            b_baru = (w * ex * (y0 - my[:, None])).sum(axis=1) / (w * ex * ex).sum(axis=1)
+            a_baru = my - b_baru * mx
+            selesai = np.all(~np.isfinite(b_baru) | (
+                (np.abs(b_baru - b) <= toleransi * np.maximum(np.abs(b_baru), 1e-300)) &
+                (np.abs(a_baru - a) <= toleransi * np.maximum(np.abs(a_baru) + np.abs(pusat_y), 1e-300))))
+        a, b = a_baru, b_baru
+        if selesai:
+            break
+
+    return {"n": n, "a": pusat_y + a - b * pusat_x, "b": b, "skala": skala, "iterasi": iterasi}
+
+
+def huber(x, y, c=C_HUBER, maks_iterasi=50, toleransi=1e-10):
+    """Regresi Huber (IRLS) satu kelompok data; mengembalikan dict n, a, b, skala, iterasi"""
+    hasil = huber_batch(np.ravel(x)[None, :], np.ravel(y)[None, :], c, maks_iterasi, toleransi)
+    return {kunci: (nilai[0].item() if isinstance(nilai, np.ndarray) else nilai) for kunci, nilai in hasil.items()}
+
+
+class _Sampel:
+    """Sampel acak seragam tanpa pengembalian berukuran tetap dari aliran potongan data.
+
+    Setiap baris diberi kunci acak; yang disimpan adalah baris dengan kunci terkecil.
+    """
+
+    def __init__(self, ukuran, seed=None):
+        self.ukuran = ukuran
+        self.rng = np.random.default_rng(seed)
+        self.kunci = np.empty(0)
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+
+    def update(self, x, y):
+        kunci = np.concatenate([self.kunci, self.rng.random(x.size)])
+        x = np.concatenate([self.x, x])
+        y = np.concatenate([self.y, y])
+        if kunci.size > self.ukuran:
+            pilih = np.argpartition(kunci, self.ukuran)[:self.ukuran]
+            kunci, x, y = kunci[pilih], x[pilih], y[pilih]
+        self.kunci, self.x, self.y = kunci, x, y
+
+
+def _bersihkan(x, y):
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    valid = ~(np.isnan(x) | np.isnan(y))
+    return x[valid], y[valid]
+
+
+def theil_sen_chunk(potongan, ukuran_sampel=UKURAN_SAMPEL, seed=0):
+    """Theil–Sen dari iterable potongan (x, y) tanpa memuat seluruh data.
+
+    Median slope semua pasangan membutuhkan seluruh data sekaligus, sehingga estimasinya
+    dihitung tepat pada sampel acak seragam berukuran tetap (ukuran_sampel baris) yang
+    diambil dalam satu lintasan. Jika total data tidak melebihi ukuran_sampel, hasilnya
+    sama persis dengan theil_sen.
+    """
+    sampel = _Sampel(ukuran_sampel, seed)
+    n = 0
+    for x, y in potongan:
+        x, y = _bersihkan(x, y)
+        n += x.size
+        sampel.update(x, y)
+    hasil = theil_sen(sampel.x, sampel.y)
+    hasil["n"] = n
+    return hasil
+
+
+def huber_chunk(buat_potongan, c=C_HUBER, maks_iterasi=50, toleransi=1e-10,
+                ukuran_sampel=UKURAN_SAMPEL, seed=0):
+    """Regresi Huber (IRLS) dari potongan data; satu lintasan data per iterasi.
+
+    buat_potongan adalah fungsi tanpa argumen yang mengembalikan iterable potongan (x, y)
+    baru setiap dipanggil (misalnya lambda: data.blok("x", "y")). Jumlah berbobot
+    dihitung dari seluruh data; skala MAD diperkirakan dari sampel acak berukuran tetap.
+    """
+    # Lintasan awal: OLS, titik pusat, dan sampel untuk skala
+    akumulator = AkumulatorRegresi()
+    sampel = _Sampel(ukuran_sampel, seed)
+    for x, y in buat_potongan():
+        x, y = _bersihkan(x, y)
+        akumulator.update(x, y)
+        sampel.update(x, y)
+    pusat_x, pusat_y = akumulator.mean_x, akumulator.mean_y
+    a, b = 0.0, akumulator.b  # intercept dalam koordinat terpusat
+
+    iterasi = 0
+    skala = np.nan
+    while iterasi < maks_iterasi:
+        iterasi += 1
+        residual_sampel = (sampel.y - pusat_y) - (a + b * (sampel.x - pusat_x))
+        skala = _skala_mad(residual_sampel[None, :])
+        jumlah = np.zeros(5)  # Σw, Σwx, Σwy, Σwx², Σwxy
+        for x, y in buat_potongan():
+            x, y = _bersihkan(x, y)
+            x0, y0 = x - pusat_x, y - pusat_y
+            w = _bobot_huber((y0 - (a + b * x0))[None, :], skala, c)[0]
+            jumlah += [w.sum(), w @ x0, w @ y0, (w * x0) @ x0, (w * x0) @ y0]
+        sw, swx, swy, swxx, swxy = jumlah
+        b_baru = (swxy - swx * swy / sw) / (swxx - swx * swx / sw)
+        a_baru = swy / sw - b_baru * swx / sw
+        selesai = (abs(b_baru - b) <= toleransi * max(abs(b_baru), 1e-300) and
+                   abs(a_baru - a) <= toleransi * max(abs(a_baru) + abs(pusat_y), 1e-300))
+        a, b = a_baru, b_baru
+        if selesai:
+            break
+
+    return {"n": akumulator.n, "a": pusat_y + a - b * pusat_x, "b": b, "skala": float(skala[0]),
+            "iterasi": iterasi}
+
+
+def baris_info_robust(x, y):
+    """Baris (Parameter, Nilai) estimasi Theil–Sen dan Huber untuk sheet Info Regresi dan PDF"""
+    ts = theil_sen(x, y)
+    hb = huber(x, y)
+    return [
+        ("Intercept (a) Theil–Sen", f"{ts['a']:,.2f}"),
+        ("Slope (b) Theil–Sen", f"{ts['b']:.6f}"),
+        ("Intercept (a) Huber", f"{hb['a']:,.2f}"),
+        ("Slope (b) Huber", f"{hb['b']:.6f}"),
+    ]
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from akumulator_regresi import AkumulatorRegresi
+
+
+def _fit_langsung(x, y):
+    b, a = np.polyfit(x, y, 1)
+    return a, b, np.corrcoef(x, y)[0, 1]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_gabungan_potongan_sama_dengan_fit_langsung(seed):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(1.8e6, 1e5, 1000)
+    y = 5e6 + 0.3 * x + rng.normal(0, 1e5, x.size)
+
+    # Potongan dengan ukuran acak (termasuk potongan satu elemen), digabung dengan rumus Chan
+    batas = np.sort(rng.choice(np.arange(1, x.size), 20, replace=False))
+    bagian = [AkumulatorRegresi.dari_data(px, py) for px, py in zip(np.split(x, batas), np.split(y, batas))]
+    gabungan = AkumulatorRegresi()
+    for akumulator in bagian:
+        gabungan.merge(akumulator)
+
+    a, b, r = _fit_langsung(x, y)
+    assert gabungan.n == x.size
+    assert gabungan.a == pytest.approx(a, rel=1e-9)
+    assert gabungan.b == pytest.approx(b, rel=1e-9)
+    assert gabungan.r == pytest.approx(r, rel=1e-9)
+
+
+def test_update_bertahap_dan_operator_tambah():
+    rng = np.random.default_rng(3)
+    x = rng.uniform(0, 100, 50)
+    y = 2.0 - 0.5 * x + rng.normal(0, 1, x.size)
+
+    bertahap = AkumulatorRegresi()
+    for xi, yi in zip(x, y):
+        bertahap.update(xi, yi)
+    jumlah = AkumulatorRegresi.dari_data(x[:20], y[:20]) + AkumulatorRegresi.dari_data(x[20:], y[20:])
+
+    a, b, r = _fit_langsung(x, y)
+    for akumulator in (bertahap, jumlah):
+        assert akumulator.a == pytest.approx(a, rel=1e-9)
+        assert akumulator.b == pytest.approx(b, rel=1e-9)
+        assert akumulator.r_squared == pytest.approx(r * r, rel=1e-9)
+
+
+def test_gabung_dengan_akumulator_kosong():
+    akumulator = AkumulatorRegresi.dari_data([1.0, 2.0, 3.0], [2.0, 4.0, 7.0])
+    assert (AkumulatorRegresi() + akumulator).b == pytest.approx(akumulator.b)
+    assert (akumulator + AkumulatorRegresi()).a == pytest.approx(akumulator.a)
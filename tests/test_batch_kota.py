@@ -0,0 +1,60 @@
+import os
+
+import pandas as pd
+
+from batch_kota import BatchKota, SELESAI
+
+KOTA = ["Tangerang", "Serang", "Tangerang Selatan"]
+TAHUN = ["2020", "2021", "2022", "2023", "2024"]
+WILAYAH_BPS = ["Kab. Tangerang", "Kab. Serang", "Kota Tangerang", "Kota Tangerang Selatan", "Kota Serang"]
+
+
+def _tulis_workbook(path, lembar):
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for sheet, df in lembar.items():
+            df.to_excel(writer, index=False, sheet_name=sheet)
+
+
+def _tulis_penduduk(path, dasar):
+    _tulis_workbook(path, {tahun: pd.DataFrame({"Kecamatan": ["A", "B"],
+                                                "Jumlah Penduduk": [dasar + 1_000 * i, dasar // 2 + 700 * i * i]})
+                           for i, tahun in enumerate(TAHUN)})
+
+
+def _siapkan_sumber(direktori):
+    os.makedirs(direktori)
+    for j, kota in enumerate(KOTA):
+        _tulis_penduduk(os.path.join(direktori, f"Data Penduduk - Kota {kota}.xlsx"), 200_000 * (j + 1))
+    _tulis_workbook(os.path.join(direktori, "Data BPS.xlsx"),
+                    {tahun: pd.DataFrame({"Kabupaten/Kota": WILAYAH_BPS,
+                                          "Jumlah": [2_000 + 100 * j + 37 * i * i for j in range(len(WILAYAH_BPS))]})
+                     for i, tahun in enumerate(TAHUN)})
+
+
+def _batch(sumber, hasil):
+    return BatchKota(KOTA, os.path.join(sumber, "Data Penduduk - Kota {kota}.xlsx"),
+                     os.path.join(sumber, "Data BPS.xlsx"), hasil, TAHUN)
+
+
+def test_batch_dilanjutkan_melewati_kota_yang_sudah_selesai(tmp_path, monkeypatch):
+    # Cache Excel ditulis relatif terhadap direktori kerja
+    monkeypatch.chdir(tmp_path)
+    sumber, hasil = str(tmp_path / "sumber"), str(tmp_path / "hasil")
+    _siapkan_sumber(sumber)
+
+    status = _batch(sumber, hasil).jalankan(max_workers=1)
+    assert {kota: catatan["status"] for kota, catatan in status.items()} == dict.fromkeys(KOTA, SELESAI)
+
+    # Run kedua (instance baru, status dari berkas): semua kota mutakhir dan tidak ditulis ulang
+    batch = _batch(sumber, hasil)
+    tersimpan = batch.muat_status()
+    assert all(batch.mutakhir(t, tersimpan) for t in batch.tugas)
+    waktu = {path: os.path.getmtime(path) for t in batch.tugas for path in t.keluaran}
+    assert batch.jalankan(max_workers=1) == tersimpan
+    assert {path: os.path.getmtime(path) for path in waktu} == waktu
+
+    # Sumber satu kota berubah: hanya kota itu yang basi
+    _tulis_penduduk(os.path.join(sumber, "Data Penduduk - Kota Serang.xlsx"), 123_456)
+    batch = _batch(sumber, hasil)
+    basi = [t.kota for t in batch.tugas if not batch.mutakhir(t, batch.muat_status())]
+    assert basi == ["Serang"]
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from bootstrap import HasilBootstrap, _blok_bootstrap, bootstrap_regresi
+
+
+def _data(seed, n=200):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(1.8e6, 1e5, n)
+    return x, 5e6 + 0.3 * x + rng.normal(0, 2e4, n)
+
+
+def test_blok_vektor_sama_dengan_fit_per_resample():
+    x, y = _data(0, n=30)
+    a, b = _blok_bootstrap(x, y, 50, np.random.SeedSequence(7))
+
+    # Matriks indeks yang sama dibangkitkan ulang, lalu setiap resample di-fit satu per satu
+    indeks = np.random.default_rng(np.random.SeedSequence(7)).integers(0, x.size, size=(50, x.size))
+    for i, baris in enumerate(indeks):
+        b_langsung, a_langsung = np.polyfit(x[baris], y[baris], 1)
+        assert a[i] == pytest.approx(a_langsung, rel=1e-9)
+        assert b[i] == pytest.approx(b_langsung, rel=1e-9)
+
+
+def test_ukuran_blok_tidak_mengubah_jumlah_dan_seed_dapat_diulang():
+    x, y = _data(1, n=40)
+    satu_blok = bootstrap_regresi(x, y, n_resample=500, seed=3)
+    banyak_blok = bootstrap_regresi(x, y, n_resample=500, seed=3, max_elemen_blok=40 * 64)
+
+    assert satu_blok.n_resample == banyak_blok.n_resample == 500
+    ulang = bootstrap_regresi(x, y, n_resample=500, seed=3, max_elemen_blok=40 * 64)
+    np.testing.assert_array_equal(banyak_blok.sampel_b, ulang.sampel_b)
+
+
+def test_standard_error_mendekati_ols():
+    x, y = _data(2)
+    hasil = bootstrap_regresi(x, y, n_resample=2000, seed=0)
+
+    b, a = np.polyfit(x, y, 1)
+    residual = y - (a + b * x)
+    se_b = np.sqrt(residual @ residual / (x.size - 2) / ((x - x.mean()) @ (x - x.mean())))
+    assert hasil.se_b == pytest.approx(se_b, rel=0.15)
+    assert hasil.ci_b[0] < b < hasil.ci_b[1]
+    assert hasil.ci_a[0] < a < hasil.ci_a[1]
+
+
+def test_resample_x_konstan_dibuang_dan_p_value():
+    sampel_b = np.array([0.5, np.nan, 0.2, 0.1])
+    hasil = HasilBootstrap(np.array([1.0, np.nan, 2.0, 3.0]), sampel_b, 0.95)
+
+    assert hasil.n_resample == 3
+    # Tidak ada resample di sisi lain nol: p = 2 * 1 / (B + 1)
+    assert hasil.p_value_b == pytest.approx(2 / 4)
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from ekspor_xlsx import simpan_xlsx
+
+
+def test_sel_angka_dan_format_terbaca_ulang_openpyxl(tmp_path):
+    df = pd.DataFrame({
+        "Tahun": pd.Series([2020, 2021, 2022, "Jumlah"], dtype=object),
+        "X": [1_742_604, 1_771_092, np.nan, 5_348_658],
+        "XY": [9.675e12, 1.0097e13, 1.2345678901234e13, 3.0e13],
+        "Keterangan": ["a < b", "x & y", "", None],
+    })
+    path = tmp_path / "hasil.xlsx"
+    simpan_xlsx(str(path), [("Tabel", df, {"X": "#,##0", "XY": "#,##0.00"}),
+                            ("Kedua", df[["X"]], {"X": "0.0"})], baris_per_blok=3)
+
+    wb = load_workbook(path)
+    assert wb.sheetnames == ["Tabel", "Kedua"]
+    ws = wb["Tabel"]
+    assert [sel.value for sel in ws[1]] == list(df.columns)
+    assert all(sel.font.b for sel in ws[1])
+
+    for i, baris in enumerate(ws.iter_rows(min_row=2), start=0):
+        tahun, x, xy, keterangan = baris
+        # Angka tetap sel angka (bukan teks), termasuk di kolom campuran
+        assert tahun.value == df["Tahun"][i]
+        assert tahun.data_type == ("n" if i < 3 else "s")
+        if np.isnan(df["X"][i]):
+            assert x.value is None
+        else:
+            assert x.data_type == "n" and x.value == df["X"][i]
+            assert x.number_format == "#,##0"
+        assert xy.data_type == "n" and xy.value == df["XY"][i]
+        assert xy.number_format == "#,##0.00"
+        assert keterangan.value == (None if pd.isna(df["Keterangan"][i]) else df["Keterangan"][i])
+    assert ws.max_row == len(df) + 1
+
+    # Format per sheet: kolom sama di sheet lain memakai formatnya sendiri
+    kedua = wb["Kedua"]
+    assert kedua["A2"].value == df["X"][0] and kedua["A2"].number_format == "0.0"
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kolom_memmap import DataKolom, regresi_memmap, residual_memmap, tulis_kolom
+
+
+def _data_cleansing(seed, n=1000):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(1.8e6, 1e5, n)
+    df = pd.DataFrame({
+        "Tahun": 2000 + np.arange(n) % 25,
+        "Jumlah Penduduk (X)": x,
+        "Jumlah Angkatan Kerja (Y)": 5e6 + 0.3 * x + rng.normal(0, 2e4, n),
+    })
+    df.iloc[[3, n // 2], 1] = np.nan    # dibuang seperti dropna pada cleansing
+    return df
+
+
+@pytest.mark.parametrize("ukuran_blok", [1, 7, 128, 10_000])
+def test_regresi_per_blok_sama_dengan_fit_langsung(tmp_path, ukuran_blok):
+    df = _data_cleansing(0)
+    tulis_kolom(df, str(tmp_path), ukuran_potongan=97)
+    data = DataKolom(str(tmp_path))
+    bersih = df.dropna()
+    x, y = bersih["Jumlah Penduduk (X)"].to_numpy(), bersih["Jumlah Angkatan Kerja (Y)"].to_numpy()
+
+    assert len(data) == len(bersih)
+    np.testing.assert_array_equal(data.kolom("tahun"), bersih["Tahun"].to_numpy())
+    np.testing.assert_array_equal(data.kolom("x", 10, 20), x[10:20])
+
+    akumulator = regresi_memmap(data, ukuran_blok=ukuran_blok)
+    b, a = np.polyfit(x, y, 1)
+    assert akumulator.n == len(bersih)
+    assert akumulator.a == pytest.approx(a, rel=1e-9)
+    assert akumulator.b == pytest.approx(b, rel=1e-9)
+    assert akumulator.r == pytest.approx(np.corrcoef(x, y)[0, 1], rel=1e-9)
+
+
+def test_residual_dan_kolom_tambahan_dari_csv(tmp_path):
+    df = _data_cleansing(1)
+    sumber = tmp_path / "cleansing.csv"
+    df.to_csv(sumber, index=False)
+    data = tulis_kolom(str(sumber), str(tmp_path / "kolom"), ukuran_potongan=64)
+    bersih = df.dropna()
+    x, y = bersih["Jumlah Penduduk (X)"].to_numpy(), bersih["Jumlah Angkatan Kerja (Y)"].to_numpy()
+
+    statistik = residual_memmap(data, 4e6, 0.9, ukuran_blok=33, simpan=True)
+
+    selisih = y - (4e6 + 0.9 * x)
+    assert statistik["n"] == len(bersih)
+    assert statistik["rmse"] == pytest.approx(np.sqrt(np.mean(selisih ** 2)), rel=1e-12)
+    assert statistik["mae"] == pytest.approx(np.mean(np.abs(selisih)), rel=1e-12)
+    assert statistik["mape"] == pytest.approx(np.mean(np.abs(selisih) / y) * 100, rel=1e-12)
+    assert statistik["maks_abs"] == pytest.approx(np.abs(selisih).max())
+    # Kolom residual tercatat di meta dan terbaca ulang dari disk
+    np.testing.assert_allclose(DataKolom(data.direktori).kolom("residual"), selisih, rtol=1e-12)
+
+
+def test_kolom_tambahan_dengan_panjang_salah_ditolak(tmp_path):
+    data = tulis_kolom(_data_cleansing(2, n=50), str(tmp_path))
+    with pytest.raises(ValueError):
+        data.tambah_kolom("salah", [np.zeros(3)])
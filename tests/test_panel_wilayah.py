@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from panel_wilayah import PanelWilayahTahun
+
+PENDUDUK, ANGKATAN_KERJA = "Jumlah Penduduk", "Jumlah Angkatan Kerja"
+
+
+def _panel():
+    panel = PanelWilayahTahun([PENDUDUK, ANGKATAN_KERJA])
+    wilayah = ["Kota Tangerang", "Kota Serang"]
+    for i, tahun in enumerate([2020, 2021, 2023]):
+        panel.isi(PENDUDUK, wilayah, tahun, np.array([1_800_000, 700_000]) + 10_000 * i)
+        panel.isi(ANGKATAN_KERJA, wilayah, tahun, np.array([900_000, 300_000]) + 5_000 * i)
+    return panel
+
+
+def test_tambah_tahun_dan_tahun_hilang():
+    panel = _panel()
+    panel.tambah_tahun(2024, {PENDUDUK: {"Kota Tangerang": 1_850_000, "Kota Cilegon": 400_000}})
+
+    np.testing.assert_array_equal(panel.tahun, np.arange(2020, 2025))
+    assert list(panel.wilayah) == ["Kota Tangerang", "Kota Serang", "Kota Cilegon"]
+    assert panel.nilai(PENDUDUK, "Kota Tangerang", 2024) == 1_850_000
+    assert np.isnan(panel.nilai(ANGKATAN_KERJA, "Kota Tangerang", 2024))
+    np.testing.assert_array_equal(panel.tahun_hilang("Kota Tangerang", range(2020, 2025)), [2022, 2024])
+    np.testing.assert_array_equal(panel.tahun_hilang("Kota Bogor", [2020]), [2020])
+
+
+def test_imputasi_linier_sama_dengan_interpolasi():
+    panel = _panel()
+    awal = panel.matriks(PENDUDUK).copy()
+
+    diisi = panel.imputasi(metode="linier")
+
+    assert diisi[:, panel.tahun == 2022].all() and diisi.sum() == 2
+    for baris in range(len(panel.wilayah)):
+        valid = ~np.isnan(awal[baris])
+        harapan = np.round(np.interp(panel.tahun, panel.tahun[valid], awal[baris, valid]))
+        np.testing.assert_array_equal(panel.matriks(PENDUDUK)[baris], harapan)
+
+
+def test_imputasi_ffill_tidak_mengisi_awal_deret():
+    panel = _panel()
+    panel.perluas_tahun(2018, 2018)
+    panel.imputasi(PENDUDUK, metode="ffill")
+
+    assert np.isnan(panel.nilai(PENDUDUK, "Kota Serang", 2018))
+    assert panel.nilai(PENDUDUK, "Kota Serang", 2022) == panel.nilai(PENDUDUK, "Kota Serang", 2021)
+    with pytest.raises(ValueError):
+        panel.imputasi(metode="spline")
+
+
+def test_simpan_dan_muat_bolak_balik(tmp_path):
+    panel = _panel()
+    panel.imputasi()
+    path = tmp_path / "panel.npz"
+    panel.simpan(path)
+
+    dimuat = PanelWilayahTahun.muat(path)
+
+    assert dimuat.variabel == panel.variabel
+    assert list(dimuat.wilayah) == list(panel.wilayah)
+    np.testing.assert_array_equal(dimuat.tahun, panel.tahun)
+    for variabel in panel.variabel:
+        np.testing.assert_array_equal(dimuat.matriks(variabel), panel.matriks(variabel))
+    tahun, x, y = dimuat.pasangan("Kota Tangerang", PENDUDUK, ANGKATAN_KERJA)
+    assert x.dtype == np.int64 and y.dtype == np.int64
+    pd.testing.assert_frame_equal(dimuat.regresi(PENDUDUK, ANGKATAN_KERJA), panel.regresi(PENDUDUK, ANGKATAN_KERJA))
+
+    # Panel yang dimuat tetap dapat ditambah tahun baru
+    dimuat.tambah_tahun(2024, {PENDUDUK: {"Kota Serang": 760_000}})
+    assert dimuat.nilai(PENDUDUK, "Kota Serang", 2024) == 760_000
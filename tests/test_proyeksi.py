@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from proyeksi import kuantil_normal, kuantil_t
+
+# Tabel t Student (kuantil atas) untuk beberapa p dan derajat bebas, 6 digit
+TABEL_T = [
+    (0.975, 1, 12.706205), (0.975, 2, 4.302653), (0.975, 3, 3.182446), (0.975, 4, 2.776445),
+    (0.975, 5, 2.570582), (0.975, 10, 2.228139), (0.975, 30, 2.042272), (0.975, 100, 1.983972),
+    (0.995, 1, 63.656741), (0.995, 3, 5.840909), (0.995, 10, 3.169273),
+    (0.95, 5, 2.015048), (0.95, 20, 1.724718), (0.9, 8, 1.396815),
+]
+
+
+@pytest.mark.parametrize("p, df, t", TABEL_T)
+def test_kuantil_t_sama_dengan_tabel(p, df, t):
+    assert float(kuantil_t(p, df)) == pytest.approx(t, rel=1e-5)
+
+
+def test_kuantil_t_vektor_dan_mendekati_normal():
+    p, df, t = map(np.array, zip(*TABEL_T))
+    np.testing.assert_allclose(kuantil_t(p, df), t, rtol=1e-5)
+    # df < 1 tidak terdefinisi; df sangat besar mendekati kuantil normal
+    assert np.isnan(kuantil_t(0.975, 0))
+    assert float(kuantil_t(0.975, 1e6)) == pytest.approx(float(kuantil_normal(0.975)), rel=1e-5)
+
+
+@pytest.mark.parametrize("p, z", [(0.9, 1.281552), (0.975, 1.959964), (0.995, 2.575829)])
+def test_kuantil_normal_sama_dengan_tabel(p, z):
+    assert float(kuantil_normal(p)) == pytest.approx(z, rel=1e-6)
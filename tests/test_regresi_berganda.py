@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from regresi_berganda import AkumulatorBerganda, regresi_berganda, regresi_berganda_batch, regresi_berganda_chunk
+
+
+def _lstsq(X, y, ridge=0.0):
+    """Fit langsung dengan np.linalg.lstsq; ridge lewat baris augmentasi tanpa penalti intercept"""
+    Z = np.column_stack([np.ones(len(y)), X])
+    if ridge:
+        # Kolom terpusat (intercept tidak dipenalti), intercept dipulihkan dari rata-rata
+        A = np.vstack([X - X.mean(axis=0), np.sqrt(ridge) * np.eye(X.shape[1])])
+        slope = np.linalg.lstsq(A, np.concatenate([y - y.mean(), np.zeros(X.shape[1])]), rcond=None)[0]
+        koefisien = np.concatenate([[y.mean() - X.mean(axis=0) @ slope], slope])
+    else:
+        koefisien = np.linalg.lstsq(Z, y, rcond=None)[0]
+    residual = y - Z @ koefisien
+    rss = residual @ residual
+    se = np.sqrt(np.diag(rss / (len(y) - Z.shape[1]) * np.linalg.inv(Z.T @ Z)))
+    return koefisien, se, 1.0 - rss / ((y - y.mean()) @ (y - y.mean()))
+
+
+def _data(seed, n=200, k=3):
+    rng = np.random.default_rng(seed)
+    X = rng.normal([1.8e6, 5e4, 12.0][:k], [1e5, 5e3, 2.0][:k], (n, k))
+    y = 5e5 + X @ np.array([0.3, -2.0, 1e4][:k]) + rng.normal(0, 1e4, n)
+    return X, y
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_qr_dan_cholesky_potongan_sama_dengan_lstsq(seed):
+    X, y = _data(seed)
+    koefisien, se, r_squared = _lstsq(X, y)
+
+    qr = regresi_berganda(X, y)
+    potongan = [(X[i:i + 37], y[i:i + 37]) for i in range(0, len(y), 37)]
+    cholesky = regresi_berganda_chunk(potongan, k=3)
+    for hasil in (qr, cholesky):
+        np.testing.assert_allclose(hasil.koefisien, koefisien, rtol=1e-7)
+        np.testing.assert_allclose(hasil.standard_error, se, rtol=1e-6)
+        assert hasil.r_squared == pytest.approx(r_squared, rel=1e-9)
+
+
+def test_merge_akumulator_dengan_titik_geser_berbeda():
+    X, y = _data(2)
+    kiri, kanan = AkumulatorBerganda(3).update(X[:50], y[:50]), AkumulatorBerganda(3).update(X[50:], y[50:])
+    np.testing.assert_allclose(kiri.merge(kanan).selesaikan().koefisien, _lstsq(X, y)[0], rtol=1e-7)
+
+
+def test_ridge_sama_dengan_lstsq_augmentasi():
+    X, y = _data(3)
+    ridge = 1e9
+    koefisien = _lstsq(X, y, ridge)[0]
+    np.testing.assert_allclose(regresi_berganda(X, y, ridge).koefisien, koefisien, rtol=1e-7)
+    np.testing.assert_allclose(regresi_berganda_chunk([(X, y)], 3, ridge).koefisien, koefisien, rtol=1e-7)
+
+
+def test_batch_cholesky_bertumpuk_sama_dengan_lstsq_per_grup():
+    rng = np.random.default_rng(4)
+    g, n, k = 6, 12, 2
+    X = rng.normal(100.0, 10.0, (g, n, k))
+    Y = 3.0 + X @ np.array([0.5, -1.5]) + rng.normal(0, 2.0, (g, n))
+    Y[1, [2, 7]] = np.nan           # observasi hilang diabaikan per grup
+    X[2, 5, 1] = np.nan
+    Y[3, 3:] = np.nan               # data kurang (n <= p): NaN
+
+    hasil = regresi_berganda_batch(X, Y)
+
+    for i in range(g):
+        valid = ~(np.isnan(Y[i]) | np.isnan(X[i]).any(axis=1))
+        assert hasil["n"][i] == valid.sum()
+        if valid.sum() <= k + 1:
+            assert np.isnan(hasil["koefisien"][i]).all()
+            continue
+        koefisien, se, r_squared = _lstsq(X[i][valid], Y[i][valid])
+        np.testing.assert_allclose(hasil["koefisien"][i], koefisien, rtol=1e-8)
+        np.testing.assert_allclose(hasil["standard_error"][i], se, rtol=1e-6)
+        assert hasil["r_squared"][i] == pytest.approx(r_squared, rel=1e-9)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from regresi_bergulir import regresi_bergulir, regresi_bergulir_per_wilayah
+
+
+def _fit_jendela(x, y, akhir, jendela, min_observasi):
+    """Fit ulang langsung pada jendela yang berakhir di periode akhir (inklusif)"""
+    mulai = 0 if jendela is None else max(0, akhir + 1 - jendela)
+    xs, ys = x[mulai:akhir + 1], y[mulai:akhir + 1]
+    valid = ~(np.isnan(xs) | np.isnan(ys))
+    xs, ys = xs[valid], ys[valid]
+    if xs.size < max(2, min_observasi):
+        return xs.size, np.nan, np.nan, np.nan
+    b, a = np.polyfit(xs, ys, 1)
+    with np.errstate(invalid="ignore"):
+        return xs.size, a, b, np.corrcoef(xs, ys)[0, 1]
+
+
+@pytest.mark.parametrize("jendela", [None, 2, 5, 12])
+def test_sama_dengan_fit_ulang_per_jendela(jendela):
+    rng = np.random.default_rng(0)
+    wilayah, periode = 4, 30
+    X = rng.normal(1.8e6, 1e5, (wilayah, periode)) + np.arange(periode) * 2e4
+    Y = 5e6 + 0.3 * X + rng.normal(0, 2e4, X.shape)
+    X[1, [4, 5, 17]] = np.nan       # periode hilang tidak dihitung dalam jendela
+    Y[2, 10] = np.nan
+    Y[3, :] = 7e5                   # Y konstan: slope 0, r tidak terdefinisi
+
+    hasil = regresi_bergulir(X, Y, jendela)
+
+    for i in range(wilayah):
+        for t in range(periode):
+            n, a, b, r = _fit_jendela(X[i], Y[i], t, jendela, 3)
+            assert hasil["n"][i, t] == n
+            if np.isnan(b):
+                assert np.isnan(hasil["b"][i, t])
+                continue
+            assert hasil["b"][i, t] == pytest.approx(b, rel=1e-6, abs=1e-12)
+            assert hasil["a"][i, t] == pytest.approx(a, rel=1e-9)
+            assert hasil["r"][i, t] == pytest.approx(r, rel=1e-6, nan_ok=True)
+
+
+def test_satu_dimensi_dan_jendela_terlalu_kecil():
+    x = np.arange(10, dtype=float)
+    hasil = regresi_bergulir(x, 2.0 + 3.0 * x, jendela=4)
+    assert hasil["b"].shape == (10,)
+    assert np.isnan(hasil["b"][:2]).all()
+    np.testing.assert_allclose(hasil["b"][2:], 3.0)
+    with pytest.raises(ValueError):
+        regresi_bergulir(x, x, jendela=1)
+
+
+def test_per_wilayah_mengisi_tahun_bolong():
+    tahun = [2015, 2016, 2018, 2019, 2020]
+    df_x = pd.DataFrame({"Wilayah": "Kota Tangerang", "Tahun": tahun, "Jumlah Penduduk": [10.0, 12, 15, 17, 20]})
+    df_y = pd.DataFrame({"Wilayah": "Kota Tangerang", "Tahun": tahun, "Jumlah Angkatan Kerja": [5.0, 6, 8, 8, 11]})
+
+    df = regresi_bergulir_per_wilayah(df_x, df_y, jendela=3)
+
+    assert df["Tahun"].tolist() == list(range(2015, 2021))
+    # Jendela 2016-2018 hanya berisi dua tahun berdata: kurang dari min_observasi
+    assert df.set_index("Tahun").loc[2018, "n"] == 2
+    b, a = np.polyfit([15, 17, 20], [8, 8, 11], 1)
+    assert df.set_index("Tahun").loc[2020, "Slope (b)"] == pytest.approx(b)
@@ -0,0 +1,41 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from regresi_robust import theil_sen, theil_sen_batch
+
+
+def _theil_sen_kuadratik(x, y):
+    """Theil–Sen langsung: median slope semua pasangan (O(n²)), a = median(y - b·x)"""
+    slope = [(y[j] - y[i]) / (x[j] - x[i]) for i, j in combinations(range(x.size), 2) if x[j] != x[i]]
+    b = np.median(slope)
+    return np.median(y - b * x), b
+
+
+@pytest.mark.parametrize("n", [3, 4, 10, 51, 200])
+def test_theil_sen_sama_dengan_versi_kuadratik(n):
+    rng = np.random.default_rng(n)
+    x = rng.normal(0, 1, n)
+    y = 0.7 * x + rng.standard_t(2, n)
+
+    a, b = _theil_sen_kuadratik(x, y)
+    hasil = theil_sen(x, y)
+    assert hasil["b"] == pytest.approx(b, rel=1e-12)
+    assert hasil["a"] == pytest.approx(a, rel=1e-12, abs=1e-12)
+
+
+def test_theil_sen_batch_per_baris_dengan_nan():
+    rng = np.random.default_rng(7)
+    X = rng.normal(0, 1, (5, 30))
+    Y = 2.0 * X + rng.normal(0, 1, X.shape)
+    X[0, :4] = np.nan
+    Y[3, 10] = np.nan
+
+    hasil = theil_sen_batch(X, Y)
+    for g in range(X.shape[0]):
+        valid = ~(np.isnan(X[g]) | np.isnan(Y[g]))
+        a, b = _theil_sen_kuadratik(X[g, valid], Y[g, valid])
+        assert hasil["n"][g] == valid.sum()
+        assert hasil["b"][g] == pytest.approx(b, rel=1e-12)
+        assert hasil["a"][g] == pytest.approx(a, rel=1e-12, abs=1e-12)
@@ -0,0 +1,50 @@
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from uji_permutasi import uji_permutasi, uji_permutasi_batch
+
+
+def _p_value_enumerasi(x, y):
+    """p-value dua sisi dengan mencoba setiap permutasi y lewat itertools"""
+    xc = x - x.mean()
+    yc = y - y.mean()
+    ambang = abs(xc @ yc) * (1.0 - 1e-10)
+    semua = list(permutations(range(x.size)))
+    return sum(abs(xc @ yc[list(p)]) >= ambang for p in semua) / len(semua)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_eksak_sama_dengan_enumerasi_itertools(seed):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(0, 1, 6)
+    y = 0.5 * x + rng.normal(0, 1, 6)
+
+    hasil = uji_permutasi(x, y)
+    assert hasil.eksak
+    assert hasil.n_permutasi == 720
+    assert hasil.p_value[0] == pytest.approx(_p_value_enumerasi(x, y))
+
+
+def test_eksak_banyak_wilayah_dengan_jalur_one_hot():
+    # Wilayah ≥ n memakai perkalian matriks one-hot; blok kecil memaksa banyak blok
+    rng = np.random.default_rng(4)
+    X = rng.normal(0, 1, (7, 5))
+    Y = X * rng.uniform(-1, 1, (7, 1)) + rng.normal(0, 1, X.shape)
+    X[2] = [1, 2, 3, 4, 5]
+    Y[2] = [2, 4, 6, 8, 10]
+
+    hasil = uji_permutasi_batch(X, Y, max_elemen_blok=200)
+    np.testing.assert_allclose(hasil.p_value, [_p_value_enumerasi(x, y) for x, y in zip(X, Y)])
+
+
+def test_monte_carlo_tidak_bergantung_ukuran_blok():
+    rng = np.random.default_rng(5)
+    X = rng.normal(0, 1, (20, 12))
+    Y = 0.2 * X + rng.normal(0, 1, X.shape)
+
+    acuan = uji_permutasi_batch(X, Y, n_permutasi=3000, seed=11)
+    for max_elemen_blok in (100, 5000, 60_000):
+        hasil = uji_permutasi_batch(X, Y, n_permutasi=3000, seed=11, max_elemen_blok=max_elemen_blok)
+        np.testing.assert_array_equal(hasil.jumlah_ekstrem, acuan.jumlah_ekstrem)
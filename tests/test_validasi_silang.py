@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from validasi_silang import diagnostik_pengaruh, validasi_loo
+
+
+def _residual_loo_refit(x, y):
+    """Residual leave-one-out dengan fit ulang tanpa setiap observasi (O(n²))"""
+    residual = np.empty(x.size)
+    for i in range(x.size):
+        sisa = np.arange(x.size) != i
+        b, a = np.polyfit(x[sisa], y[sisa], 1)
+        residual[i] = y[i] - (a + b * x[i])
+    return residual
+
+
+def test_residual_loo_tertutup_sama_dengan_fit_ulang():
+    rng = np.random.default_rng(0)
+    x = rng.normal(1.8e6, 1e5, 12)
+    y = 5e6 + 0.3 * x + rng.normal(0, 1e5, x.size)
+
+    residual = _residual_loo_refit(x, y)
+    np.testing.assert_allclose(diagnostik_pengaruh(x, y)["residual_loo"], residual, rtol=1e-7)
+
+    hasil = validasi_loo(x, y)
+    press = residual @ residual
+    assert hasil["press"][0] == pytest.approx(press, rel=1e-7)
+    assert hasil["q_squared"][0] == pytest.approx(1 - press / np.sum((y - y.mean()) ** 2), rel=1e-7)
+
+
+def test_banyak_grup_dengan_nan():
+    rng = np.random.default_rng(1)
+    X = rng.uniform(0, 10, (4, 8))
+    Y = 1.0 + 2.0 * X + rng.normal(0, 1, X.shape)
+    X[1, 3] = np.nan
+    Y[2, [0, 5]] = np.nan
+
+    hasil = validasi_loo(X, Y)
+    for g in range(X.shape[0]):
+        valid = ~(np.isnan(X[g]) | np.isnan(Y[g]))
+        residual = _residual_loo_refit(X[g, valid], Y[g, valid])
+        assert hasil["n"][g] == valid.sum()
+        assert hasil["press"][g] == pytest.approx(residual @ residual, rel=1e-9)
@@ -0,0 +1,170 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import permutations
+
+import numpy as np
+
+# Sampai n ini semua n! permutasi dihitung (9! = 362.880); di atasnya Monte Carlo
+BATAS_EKSAK = 9
+
+# Batas elemen matriks Y terpermutasi per blok (≈16 MB float64) agar memori tetap terbatas
+MAX_ELEMEN_BLOK = 2_000_000
+
+# Di atas jumlah elemen total ini blok-blok dibagi ke process pool
+AMBANG_PARALEL = 20_000_000
+
+# Permutasi Monte Carlo dibangkitkan per potongan tetap dengan seed turunan per potongan,
+# sehingga hasil untuk seed yang sama tidak bergantung pada ukuran blok atau jumlah worker
+UKURAN_POTONGAN_ACAK = 1024
+
+
+_data_worker = {}
+
+
+def _inisialisasi_worker(xc, yc, ambang, semua_permutasi):
+    # Data terpusat (dan tabel permutasi eksak) dikirim sekali per proses, bukan sekali per blok
+    _data_worker.update(xc=xc, yc=yc, ambang=ambang, semua_permutasi=semua_permutasi)
+
+
+def _blok_worker(wilayah, permutasi):
+    d = _data_worker
+    return _hitung_blok(d["xc"][wilayah], d["yc"][wilayah], d["ambang"][wilayah],
+                        _indeks_permutasi(permutasi, d["semua_permutasi"], d["xc"].shape[1]))
+
+
+def _indeks_permutasi(permutasi, semua_permutasi, n):
+    """Matriks indeks (blok × n): irisan tabel permutasi eksak atau (awal, jumlah, entropi) Monte Carlo.
+
+    Permutasi acak ke-i selalu berasal dari potongan i // UKURAN_POTONGAN_ACAK, yang seed-nya
+    adalah turunan ke-k dari SeedSequence(entropi), apa pun batas bloknya.
+    """
+    if isinstance(permutasi, slice):
+        return semua_permutasi[permutasi]
+    awal, jumlah, entropi = permutasi
+    pertama = awal // UKURAN_POTONGAN_ACAK
+    terakhir = (awal + jumlah - 1) // UKURAN_POTONGAN_ACAK
+    potongan = []
+    for k in range(pertama, terakhir + 1):
+        rng = np.random.default_rng(np.random.SeedSequence(entropi, spawn_key=(k,)))
+        potongan.append(rng.permuted(np.tile(np.arange(n), (UKURAN_POTONGAN_ACAK, 1)), axis=1))
+    geser = awal - pertama * UKURAN_POTONGAN_ACAK
+    return np.concatenate(potongan)[geser:geser + jumlah]
+
+
+def _hitung_blok(xc, yc, ambang, indeks):
+    """Jumlah permutasi per wilayah dengan |Σ x·y_perm| ≥ |Σ x·y| sebagai satu perkalian matriks"""
+    jumlah, n = indeks.shape
+    if len(xc) >= n:
+        # Banyak wilayah: permutasi sebagai matriks one-hot (blok × n²) dan hasil kali luar x⊗y
+        # per wilayah (wilayah × n²), sehingga statistik semua wilayah adalah satu GEMM
+        one_hot = np.zeros((jumlah, n * n))
+        one_hot[np.arange(jumlah)[:, None], np.arange(n) * n + indeks] = 1.0
+        s = (xc[:, :, None] * yc[:, None, :]).reshape(len(xc), n * n) @ one_hot.T
+    else:
+        s = np.matmul(yc[:, indeks], xc[:, :, None])[..., 0]  # (wilayah, blok)
+    return np.count_nonzero(np.abs(s) >= ambang[:, None], axis=1)
+
+
+class HasilPermutasi:
+    """Hasil uji permutasi H0: tidak ada hubungan linier antara X dan Y (r = 0, b = 0)"""
+
+    def __init__(self, r, b, jumlah_ekstrem, n_permutasi, eksak):
+        self.r = r
+        self.b = b
+        self.jumlah_ekstrem = jumlah_ekstrem
+        self.n_permutasi = n_permutasi
+        self.eksak = eksak
+
+    @property
+    def p_value(self):
+        """p-value dua sisi; sama untuk r dan b karena keduanya = Σ(x-x̄)(y-ȳ) dibagi konstanta
+        yang tidak berubah oleh permutasi Y"""
+        if self.eksak:
+            return self.jumlah_ekstrem / self.n_permutasi
+        return (self.jumlah_ekstrem + 1) / (self.n_permutasi + 1)
+
+    def baris_info(self):
+        """Baris (Parameter, Nilai) untuk sheet Info Regresi dan PDF (satu wilayah)"""
+        keterangan = f"{'eksak' if self.eksak else 'Monte Carlo'}, {self.n_permutasi:,} permutasi"
+        p_value = float(np.ravel(self.p_value)[0])
+        return [
+            ("p-value Korelasi (r) - permutasi", f"{p_value:.4f} ({keterangan})"),
+            ("p-value Slope (b) - permutasi", f"{p_value:.4f} ({keterangan})"),
+        ]
+
+
+def uji_permutasi_batch(X, Y, n_permutasi=10000, seed=None, eksak=None, max_workers=None,
+                        max_elemen_blok=MAX_ELEMEN_BLOK):
+    """Uji permutasi r dan b untuk banyak wilayah sekaligus (X, Y berukuran wilayah × n, tanpa NaN).
+
+    X dan Y dipusatkan sekali; statistik setiap permutasi adalah Σ x_c·y_c[perm], dihitung
+    per blok sebagai perkalian matriks (x⊗y per wilayah @ permutasi one-hot, atau y
+    terpermutasi @ x untuk sedikit wilayah). Untuk n ≤ BATAS_EKSAK (atau eksak=True) semua
+    n! permutasi dienumerasi; selain itu n_permutasi permutasi acak (permutasi yang sama
+    dipakai semua wilayah). Blok dibagi per wilayah dan per permutasi, dan untuk data besar
+    dibagi ke process pool.
+    """
+    X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    if X.shape != Y.shape:
+        raise ValueError(f"Ukuran X {X.shape} dan Y {Y.shape} tidak sama")
+    if np.isnan(X).any() or np.isnan(Y).any():
+        raise ValueError("Uji permutasi membutuhkan data lengkap (tanpa NaN) untuk setiap wilayah")
+    jumlah_wilayah, n = X.shape
+    if n < 3:
+        raise ValueError("Uji permutasi membutuhkan minimal 3 pasang data")
+
+    xc = X - X.mean(axis=1, keepdims=True)
+    yc = Y - Y.mean(axis=1, keepdims=True)
+    sxx = np.einsum("ij,ij->i", xc, xc)
+    syy = np.einsum("ij,ij->i", yc, yc)
+    sxy = np.einsum("ij,ij->i", xc, yc)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = sxy / np.sqrt(sxx * syy)
+        b = sxy / sxx
+    # Toleransi relatif agar permutasi identitas (dan yang setara) tetap terhitung meski ada galat pembulatan
+    ambang = np.abs(sxy) * (1.0 - 1e-10)
+
+    if eksak is None:
+        eksak = n <= BATAS_EKSAK
+    semua_permutasi = None
+    if eksak:
+        semua_permutasi = np.array(list(permutations(range(n))), dtype=np.intp)
+        n_permutasi = len(semua_permutasi)
+
+    # Blok wilayah sekecil mungkin hanya jika satu blok permutasi (minimal 64) tidak muat
+    per_wilayah = max(1, min(jumlah_wilayah, max_elemen_blok // (64 * n)))
+    per_blok = max(1, min(n_permutasi, max_elemen_blok // (max(per_wilayah, n) * n)))
+    daftar_wilayah = [slice(i, i + per_wilayah) for i in range(0, jumlah_wilayah, per_wilayah)]
+    if eksak:
+        daftar_permutasi = [slice(i, i + per_blok) for i in range(0, n_permutasi, per_blok)]
+    else:
+        # Blok dibulatkan ke kelipatan potongan agar setiap potongan acak dibangkitkan sekali
+        if per_blok > UKURAN_POTONGAN_ACAK:
+            per_blok -= per_blok % UKURAN_POTONGAN_ACAK
+        entropi = np.random.SeedSequence(seed).entropy
+        daftar_permutasi = [(i, min(per_blok, n_permutasi - i), entropi) for i in range(0, n_permutasi, per_blok)]
+    tugas = [(w, p) for w in daftar_wilayah for p in daftar_permutasi]
+
+    jumlah_ekstrem = np.zeros(jumlah_wilayah, dtype=np.int64)
+    paralel = (len(tugas) > 1 and jumlah_wilayah * n * n_permutasi >= AMBANG_PARALEL
+               and (os.cpu_count() or 1) > 1)
+    if paralel:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_inisialisasi_worker,
+                                 initargs=(xc, yc, ambang, semua_permutasi)) as executor:
+            hasil = executor.map(_blok_worker, *zip(*tugas))
+            for (wilayah, _), jumlah in zip(tugas, hasil):
+                jumlah_ekstrem[wilayah] += jumlah
+    else:
+        for wilayah, permutasi in tugas:
+            indeks = _indeks_permutasi(permutasi, semua_permutasi, n)
+            jumlah_ekstrem[wilayah] += _hitung_blok(xc[wilayah], yc[wilayah], ambang[wilayah], indeks)
+
+    return HasilPermutasi(r, b, jumlah_ekstrem, n_permutasi, eksak)
+
+
+def uji_permutasi(x, y, n_permutasi=10000, seed=None, eksak=None, max_workers=None):
+    """Uji permutasi r dan b untuk satu pasang deret (x, y); lihat uji_permutasi_batch"""
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    return uji_permutasi_batch(x[None, :], y[None, :], n_permutasi, seed, eksak, max_workers)
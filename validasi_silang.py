@@ -0,0 +1,124 @@
+import numpy as np
+
+
+def _terpusat(X, Y):
+    """Data (grup × observasi) yang dipusatkan per grup beserta mask valid dan n"""
+    X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    if X.shape != Y.shape:
+        raise ValueError(f"Ukuran X {X.shape} dan Y {Y.shape} tidak sama")
+    valid = ~(np.isnan(X) | np.isnan(Y))
+    n = valid.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.where(valid, X, 0.0).sum(axis=1) / n
+        mean_y = np.where(valid, Y, 0.0).sum(axis=1) / n
+    dx = np.where(valid, X - mean_x[:, None], 0.0)
+    dy = np.where(valid, Y - mean_y[:, None], 0.0)
+    return dx, dy, valid, n
+
+
+def diagnostik_pengaruh(X, Y):
+    """Leverage, residual, residual leave-one-out, dan Cook's distance setiap observasi.
+
+    X dan Y berukuran (jumlah_grup, jumlah_observasi) atau satu dimensi; NaN diabaikan.
+    Untuk regresi sederhana leverage h = 1/n + (x - x̄)² / Σ(x - x̄)², sehingga residual
+    leave-one-out e / (1 - h) didapat tanpa fit ulang. Mengembalikan dict array
+    berukuran sama dengan X (NaN pada observasi yang tidak valid).
+    """
+    satu_dimensi = np.ndim(X) == 1
+    hasil = _pengaruh(*_terpusat(X, Y))
+    if satu_dimensi:
+        hasil = {kunci: nilai[0] for kunci, nilai in hasil.items()}
+    return hasil
+
+
+def _pengaruh(dx, dy, valid, n):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        m2_x = np.einsum('ij,ij->i', dx, dx)[:, None]
+        b = np.einsum('ij,ij->i', dx, dy)[:, None] / m2_x
+        residual = dy - b * dx
+        leverage = 1.0 / n[:, None] + dx * dx / m2_x
+        residual_loo = residual / (1.0 - leverage)
+
+        # Cook's distance dengan p = 2 parameter (a dan b)
+        sse = np.einsum('ij,ij->i', np.where(valid, residual, 0.0), np.where(valid, residual, 0.0))
+        s2 = (sse / (n - 2))[:, None]
+        cook = residual * residual * leverage / (2.0 * s2 * (1.0 - leverage) ** 2)
+
+    hasil = {"leverage": leverage, "residual": residual, "residual_loo": residual_loo, "cook": cook}
+    for nilai in hasil.values():
+        nilai[~valid] = np.nan
+    return hasil
+
+
+def validasi_loo(X, Y):
+    """Validasi silang leave-one-out tertutup (PRESS) untuk setiap grup sekaligus.
+
+    Mengembalikan dict array per grup: n, press, rmse, mae, dan q_squared
+    (1 - PRESS / Σ(y - ȳ)², pembanding r² yang tidak bias ke data latih).
+    """
+    dx, dy, valid, n = _terpusat(X, Y)
+    residual_loo = _pengaruh(dx, dy, valid, n)["residual_loo"]
+    return _ringkas_galat(np.where(valid, residual_loo, 0.0), np.einsum('ij,ij->i', dy, dy), n)
+
+
+def _ringkas_galat(galat, sst, n):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        press = np.einsum('ij,ij->i', galat, galat)
+        hasil = {
+            "n": n,
+            "press": press,
+            "rmse": np.sqrt(press / n),
+            "mae": np.abs(galat).sum(axis=1) / n,
+            "q_squared": 1.0 - press / sst,
+        }
+    kurang = n < 3
+    for kunci in ("press", "rmse", "mae", "q_squared"):
+        hasil[kunci][kurang] = np.nan
+    return hasil
+
+
+def validasi_kfold(X, Y, k=5, seed=None):
+    """Validasi silang k-fold untuk setiap grup sekaligus tanpa fit ulang per fold.
+
+    Jumlah Σx, Σy, Σx², Σxy setiap fold dihitung sekali (perkalian dengan matriks
+    one-hot fold); model tiap fold memakai jumlah total dikurangi jumlah fold tersebut.
+    Pembagian fold sama untuk semua grup. Mengembalikan dict seperti validasi_loo.
+    """
+    dx, dy, valid, n = _terpusat(X, Y)
+    jumlah_observasi = dx.shape[1]
+    k = min(k, jumlah_observasi)
+    if k < 2:
+        raise ValueError("k-fold membutuhkan minimal 2 fold")
+
+    rng = np.random.default_rng(seed)
+    fold = rng.permutation(jumlah_observasi) % k
+    one_hot = np.eye(k)[fold]  # (observasi × fold)
+
+    v = valid.astype(np.float64)
+    total = np.stack([v.sum(axis=1), dx.sum(axis=1), dy.sum(axis=1),
+                      np.einsum('ij,ij->i', dx, dx), np.einsum('ij,ij->i', dx, dy)])[:, :, None]
+    per_fold = np.stack([v @ one_hot, dx @ one_hot, dy @ one_hot, (dx * dx) @ one_hot, (dx * dy) @ one_hot])
+    n_l, sx, sy, sxx, sxy = total - per_fold  # jumlah data latih, (grup × fold)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        b = (sxy - sx * sy / n_l) / (sxx - sx * sx / n_l)
+        a = sy / n_l - b * sx / n_l
+        galat = dy - (a[:, fold] + b[:, fold] * dx)
+        # Fold yang data latihnya kurang dari 2 observasi tidak dapat diprediksi
+        galat[(n_l < 2)[:, fold]] = np.nan
+    return _ringkas_galat(np.where(valid, galat, 0.0), np.einsum('ij,ij->i', dy, dy), n)
+
+
+def baris_info_validasi(x, y, k=5, seed=0):
+    """Baris (Parameter, Nilai) validasi silang satu model untuk sheet Info Regresi dan PDF"""
+    loo = validasi_loo(x, y)
+    baris = [
+        ("RMSE Leave-One-Out", f"{loo['rmse'][0]:,.2f}"),
+        ("Q² Leave-One-Out", f"{loo['q_squared'][0]:.4f}"),
+    ]
+    # Dengan n <= k, k-fold sama dengan leave-one-out
+    if loo["n"][0] > k:
+        kfold = validasi_kfold(x, y, k, seed)
+        baris.append((f"RMSE {k}-fold", f"{kfold['rmse'][0]:,.2f}"))
+    return baris